@@ -5,29 +5,62 @@ Pure Python - No heavy dependencies
 import json
 import csv
 import os
+import sys
 from http.server import BaseHTTPRequestHandler
 
-def load_disease_symptoms(disease_name):
-    """Load all symptoms for a disease from CSV (lightweight)"""
-    base_dir = os.path.join(os.path.dirname(__file__), '..', 'backend-api', 'datasets')
-    symptoms_path = os.path.join(base_dir, 'symtoms_df.csv')
-    
-    all_symptoms = set()
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'backend-api', 'datasets')
+
+# Binary bundle of the dataset CSVs (backend-api/models/dataset_bundle.py, stdlib only)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend-api', 'models'))
+try:
+    from dataset_bundle import DEFAULT_BUNDLE_NAME, open_bundle
+except ImportError:
+    open_bundle = None
+
+_BUNDLE = False
+
+def dataset_rows(filename):
+    """Rows of a dataset CSV as dicts, from the bundle when it is present and up to date"""
+    global _BUNDLE
+    if _BUNDLE is False:
+        _BUNDLE = open_bundle(os.path.join(DATASETS_DIR, DEFAULT_BUNDLE_NAME)) if open_bundle else None
+    if _BUNDLE is not None and filename in _BUNDLE:
+        return _BUNDLE.rows(filename)
+    path = os.path.join(DATASETS_DIR, filename)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+# Disease name -> symptoms, read once per cold start instead of once per request
+_DISEASE_SYMPTOMS = None
+
+def normalize_disease(name):
+    """Disease name with surrounding spaces stripped and inner runs of spaces collapsed"""
+    return ' '.join(str(name).split())
+
+def load_disease_symptoms():
+    """Map every disease in the symptoms CSV to its symptoms, in first-seen order (lightweight)"""
+    grouped = {}
     
     try:
-        if os.path.exists(symptoms_path):
-            with open(symptoms_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('Disease', '').strip() == disease_name:
-                        # Extract all symptom columns
-                        for col_name, symptom_value in row.items():
-                            if col_name.startswith('Symptom_') and symptom_value and str(symptom_value).strip():
-                                all_symptoms.add(str(symptom_value).strip())
+        for row in dataset_rows('symtoms_df.csv'):
+            listed = grouped.setdefault(normalize_disease(row.get('Disease') or ''), {})
+            # Extract all symptom columns
+            for col_name, symptom_value in row.items():
+                if col_name and col_name.startswith('Symptom_') and symptom_value and str(symptom_value).strip():
+                    listed.setdefault(str(symptom_value).strip())
     except Exception as e:
         print(f"Error loading symptoms: {e}")
     
-    return list(all_symptoms)
+    return {name: list(listed) for name, listed in grouped.items() if name}
+
+def disease_symptoms(disease_name):
+    """All symptoms for a disease (empty if unknown), from the table loaded on first use"""
+    global _DISEASE_SYMPTOMS
+    if _DISEASE_SYMPTOMS is None:
+        _DISEASE_SYMPTOMS = load_disease_symptoms()
+    return _DISEASE_SYMPTOMS.get(normalize_disease(disease_name), [])
 
 # Vercel serverless function handler - Correct format using BaseHTTPRequestHandler
 class handler(BaseHTTPRequestHandler):
@@ -52,6 +85,24 @@ class handler(BaseHTTPRequestHandler):
             except json.JSONDecodeError:
                 body = {}
             
+            # Batch variant: {"disease_names": [...]} answers every name from the same table
+            disease_names = body.get('disease_names')
+            if isinstance(disease_names, list) and disease_names:
+                results = []
+                for name in disease_names:
+                    all_symptoms = disease_symptoms(name)
+                    if all_symptoms:
+                        results.append({'disease_name': name, 'all_symptoms': all_symptoms,
+                                        'symptom_count': len(all_symptoms)})
+                    else:
+                        results.append({'disease_name': name, 'error': 'Disease not found'})
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(json.dumps({'results': results, 'count': len(results)}).encode('utf-8'))
+                return
+            
             disease_name = body.get('disease_name', '').strip()
             
             if not disease_name:
@@ -63,7 +114,7 @@ class handler(BaseHTTPRequestHandler):
                 return
             
             # Load symptoms
-            all_symptoms = load_disease_symptoms(disease_name)
+            all_symptoms = disease_symptoms(disease_name)
             
             if not all_symptoms:
                 self.send_response(404)
@@ -5,6 +5,7 @@ Pure Python - No heavy dependencies - Works entirely on Vercel
 import json
 import csv
 import os
+import sys
 from http.server import BaseHTTPRequestHandler
 
 # Lightweight disease prediction rules (no ML models needed)
@@ -64,70 +65,81 @@ def predict_disease(symptoms):
     
     return best_match or 'Common Cold', confidence
 
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'backend-api', 'datasets')
+
+# Binary bundle of the dataset CSVs (backend-api/models/dataset_bundle.py, stdlib only)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend-api', 'models'))
+try:
+    from dataset_bundle import DEFAULT_BUNDLE_NAME, open_bundle
+except ImportError:
+    open_bundle = None
+
+_BUNDLE = False
+_ROWS = {}
+
+def dataset_rows(filename):
+    """Rows of a dataset CSV as dicts, read once per cold start (from the bundle when it is up to date)"""
+    global _BUNDLE
+    if _BUNDLE is False:
+        _BUNDLE = open_bundle(os.path.join(DATASETS_DIR, DEFAULT_BUNDLE_NAME)) if open_bundle else None
+    if filename not in _ROWS:
+        if _BUNDLE is not None and filename in _BUNDLE:
+            _ROWS[filename] = _BUNDLE.rows(filename)
+        else:
+            path = os.path.join(DATASETS_DIR, filename)
+            if not os.path.exists(path):
+                return []
+            with open(path, 'r', encoding='utf-8') as f:
+                _ROWS[filename] = list(csv.DictReader(f))
+    return _ROWS[filename]
+
 def load_disease_info(disease_name):
     """Load disease information from CSV files (lightweight)"""
-    base_dir = os.path.join(os.path.dirname(__file__), '..', 'backend-api', 'datasets')
     info = DEFAULT_INFO.copy()
     
     # Try to load from description.csv
     try:
-        desc_path = os.path.join(base_dir, 'description.csv')
-        if os.path.exists(desc_path):
-            with open(desc_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('Disease', '').strip() == disease_name:
-                        info['description'] = row.get('Description', info['description'])
-                        break
+        for row in dataset_rows('description.csv'):
+            if row.get('Disease', '').strip() == disease_name:
+                info['description'] = row.get('Description', info['description'])
+                break
     except Exception:
         pass
     
     # Try to load from precautions_df.csv
     try:
-        prec_path = os.path.join(base_dir, 'precautions_df.csv')
-        if os.path.exists(prec_path):
-            with open(prec_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('Disease', '').strip() == disease_name:
-                        precautions = []
-                        for i in range(1, 5):
-                            prec = row.get(f'Precaution_{i}', '').strip()
-                            if prec:
-                                precautions.append(prec)
-                        if precautions:
-                            info['precautions'] = precautions
-                        break
+        for row in dataset_rows('precautions_df.csv'):
+            if row.get('Disease', '').strip() == disease_name:
+                precautions = []
+                for i in range(1, 5):
+                    prec = row.get(f'Precaution_{i}', '').strip()
+                    if prec:
+                        precautions.append(prec)
+                if precautions:
+                    info['precautions'] = precautions
+                break
     except Exception:
         pass
     
     # Try to load from medications.csv
     try:
-        med_path = os.path.join(base_dir, 'medications.csv')
-        if os.path.exists(med_path):
-            with open(med_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('Disease', '').strip() == disease_name:
-                        med = row.get('Medication', '').strip()
-                        if med:
-                            info['medications'] = [med]
-                        break
+        for row in dataset_rows('medications.csv'):
+            if row.get('Disease', '').strip() == disease_name:
+                med = row.get('Medication', '').strip()
+                if med:
+                    info['medications'] = [med]
+                break
     except Exception:
         pass
     
     # Try to load from diets.csv
     try:
-        diet_path = os.path.join(base_dir, 'diets.csv')
-        if os.path.exists(diet_path):
-            with open(diet_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('Disease', '').strip() == disease_name:
-                        diet = row.get('Diet', '').strip()
-                        if diet:
-                            info['diet'] = [diet]
-                        break
+        for row in dataset_rows('diets.csv'):
+            if row.get('Disease', '').strip() == disease_name:
+                diet = row.get('Diet', '').strip()
+                if diet:
+                    info['diet'] = [diet]
+                break
     except Exception:
         pass
     
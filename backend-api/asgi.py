@@ -0,0 +1,184 @@
+"""
+ASGI entry point
+================
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 2
+
+Serves the routes of main.py from an event loop instead of one blocking
+thread per request. Routes that run the models (INFERENCE_ROUTES) are handed
+to a bounded thread pool; every other route (/check_disease, /chatbot,
+/symptoms/*, ...) is a dictionary or bitset lookup and is answered directly
+on the event loop, so lookups keep their latency while /predict traffic
+saturates the CPU. A lookup only reaches the predictor when the serving state
+has no disease catalog yet; startup always builds one (from the datasets
+alone when no model loads), and until then lookups go to the executor too.
+
+At most MAX_PENDING_INFERENCES predictions are admitted at once (running or
+waiting for a thread); beyond that /predict answers 503 with Retry-After
+right away instead of queueing without bound.
+
+The Flask app is called through WSGI for every route, so responses are the
+same as with gunicorn. Each worker process loads and warms up the models
+during the ASGI lifespan startup, before it accepts connections. WebSocket
+connections are refused, and other scope types are ignored.
+"""
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from cpu_resources import available_cpus, limit_blas_threads
+
+# One BLAS/OpenMP thread per inference thread; before main imports numpy
+limit_blas_threads()
+
+import main
+from json_fragments import dumps
+
+# Routes that run the models; everything else is served on the event loop
+INFERENCE_ROUTES = {'/predict', '/predict/batch'}
+
+# Threads running inference in each worker process (default: one per available CPU)
+INFERENCE_THREADS = int(os.environ.get('INFERENCE_THREADS', available_cpus()))
+
+# Predictions admitted at once, running or waiting for a thread; further ones get a 503
+MAX_PENDING_INFERENCES = int(os.environ.get('MAX_PENDING_INFERENCES', 4 * INFERENCE_THREADS))
+
+# Cases replayed through the models at startup (see main.warmup)
+WARMUP_CASES = int(os.environ.get('WARMUP_CASES', 50))
+
+_executor = ThreadPoolExecutor(max_workers=INFERENCE_THREADS, thread_name_prefix='inference')
+_pending_inferences = 0
+
+
+def wsgi_environ(scope, body):
+    """WSGI environ for an ASGI HTTP scope and its request body"""
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name, value = name.decode('latin-1'), value.decode('latin-1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def call_flask(environ):
+    """Run one request through the Flask app; returns (status code, ASGI headers, body bytes)"""
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+    chunks = main.app(environ, start_response)
+    try:
+        body = b''.join(chunks)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return response['status'], response['headers'], body
+
+
+def runs_on_loop(path):
+    """Whether a request can be answered on the event loop: a lookup route, with a catalog that won't load the model"""
+    state = main.current_state()
+    return path not in INFERENCE_ROUTES and state is not None and state.catalog is not None
+
+
+def overloaded_response():
+    """503 answered without queueing when MAX_PENDING_INFERENCES predictions are already in flight"""
+    body = dumps({'error': 'Server busy, please retry', 'pending_inferences': _pending_inferences})
+    headers = [
+        (b'content-type', b'application/json'),
+        (b'retry-after', b'1'),
+        (b'access-control-allow-origin', b'*'),
+    ]
+    return 503, headers, body
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def handle_http(scope, receive, send):
+    global _pending_inferences
+    body = await read_body(receive)
+    if body is None:
+        return
+    environ = wsgi_environ(scope, body)
+    if runs_on_loop(environ['PATH_INFO']):
+        status, headers, body = call_flask(environ)
+    elif _pending_inferences >= MAX_PENDING_INFERENCES:
+        status, headers, body = overloaded_response()
+    else:
+        _pending_inferences += 1
+        try:
+            status, headers, body = await asyncio.get_running_loop().run_in_executor(_executor, call_flask, environ)
+        finally:
+            _pending_inferences -= 1
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                if not main.warmup(WARMUP_CASES):
+                    # No model: lookups still need a catalog, and must never try to load one on the loop
+                    main.build_dataset_catalog(main.current_state())
+                main.start_reload_watcher()
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            _executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'http':
+        await handle_http(scope, receive, send)
+    elif scope['type'] == 'lifespan':
+        await handle_lifespan(receive, send)
+    elif scope['type'] == 'websocket':
+        # No WebSocket routes: closing before accepting refuses the handshake (HTTP 403)
+        await receive()
+        await send({'type': 'websocket.close', 'code': 1000})
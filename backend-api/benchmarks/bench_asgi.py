@@ -0,0 +1,146 @@
+"""
+Lookup latency under prediction load: thread per request vs ASGI
+================================================================
+
+Drives the app in-process while --clients clients send POST /predict back to
+back with random symptom combinations (prediction cache and answer table
+disabled, so every request runs the models) and one client sends
+POST /check_disease in a loop. Two ways of serving the same Flask routes:
+
+- threads: every request runs on a pool of --threads threads, as a gunicorn
+  gthread worker does, so lookups wait behind predictions for a free thread
+- asgi: asgi.app (asgi.py), where /predict runs on INFERENCE_THREADS threads
+  behind the MAX_PENDING_INFERENCES limit and lookups run on the event loop
+
+Reports lookup p50/p99, prediction throughput and p50, and how many
+predictions were turned away with 503.
+
+Usage (from backend-api/):
+    python benchmarks/bench_asgi.py --duration 10 --clients 8 --threads 2
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+
+def http_scope(method, path, body):
+    return {
+        'type': 'http', 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'root_path': '', 'query_string': b'',
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        'server': ('127.0.0.1', 5000), 'client': ('127.0.0.1', 40000),
+    }
+
+
+async def call_asgi(app, method, path, payload):
+    """Send one request to an ASGI app; returns the status code"""
+    body = json.dumps(payload).encode()
+    response = {}
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+
+    await app(http_scope(method, path, body), receive, send)
+    return response['status']
+
+
+def thread_per_request_app(asgi, threads):
+    """ASGI callable running every request, lookups included, on a fixed thread pool"""
+    pool = ThreadPoolExecutor(max_workers=threads)
+
+    async def app(scope, receive, send):
+        body = (await receive())['body']
+        environ = asgi.wsgi_environ(scope, body)
+        status, headers, body = await asyncio.get_running_loop().run_in_executor(pool, asgi.call_flask, environ)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    return app
+
+
+async def load_test(app, vocabulary, args):
+    rng = random.Random(0)
+    deadline = time.perf_counter() + args.duration
+    predictions, rejected, lookups = [], [0], []
+
+    async def predict_client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await call_asgi(app, 'POST', '/predict', {'symptoms': rng.sample(vocabulary, args.symptoms)})
+            if status == 503:
+                rejected[0] += 1
+                await asyncio.sleep(0.01)
+            else:
+                predictions.append(time.perf_counter() - start)
+
+    async def lookup_client():
+        names = ['Diabetes', 'Malaria', 'Migraine', 'Typhoid', 'Acne']
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await call_asgi(app, 'POST', '/check_disease', {'disease_name': rng.choice(names)})
+            lookups.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+    await asyncio.gather(lookup_client(), *(predict_client() for _ in range(args.clients)))
+    return {
+        'lookup_p50_ms': float(np.percentile(lookups, 50)) * 1000,
+        'lookup_p99_ms': float(np.percentile(lookups, 99)) * 1000,
+        'predict_per_s': len(predictions) / args.duration,
+        'predict_p50_ms': float(np.percentile(predictions, 50)) * 1000 if predictions else 0.0,
+        'rejected': rejected[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--clients', type=int, default=8, help='concurrent /predict clients')
+    parser.add_argument('--threads', type=int, default=2, help='request threads, and INFERENCE_THREADS for asgi')
+    parser.add_argument('--max-pending', type=int, default=None, help='MAX_PENDING_INFERENCES for asgi')
+    parser.add_argument('--symptoms', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.update(PREDICTION_CACHE_SIZE='0', ANSWER_TABLE_PATH='', INFERENCE_THREADS=str(args.threads))
+    if args.max_pending is not None:
+        os.environ['MAX_PENDING_INFERENCES'] = str(args.max_pending)
+    os.chdir(BASE_DIR)
+    import asgi
+    from feature_encoder import SYMPTOM_VOCABULARY
+
+    modes = {
+        'threads': thread_per_request_app(asgi, args.threads),
+        'asgi': asgi.app,
+    }
+    # Keep the model loading and warmup messages out of the results
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        asgi.main.warmup(5)
+        results = {name: asyncio.run(load_test(app, SYMPTOM_VOCABULARY, args)) for name, app in modes.items()}
+
+    print("=" * 76)
+    print(f"{args.clients} /predict clients + 1 /check_disease client, {args.threads} threads, "
+          f"{args.duration:.0f} s, max pending {asgi.MAX_PENDING_INFERENCES}")
+    print("=" * 76)
+    print(f"{'mode':<10}{'lookup p50':>12}{'lookup p99':>12}{'predict/s':>12}{'predict p50':>13}{'503s':>8}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['lookup_p50_ms']:>10.2f}ms{r['lookup_p99_ms']:>10.2f}ms"
+              f"{r['predict_per_s']:>12.1f}{r['predict_p50_ms']:>11.1f}ms{r['rejected']:>8}")
+    print("=" * 76)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Cascade vs full-ensemble benchmark
+==================================
+
+Replays symptom lists from symtoms_df.csv one request at a time through
+ImprovedEnhancedMedicalPredictor and reports, per cascade threshold, the
+p50/p99 latency, the average number of members run and the agreement with
+the full ensemble prediction.
+
+Usage (from backend-api/):
+    python benchmarks/bench_cascade.py --thresholds 0.7 0.8 0.9 0.95 --limit 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
+
+
+def load_cases(dataset_path, limit):
+    """Load symptom lists from the symptoms dataset"""
+    df = pd.read_csv(dataset_path)
+    symptom_cols = [col for col in df.columns if col.startswith('Symptom_')]
+    cases = []
+    for row in df[symptom_cols].itertuples(index=False):
+        symptoms = [s.strip() for s in row if pd.notna(s) and s.strip()]
+        if symptoms:
+            cases.append(symptoms)
+    rng = np.random.default_rng(42)
+    rng.shuffle(cases)
+    return cases[:limit]
+
+
+def run(predictor, cases, cascade_threshold):
+    """Predict every case one at a time and collect latency and members run"""
+    latencies = []
+    diseases = []
+    members = []
+    for symptoms in cases:
+        start = time.perf_counter()
+        disease, predictions, _, _ = predictor.predict_disease(symptoms, cascade_threshold=cascade_threshold)
+        latencies.append((time.perf_counter() - start) * 1000)
+        diseases.append(disease)
+        members.append(len(predictions))
+    return np.array(latencies), diseases, np.array(members)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=os.path.join(BASE_DIR, 'models', 'improved_enhanced_models.pkl'))
+    parser.add_argument('--dataset', default=os.path.join(BASE_DIR, 'datasets', 'symtoms_df.csv'))
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.7, 0.8, 0.9, 0.95, 0.99])
+    parser.add_argument('--limit', type=int, default=500)
+    args = parser.parse_args()
+
+    predictor = ImprovedEnhancedMedicalPredictor()
+    predictor.load_models(args.model)
+    cases = load_cases(args.dataset, args.limit)
+
+    # Warm up every member once
+    predictor.predict_disease(cases[0])
+
+    print("=" * 72)
+    print(f"{'mode':<18}{'p50 ms':>10}{'p99 ms':>10}{'avg models':>12}{'agreement':>12}")
+    print("=" * 72)
+
+    latencies, reference, members = run(predictor, cases, None)
+    print(f"{'ensemble':<18}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}"
+          f"{members.mean():>12.2f}{1.0:>12.3f}")
+
+    for threshold in args.thresholds:
+        latencies, diseases, members = run(predictor, cases, threshold)
+        agreement = np.mean([a == b for a, b in zip(diseases, reference)])
+        print(f"{'cascade@' + str(threshold):<18}{np.percentile(latencies, 50):>10.2f}"
+              f"{np.percentile(latencies, 99):>10.2f}{members.mean():>12.2f}{agreement:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
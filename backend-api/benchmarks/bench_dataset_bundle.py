@@ -0,0 +1,86 @@
+"""
+Dataset loading benchmark
+=========================
+
+Times loading the six serving datasets the ways the entry points do:
+
+- pandas: pd.read_csv of every CSV (backend/app.py, the root main.py)
+- csv: csv.DictReader rows of every CSV (backend-api before the bundle, api/)
+- bundle: DatasetBundle.load plus decoding every table to rows
+  (models/dataset_bundle.py); alone, with open_bundle's freshness check
+  (size and modification time, as when the CSVs are untouched), and with
+  every CSV hashed (as when they were copied or edited)
+
+Build the bundle first with python models/dataset_bundle.py.
+
+Usage (from backend-api/):
+    python benchmarks/bench_dataset_bundle.py --repeat 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from dataset_bundle import DEFAULT_BUNDLE_NAME, SERVING_DATASETS, DatasetBundle, file_checksum, open_bundle, read_table
+
+
+def timed(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--datasets', default=os.path.join(BASE_DIR, 'datasets'))
+    parser.add_argument('--bundle', help=f'bundle path (default: <datasets>/{DEFAULT_BUNDLE_NAME})')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    bundle_path = args.bundle or os.path.join(args.datasets, DEFAULT_BUNDLE_NAME)
+    sources = {name: os.path.join(args.datasets, name) for name in SERVING_DATASETS}
+
+    def bundle_rows():
+        bundle = DatasetBundle.load(bundle_path)
+        return {name: bundle.rows(name) for name in SERVING_DATASETS}
+
+    def checked_bundle_rows():
+        bundle = open_bundle(bundle_path, sources)
+        return {name: bundle.rows(name) for name in SERVING_DATASETS}
+
+    def hashed_bundle_rows():
+        bundle = DatasetBundle.load(bundle_path)
+        assert all(file_checksum(path) == bundle.checksum(name) for name, path in sources.items())
+        return {name: bundle.rows(name) for name in SERVING_DATASETS}
+
+    loaders = [
+        ('pandas read_csv', lambda: {name: pd.read_csv(path) for name, path in sources.items()}),
+        ('csv DictReader', lambda: {name: read_table(path) for name, path in sources.items()}),
+        ('bundle', bundle_rows),
+        ('bundle + stat check', checked_bundle_rows),
+        ('bundle + checksums', hashed_bundle_rows),
+    ]
+    csv_bytes = sum(os.path.getsize(path) for path in sources.values())
+    print(f"{csv_bytes / 1024:.0f} KB of CSV, bundle {os.path.getsize(bundle_path) / 1024:.0f} KB")
+    print("=" * 40)
+    print(f"{'loader':<24}{'ms':>10}")
+    print("=" * 40)
+    for label, load in loaders:
+        print(f"{label:<24}{timed(load, args.repeat) * 1e3:>10.1f}")
+    same = bundle_rows() == {name: read_table(path) for name, path in sources.items()}
+    print("=" * 40)
+    print(f"bundle rows match the CSVs: {same}")
+
+
+if __name__ == '__main__':
+    main()
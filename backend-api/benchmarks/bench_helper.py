@@ -0,0 +1,111 @@
+"""
+Disease information lookup benchmark
+====================================
+
+Times helper for every disease in the datasets two ways:
+
+- dataframe: the helper the app used before the disease catalog, which masks
+  the description, precautions, medications, diets and workout DataFrames on
+  every call
+- catalog: DiseaseCatalog.info (models/disease_catalog.py), one tuple index
+  into DiseaseInfo records built at startup, plus the name -> ID lookup a
+  /check_disease request does first
+
+It also reports what the catalog costs to build once, from the same CSV rows.
+
+Usage (from backend-api/):
+    python benchmarks/bench_helper.py --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from dataset_bundle import read_table
+from disease_catalog import DiseaseCatalog
+
+DATASET_FILES = {
+    'symptoms': 'symtoms_df.csv',
+    'description': 'description.csv',
+    'precautions': 'precautions_df.csv',
+    'medications': 'medications.csv',
+    'diets': 'diets.csv',
+    'workout': 'workout_df.csv',
+}
+
+
+def dataframe_helper(frames):
+    """The per-request helper that masked each DataFrame by disease name"""
+    description, precautions = frames['description'], frames['precautions']
+    medications, diets, workout = frames['medications'], frames['diets'], frames['workout']
+
+    def helper(dis):
+        desc = description[description['Disease'] == dis]['Description']
+        desc = " ".join([w for w in desc]) if len(desc) > 0 else "Description not available"
+        pre = precautions[precautions['Disease'] == dis][['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']]
+        pre = [col for col in pre.values] if len(pre) > 0 else [["Precautions not available"]]
+        med = medications[medications['Disease'] == dis]['Medication']
+        med = [m for m in med.values] if len(med) > 0 else ["Medications not available"]
+        die = diets[diets['Disease'] == dis]['Diet']
+        die = [d for d in die.values] if len(die) > 0 else ["Diet information not available"]
+        wrkout = workout[workout['disease'] == dis]['workout']
+        wrkout = [w for w in wrkout.values] if len(wrkout) > 0 else ["Workout information not available"]
+        return desc, pre, med, die, wrkout
+
+    return helper
+
+
+def timed(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--datasets', default=os.path.join(BASE_DIR, 'datasets'))
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    paths = {key: os.path.join(args.datasets, name) for key, name in DATASET_FILES.items()}
+    frames = {key: pd.read_csv(path) for key, path in paths.items()}
+    tables = {key: read_table(path) for key, path in paths.items()}
+    names = sorted({row['Disease'] for row in tables['description']})
+
+    build = timed(lambda: DiseaseCatalog.build((), tables), max(args.repeat // 20, 3))
+    catalog = DiseaseCatalog.build((), tables)
+    helper = dataframe_helper(frames)
+
+    def lookup_all():
+        for name in names:
+            catalog.info(catalog.disease_id(name))
+
+    def dataframe_all():
+        for name in names:
+            helper(name)
+
+    dataframe = timed(dataframe_all, max(args.repeat // 20, 3)) / len(names)
+    lookup = timed(lookup_all, args.repeat) / len(names)
+
+    print("=" * 60)
+    print(f"{len(names)} diseases, catalog built in {build * 1e3:.2f} ms")
+    print("=" * 60)
+    print(f"{'helper':<12}{'us per call':>14}{'speedup':>12}")
+    print(f"{'dataframe':<12}{dataframe * 1e6:>14.1f}{1.0:>11.0f}x")
+    print(f"{'catalog':<12}{lookup * 1e6:>14.2f}{dataframe / lookup:>11.0f}x")
+    print("=" * 60)
+    print(f"Catalog build pays for itself after {build / max(dataframe - lookup, 1e-12):.0f} lookups")
+
+
+if __name__ == '__main__':
+    main()
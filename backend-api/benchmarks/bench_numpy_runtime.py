@@ -0,0 +1,97 @@
+"""
+sklearn pickle vs NumPy runtime: startup time and memory
+========================================================
+
+Each measurement runs in a fresh interpreter, so import and load costs are
+paid exactly as a new worker would pay them. Reports the time to import and
+load the models, the first and steady-state single-row latency, peak RSS and
+whether sklearn ended up imported.
+
+Usage (from backend-api/):
+    python models/numpy_runtime.py            # export the runtime first
+    python benchmarks/bench_numpy_runtime.py --repeat 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, 'models')
+
+SAMPLE_SYMPTOMS = ['chills', 'vomiting', 'high_fever', 'fatigue']
+
+
+def measure(runtime, path):
+    """Runs inside the child interpreter: load one runtime and report timings"""
+    import resource
+    import time
+
+    start = time.perf_counter()
+    sys.path.append(MODELS_DIR)
+    import numpy as np
+    from feature_encoder import SymptomFeatureEncoder
+    if runtime == 'sklearn':
+        import pickle
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        models, feature_names = data['models'], data['feature_names']
+    else:
+        from numpy_runtime import load_ensemble
+        models, _, feature_names, _ = load_ensemble(path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    X = SymptomFeatureEncoder(feature_names).encode(SAMPLE_SYMPTOMS)
+    start = time.perf_counter()
+    for model in models.values():
+        model.predict_proba(X)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for _ in range(20):
+        start = time.perf_counter()
+        for model in models.values():
+            model.predict_proba(X)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'load_ms': load_ms,
+        'first_predict_ms': first_ms,
+        'steady_predict_ms': float(np.median(latencies)),
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'sklearn_imported': 'sklearn' in sys.modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=os.path.join(MODELS_DIR, 'improved_enhanced_models.pkl'))
+    parser.add_argument('--runtime', default=os.path.join(MODELS_DIR, 'improved_enhanced_runtime'))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', choices=['sklearn', 'numpy'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.path)))
+        return
+
+    print("=" * 78)
+    print(f"{'runtime':<10}{'load ms':>10}{'first ms':>11}{'steady ms':>11}{'peak RSS MB':>14}{'sklearn':>10}")
+    print("=" * 78)
+    for runtime, path in [('sklearn', args.model), ('numpy', args.runtime)]:
+        runs = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', runtime, '--path', path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        best = min(runs, key=lambda run: run['load_ms'])
+        print(f"{runtime:<10}{best['load_ms']:>10.0f}{best['first_predict_ms']:>11.2f}"
+              f"{best['steady_predict_ms']:>11.2f}{best['peak_rss_mb']:>14.0f}{str(best['sklearn_imported']):>10}")
+
+
+if __name__ == '__main__':
+    main()
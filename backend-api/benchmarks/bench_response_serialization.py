@@ -0,0 +1,112 @@
+"""
+Prediction response serialization benchmark
+===========================================
+
+Times serializing one /predict response two ways, with disease descriptions
+padded to increasing lengths:
+
+- jsonify: the whole payload, disease information included, through the
+  standard json module with Flask's default settings (sorted keys, ASCII)
+- spliced: only the per-request members through json_fragments.dumps,
+  spliced around the disease block the catalog rendered at startup
+
+The jsonify cost grows with the disease text; the spliced cost should stay
+flat. 'same' checks that both produce the same JSON document.
+
+Usage (from backend-api/):
+    python benchmarks/bench_response_serialization.py --description-lengths 100 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+import json_fragments
+from disease_catalog import DiseaseCatalog, info_members
+from json_fragments import splice
+
+
+def sample_tables(n_diseases, description_length):
+    """Dataset rows for n_diseases with descriptions of description_length characters"""
+    names = [f'Disease {i}' for i in range(n_diseases)]
+    sentence = 'A condition that affects several organs and needs follow-up. '
+    description = (sentence * (description_length // len(sentence) + 1))[:description_length]
+    return {
+        'description': [{'Disease': name, 'Description': description} for name in names],
+        'precautions': [{'Disease': name, **{f'Precaution_{j}': f'precaution {j}' for j in range(1, 5)}}
+                        for name in names],
+        'medications': [{'Disease': name, 'Medication': f'medication {j}'} for name in names for j in range(3)],
+        'diets': [{'Disease': name, 'Diet': f'diet {j}'} for name in names for j in range(3)],
+        'workout': [{'disease': name, 'workout': f'workout {j}'} for name in names for j in range(10)],
+    }
+
+
+def dynamic_result():
+    """The per-request members of a typical ensemble prediction"""
+    return {
+        'confidence': np.float64(0.87),
+        'method': 'ml_prediction',
+        'rule_id': None,
+        'symptoms': ['itching', 'skin_rash', 'nodal_skin_eruptions'],
+        'individual_predictions': {
+            name: {'disease': 'Disease 0', 'confidence': np.float64(0.8)}
+            for name in ('random_forest', 'gradient_boosting', 'svm', 'neural_network')
+        },
+        'models_run': ['random_forest', 'gradient_boosting', 'svm', 'neural_network'],
+        'normalized_symptoms': ['itching', 'skin_rash', 'nodal_skin_eruptions'],
+        'unrecognized_symptoms': [],
+    }
+
+
+def flask_default(obj):
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(type(obj).__name__)
+
+
+def timed(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--description-lengths', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"serializer: {'orjson' if json_fragments.orjson is not None else 'json (orjson not installed)'}")
+    print("=" * 62)
+    print(f"{'description':>12}{'bytes':>9}{'jsonify us':>13}{'spliced us':>13}{'speedup':>9}{'same':>6}")
+    print("=" * 62)
+    for length in args.description_lengths:
+        catalog = DiseaseCatalog.build(('Disease 0',), sample_tables(41, length))
+        result = dynamic_result()
+
+        def jsonify():
+            payload = {**info_members(catalog.disease_name(0), catalog.info(0)), **result}
+            return json.dumps(payload, default=flask_default, sort_keys=True, separators=(',', ':')).encode()
+
+        def spliced():
+            return splice(catalog.info_json(0), result)
+
+        legacy = timed(jsonify, args.repeat)
+        fast = timed(spliced, args.repeat)
+        same = json.loads(jsonify()) == json.loads(spliced())
+        print(f"{length:>12}{len(spliced()):>9}{legacy * 1e6:>13.1f}{fast * 1e6:>13.1f}"
+              f"{legacy / fast:>8.1f}x{str(same):>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Medical rule engine benchmark
+=============================
+
+Times the compiled bitmask rules (models/medical_rules.py) against the
+previous per-row if-chain over symptom lists, including its label encoder
+round trips. Both are timed for a single request and for a batch, with the
+shipped rules and with synthetic rule sets padded to hundreds of rules.
+Only the rule step is timed: each row gets a fixed ensemble label in place
+of the model output. With the shipped rules both paths must pick the same
+label for every row.
+
+Usage (from backend-api/):
+    python benchmarks/bench_rules.py --rules 4 100 500 --batch 1000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from feature_encoder import SYMPTOM_VOCABULARY, SymptomFeatureEncoder
+from medical_rules import DEFAULT_RULES_PATH, MedicalRules, symptom_bitsets
+
+CLASSES = sorted(['Diabetes ', 'Hyperthyroidism', 'Typhoid', 'Fungal infection'] + [f'Disease {i}' for i in range(37)])
+RULE_SYMPTOMS = ['irregular_sugar_level', 'polyuria', 'mood_swings', 'sweating', 'chills', 'vomiting',
+                 'high_fever', 'itching', 'skin_rash', 'nodal_skin_eruptions']
+
+
+def legacy_rules(label_encoder, best_prediction, symptoms):
+    """The previous if-chain from improved_ensemble_predict (encoded label in, encoded label out)"""
+    predicted_disease_name = label_encoder.inverse_transform([best_prediction])[0]
+    if predicted_disease_name in ['Diabetes ', 'Hyperthyroidism']:
+        if ('irregular_sugar_level' in symptoms or 'polyuria' in symptoms) and 'mood_swings' not in symptoms:
+            return label_encoder.transform(['Diabetes '])[0]
+        elif ('mood_swings' in symptoms or 'sweating' in symptoms) and 'irregular_sugar_level' not in symptoms:
+            return label_encoder.transform(['Hyperthyroidism'])[0]
+    if 'chills' in symptoms and 'vomiting' in symptoms and 'high_fever' in symptoms:
+        return label_encoder.transform(['Typhoid'])[0]
+    if 'itching' in symptoms and 'skin_rash' in symptoms and 'nodal_skin_eruptions' in symptoms:
+        return label_encoder.transform(['Fungal infection'])[0]
+    return best_prediction
+
+
+def synthetic_rules(n_rules, rng):
+    """Shipped rules followed by random three-symptom rules that rarely match"""
+    with open(DEFAULT_RULES_PATH) as f:
+        rules = json.load(f)['rules']
+    while len(rules) < n_rules:
+        rules.append({
+            'id': f'synthetic_{len(rules)}',
+            'disease': rng.choice(CLASSES),
+            'all': rng.sample(SYMPTOM_VOCABULARY, 3),
+            'none': rng.sample(SYMPTOM_VOCABULARY, 1),
+        })
+    return rules
+
+
+def timed(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rules', type=int, nargs='+', default=[4, 100, 500])
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    symptom_lists = [rng.sample(RULE_SYMPTOMS, rng.randint(1, 4)) + rng.sample(SYMPTOM_VOCABULARY, 2)
+                     for _ in range(args.batch)]
+    predicted = np.array([rng.randrange(len(CLASSES)) for _ in symptom_lists])
+    encoder = SymptomFeatureEncoder()
+    X = encoder.encode_batch(symptom_lists)
+    bitsets = symptom_bitsets(X[:, encoder.symptom_positions] > 0)
+    label_encoder = LabelEncoder().fit(CLASSES)
+
+    def legacy_batch():
+        return [legacy_rules(label_encoder, label, symptoms) for label, symptoms in zip(predicted, symptom_lists)]
+
+    legacy_one = timed(lambda: legacy_rules(label_encoder, predicted[0], symptom_lists[0]), args.repeat) * 1e6
+    legacy_all = timed(legacy_batch, max(args.repeat // 20, 5)) * 1e3
+
+    print("=" * 72)
+    print(f"{'rules':>7}{'legacy 1 row us':>18}{'compiled 1 row us':>20}{'legacy batch ms':>17}{'compiled ms':>13}")
+    print("=" * 72)
+    for n_rules in args.rules:
+        rules = MedicalRules(synthetic_rules(n_rules, rng), CLASSES)
+        compiled_one = timed(lambda: rules.apply(bitsets[:1], predicted[:1]), args.repeat) * 1e6
+        compiled_all = timed(lambda: rules.apply(bitsets, predicted), max(args.repeat // 20, 5)) * 1e3
+        legacy = f'{legacy_one:.1f}' if n_rules == 4 else '-'
+        legacy_batch_ms = f'{legacy_all:.2f}' if n_rules == 4 else '-'
+        print(f"{len(rules):>7}{legacy:>18}{compiled_one:>20.1f}{legacy_batch_ms:>17}{compiled_all:>13.2f}")
+
+    shipped = MedicalRules.load(CLASSES)
+    labels, _ = shipped.apply(bitsets, predicted)
+    same = list(labels) == list(legacy_batch())
+    print(f"\nShipped rules agree with the legacy if-chain on {args.batch} rows: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Development server vs production serving benchmark
+==================================================
+
+Starts each entry point on a free port, then measures:
+
+    ready s      process start until GET / answers
+    first ms     the first POST /predict (pays any lazy model load)
+    second ms    the next POST /predict
+    req/s        steady-state throughput of --clients concurrent clients
+    p50/p99 ms   latency during the throughput run
+
+Requests use random symptom combinations of --symptoms symptoms. The
+prediction cache and answer table are disabled so every request runs the models.
+
+Usage (from backend-api/):
+    python benchmarks/bench_serving.py --duration 20 --clients 4
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from feature_encoder import SYMPTOM_VOCABULARY
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def post_predict(port, symptoms):
+    body = json.dumps({'symptoms': symptoms}).encode()
+    req = urllib.request.Request(f'http://127.0.0.1:{port}/predict', data=body,
+                                 headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=120) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def wait_ready(port, process, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('server exited during startup')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1) as response:
+                response.read()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError('server did not become ready')
+
+
+def run(name, command, args):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', PREDICTION_CACHE_SIZE='0', ANSWER_TABLE_PATH='')
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, process)
+        ready_s = time.perf_counter() - start
+
+        rng = random.Random(0)
+        cases = [rng.sample(SYMPTOM_VOCABULARY, args.symptoms) for _ in range(1000)]
+        first_ms = post_predict(port, cases[0])
+        second_ms = post_predict(port, cases[1])
+
+        latencies = []
+        lock = threading.Lock()
+        stop = time.perf_counter() + args.duration
+
+        def client(seed):
+            local = []
+            i = seed
+            while time.perf_counter() < stop:
+                local.append(post_predict(port, cases[i % len(cases)]))
+                i += args.clients
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"{name:<14}{ready_s:>9.1f}{first_ms:>11.0f}{second_ms:>11.1f}{len(latencies) / args.duration:>9.1f}"
+              f"{np.percentile(latencies, 50):>10.1f}{np.percentile(latencies, 99):>10.1f}")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=20, help='seconds of the throughput run')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--symptoms', type=int, default=5, help='symptoms per request')
+    args = parser.parse_args()
+
+    print("=" * 74)
+    print(f"{'entry point':<14}{'ready s':>9}{'first ms':>11}{'second ms':>11}{'req/s':>9}{'p50 ms':>10}{'p99 ms':>10}")
+    print("=" * 74)
+    run('python main.py', [sys.executable, 'main.py'], args)
+    run('gunicorn', [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'], args)
+
+
+if __name__ == '__main__':
+    main()
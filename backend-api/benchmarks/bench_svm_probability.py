@@ -0,0 +1,87 @@
+"""
+SVM probability calibration: Platt scaling vs softmax temperature
+=================================================================
+
+Trains the ensemble's SVM both ways on the train_models split (80/20,
+stratified, random_state 42) and reports fit time, test accuracy, log loss,
+single-row predict_proba latency under sklearn and the NumPy runtime, and how
+often the two agree on the top disease.
+
+Usage (from backend-api/):
+    python benchmarks/bench_svm_probability.py --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import SVC
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
+from numpy_runtime import RUNTIME_TYPES
+from svm_calibration import SoftmaxSVC
+
+
+def single_row_ms(predict_proba, X, repeat):
+    """Median milliseconds for one-row predict_proba calls over the first rows of X"""
+    latencies = []
+    for i in range(repeat):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        predict_proba(row)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.median(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='single-row predictions timed per variant')
+    args = parser.parse_args()
+
+    os.chdir(BASE_DIR)
+    X, y = ImprovedEnhancedMedicalPredictor().load_and_preprocess_data()
+    y_encoded = LabelEncoder().fit_transform(y)
+    X_train, X_test, y_train, y_test = train_test_split(X, y_encoded, test_size=0.2, random_state=42,
+                                                        stratify=y_encoded)
+
+    variants = {
+        'platt': SVC(kernel='rbf', probability=True, C=10, gamma='scale', random_state=42),
+        'softmax': SoftmaxSVC(C=10, gamma='scale', random_state=42),
+    }
+    results = {}
+    for name, model in variants.items():
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_s = time.perf_counter() - start
+
+        runtime_type = RUNTIME_TYPES[type(model).__name__]
+        runtime = runtime_type(*runtime_type.export(model))
+        proba = model.predict_proba(X_test)
+        results[name] = {
+            'fit_s': fit_s,
+            'accuracy': accuracy_score(y_test, model.predict(X_test)),
+            'log_loss': log_loss(y_test, proba, labels=model.classes_),
+            'sklearn_ms': single_row_ms(model.predict_proba, X_test, args.repeat),
+            'runtime_ms': single_row_ms(runtime.predict_proba, X_test, args.repeat),
+            'top': model.classes_[proba.argmax(axis=1)],
+        }
+
+    print("=" * 80)
+    print(f"{'calibration':<13}{'fit s':>9}{'accuracy':>10}{'log loss':>10}{'sklearn ms':>12}{'runtime ms':>12}")
+    print("=" * 80)
+    for name, r in results.items():
+        print(f"{name:<13}{r['fit_s']:>9.2f}{r['accuracy']:>10.4f}{r['log_loss']:>10.4f}"
+              f"{r['sklearn_ms']:>12.3f}{r['runtime_ms']:>12.3f}")
+    agreement = np.mean(results['platt']['top'] == results['softmax']['top'])
+    print(f"\nTop-1 agreement on {len(y_test)} test rows: {agreement:.2%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Free-text symptom extraction benchmark
+======================================
+
+Times SymptomExtractor (models/symptom_extractor.py) on sentences padded to
+increasing lengths, with the shipped synonyms table and with thousands of
+synthetic synonyms added. The Aho-Corasick pass should cost about the same per
+kilobyte at every length and every phrase count. As a baseline it also times
+searching the normalized text for each phrase in turn, which grows with the
+phrase count and reports nested phrases too ("fever" inside "high fever");
+the 'same' column checks that it finds every symptom the extractor does.
+
+Usage (from backend-api/):
+    python benchmarks/bench_symptom_extraction.py --lengths 200 2000 20000 200000 --synonyms 0 1000 10000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from symptom_extractor import SymptomExtractor, phrase_words
+from symptom_index import DEFAULT_SYNONYMS_PATH, SymptomIndex
+
+SENTENCES = [
+    "I've had a headache and high fever since Monday.",
+    "My kid keeps throwing up and has a stomach ache, no appetite at all.",
+    "Shortness of breath at night, some chest pain and I feel dizzy when I stand.",
+    "Skin rash on both arms with itching, and my joints are fine.",
+    "We drove to the coast for the weekend and the weather was lovely.",
+]
+FILLER_WORDS = ['since', 'yesterday', 'really', 'bad', 'the', 'and', 'morning', 'after', 'lunch', 'kind', 'of']
+
+
+def synthetic_synonyms(synonyms, n_extra, rng):
+    """Copy of synonyms with n_extra random two- and three-word phrases spread over the symptoms"""
+    extended = {name: list(terms) for name, terms in synonyms.items()}
+    names = list(extended)
+    for i in range(n_extra):
+        words = rng.sample(FILLER_WORDS, rng.randint(1, 2)) + [f'term{i}']
+        extended[names[i % len(names)]].append(' '.join(words))
+    return extended
+
+
+def sample_text(length, rng):
+    """Sentences in random order until the text reaches length characters"""
+    parts, size = [], 0
+    while size < length:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return ' '.join(parts)[:length]
+
+
+def naive_extract(index, text):
+    """Each phrase searched for in turn as whole words of the normalized text"""
+    padded = f" {' '.join(phrase_words(text))} "
+    found = {}
+    for key, symptom_id in zip(index.keys, index.key_ids):
+        phrase = f" {' '.join(phrase_words(key))} "
+        if len(phrase) > 2 and phrase in padded:
+            found.setdefault(symptom_id, padded.index(phrase))
+    return found
+
+
+def timed(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[200, 2000, 20000, 200000])
+    parser.add_argument('--synonyms', type=int, nargs='+', default=[0, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with open(DEFAULT_SYNONYMS_PATH) as f:
+        synonyms = json.load(f)['synonyms']
+    texts = {length: sample_text(length, rng) for length in args.lengths}
+
+    print("=" * 80)
+    print(f"{'phrases':>8}{'build ms':>10}{'chars':>9}{'extract ms':>12}{'us per KB':>11}"
+          f"{'naive ms':>11}{'naive us/KB':>13}{'same':>6}")
+    print("=" * 80)
+    for n_extra in args.synonyms:
+        start = time.perf_counter()
+        index = SymptomIndex(synonyms=synthetic_synonyms(synonyms, n_extra, rng))
+        extractor = SymptomExtractor(index)
+        build_ms = (time.perf_counter() - start) * 1000
+        for length, text in texts.items():
+            repeat = max(args.repeat * 200 // max(length // 100, 1), 3)
+            extract = timed(lambda: extractor.extract(text), repeat)
+            naive = timed(lambda: naive_extract(index, text), max(repeat // 5, 3))
+            same = set(extractor.extract(text)) <= set(naive_extract(index, text))
+            kb = len(text) / 1024
+            print(f"{len(index.keys):>8}{build_ms:>10.1f}{len(text):>9}{extract * 1e3:>12.3f}{extract * 1e6 / kb:>11.1f}"
+                  f"{naive * 1e3:>11.3f}{naive * 1e6 / kb:>13.1f}{str(same):>6}")
+
+    extractor = SymptomExtractor(SymptomIndex.load())
+    print()
+    for sentence in SENTENCES:
+        found = [mention['symptom'] for mention in extractor.find(sentence)]
+        print(f"{sentence!r}\n    -> {found}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Symptom index latency
+=====================
+
+Times SymptomIndex (models/symptom_index.py) build, lookup and suggest calls
+for the kinds of input /predict, /symptoms/normalize and /symptoms/suggest
+receive: exact names, synonyms, misspellings, unknown text and short
+autocomplete prefixes. Also reports for how many of the misspellings lookup's
+closest match is the intended symptom (offered as a suggestion, never resolved).
+
+Usage (from backend-api/):
+    python benchmarks/bench_symptom_index.py --repeat 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from symptom_index import SymptomIndex
+
+QUERIES = {
+    'exact name': ['skin_rash', 'High Fever', 'nodal-skin-eruptions', 'spotting  urination'],
+    'synonym': ['throwing up', 'shortness of breath', 'sore throat', 'diarrhea'],
+    'misspelling': ['hight fevr', 'vomitting', 'stomach pian', 'heachache', 'nausia', 'itchin'],
+    'unknown': ['blarg', 'purple elbows', 'xyz'],
+}
+PREFIXES = ['s', 'sk', 'skin r', 'fev', 'pain', 'yel', 'brea']
+MISSPELLINGS = {
+    'hight fevr': 'high_fever', 'vomitting': 'vomiting', 'stomach pian': 'stomach_pain',
+    'heachache': 'headache', 'nausia': 'nausea', 'itchin': 'itching', 'diarhea': 'diarrhoea',
+    'cogh': 'cough', 'fatige': 'fatigue', 'constipaton': 'constipation', 'yelow skin': 'yellowish_skin',
+    'joint pian': 'joint_pain', 'brethlessness': 'breathlessness', 'dizzyness': 'dizziness',
+}
+
+
+def per_call_us(fn, inputs, repeat):
+    """Median microseconds per call over repeat passes through inputs"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in inputs:
+            fn(text)
+        times.append((time.perf_counter() - start) / len(inputs))
+    return float(np.median(times)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = SymptomIndex.load()
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Index build: {build_ms:.1f} ms ({len(index.keys)} names and synonyms, "
+          f"{len(index.trigram_index)} trigrams)")
+
+    print("=" * 48)
+    print(f"{'input':<22}{'lookup us':>12}{'suggest us':>14}")
+    print("=" * 48)
+    for kind, inputs in QUERIES.items():
+        lookup = per_call_us(index.lookup, inputs, args.repeat)
+        suggest = per_call_us(lambda text: index.suggest(text, 10), inputs, args.repeat)
+        print(f"{kind:<22}{lookup:>12.1f}{suggest:>14.1f}")
+    suggest = per_call_us(lambda text: index.suggest(text, 10), PREFIXES, args.repeat)
+    print(f"{'autocomplete prefix':<22}{'-':>12}{suggest:>14.1f}")
+
+    resolved = sum(
+        (match := index.lookup(text)) is not None and index.vocabulary[match[0]] == expected
+        for text, expected in MISSPELLINGS.items()
+    )
+    print(f"\nMisspellings whose closest match is the intended symptom: {resolved} of {len(MISSPELLINGS)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Symptom overlap ranking benchmark
+=================================
+
+Times ranking every disease by symptoms shared with a query, and finding the
+diseases most similar to one disease, with SymptomSetIndex
+(models/symptom_sets.py) against intersecting Python sets disease by disease.
+Synthetic catalogs of increasing size list 8 random symptoms per disease,
+like symtoms_df.csv; 'same' checks that both give the same ranking.
+
+Usage (from backend-api/):
+    python benchmarks/bench_symptom_sets.py --diseases 41 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from feature_encoder import SYMPTOM_VOCABULARY
+from symptom_sets import SymptomSetIndex
+
+
+def set_rank(sets, query, limit):
+    """Each disease's symptom set intersected with the query in turn"""
+    scored = []
+    for disease_id, symptoms in enumerate(sets):
+        matched = len(symptoms & query)
+        if matched:
+            scored.append((disease_id, matched, matched / len(symptoms | query)))
+    scored.sort(key=lambda entry: (-entry[1], -entry[2], entry[0]))
+    return scored[:limit]
+
+
+def set_similar(sets, disease_id, limit):
+    target = sets[disease_id]
+    scored = []
+    for other, symptoms in enumerate(sets):
+        shared = len(symptoms & target)
+        if shared and other != disease_id:
+            scored.append((other, shared, shared / len(symptoms | target)))
+    scored.sort(key=lambda entry: (-entry[2], entry[0]))
+    return scored[:limit]
+
+
+def timed(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--diseases', type=int, nargs='+', default=[41, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = list(SYMPTOM_VOCABULARY)
+    print("=" * 80)
+    print(f"{'diseases':>9}{'build ms':>10}{'rank sets us':>14}{'rank bits us':>14}"
+          f"{'similar sets us':>17}{'similar bits us':>17}{'same':>6}")
+    print("=" * 80)
+    for n in args.diseases:
+        disease_symptoms = [rng.sample(vocabulary, 8) for _ in range(n)]
+        sets = [{vocabulary.index(name) for name in names} for names in disease_symptoms]
+        start = time.perf_counter()
+        index = SymptomSetIndex(disease_symptoms, vocabulary)
+        build_ms = (time.perf_counter() - start) * 1e3
+        query = set(rng.sample(range(len(vocabulary)), 4))
+        repeat = max(args.repeat * 41 // n, 5)
+
+        rank_sets = timed(lambda: set_rank(sets, query, 10), repeat)
+        rank_bits = timed(lambda: index.rank_by_symptoms(query, 10), repeat)
+        similar_sets = timed(lambda: set_similar(sets, 0, 10), repeat)
+        similar_bits = timed(lambda: index.similar_diseases(0, 10), repeat)
+        same = (set_rank(sets, query, 10) == index.rank_by_symptoms(query, 10)
+                and set_similar(sets, 0, 10) == index.similar_diseases(0, 10))
+        print(f"{n:>9}{build_ms:>10.1f}{rank_sets * 1e6:>14.1f}{rank_bits * 1e6:>14.1f}"
+              f"{similar_sets * 1e6:>17.1f}{similar_bits * 1e6:>17.1f}{str(same):>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Training-data builder benchmark
+===============================
+
+Generates synthetic symptoms CSVs shaped like datasets/symtoms_df.csv (padded
+symptom names, empty trailing slots, the odd unknown or duplicated symptom)
+and times the chunked columnar builder (build_training_matrix) against the
+previous iterrows + per-row dict path. Where both run, the matrices must be
+identical.
+
+Usage (from backend-api/):
+    python benchmarks/bench_training_data.py --rows 10000 100000 1000000 --legacy-max-rows 100000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from feature_encoder import CANONICAL_FEATURE_NAMES, SYMPTOM_VOCABULARY
+from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
+
+
+def write_synthetic_csv(path, n_rows, seed=0):
+    rng = random.Random(seed)
+    diseases = [f'Disease {i}' for i in range(40)] + ['Diabetes ']
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['', 'Disease', 'Symptom_1', 'Symptom_2', 'Symptom_3', 'Symptom_4'])
+        for i in range(n_rows):
+            symptoms = [' ' + s for s in rng.sample(SYMPTOM_VOCABULARY, 4)]
+            if rng.random() < 0.3:
+                symptoms[3] = ''
+            if rng.random() < 0.1:
+                symptoms[2] = ' '
+            if rng.random() < 0.01:
+                symptoms[1] = ' unknown_symptom'
+            if rng.random() < 0.01:
+                symptoms[0] = symptoms[1]
+            writer.writerow([i, rng.choice(diseases)] + symptoms)
+
+
+def legacy_build(predictor, path):
+    """The previous path: iterrows, one feature dict per row, nested list comprehension"""
+    df = pd.read_csv(path)
+    enhanced_data = []
+    for _, row in df.iterrows():
+        disease = row['Disease']
+        symptoms = [row['Symptom_1'], row['Symptom_2'], row['Symptom_3'], row['Symptom_4']]
+        symptoms = [s.strip() for s in symptoms if pd.notna(s) and s.strip()]
+        feature_vector = predictor.create_feature_vector(symptoms)
+        feature_vector.update(predictor.add_enhanced_features(symptoms, disease))
+        enhanced_data.append({'disease': disease, 'symptoms': symptoms, 'features': feature_vector})
+    feature_names = list(enhanced_data[0]['features'].keys())
+    X = np.array([[d['features'][f] for f in feature_names] for d in enhanced_data])
+    y = [d['disease'] for d in enhanced_data]
+    return X, y, feature_names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=100_000,
+                        help='skip the legacy path above this size (it needs minutes per million rows)')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    predictor = ImprovedEnhancedMedicalPredictor()
+    print("=" * 80)
+    print(f"{'rows':>10}{'legacy s':>11}{'chunked s':>11}{'speedup':>10}{'rows/s':>13}{'X MB':>9}{'identical':>12}")
+    print("=" * 80)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = os.path.join(tmp, f'symptoms_{n_rows}.csv')
+            write_synthetic_csv(path, n_rows)
+
+            start = time.perf_counter()
+            X, y = predictor.build_training_matrix(path, chunksize=args.chunksize)
+            chunked_s = time.perf_counter() - start
+
+            legacy = identical = '-'
+            speedup = ''
+            if n_rows <= args.legacy_max_rows:
+                start = time.perf_counter()
+                X_legacy, y_legacy, feature_names = legacy_build(predictor, path)
+                legacy_s = time.perf_counter() - start
+                identical = str(feature_names == CANONICAL_FEATURE_NAMES and np.array_equal(X, X_legacy)
+                                and list(y) == y_legacy)
+                legacy = f'{legacy_s:.2f}'
+                speedup = f'{legacy_s / chunked_s:.0f}x'
+
+            print(f"{n_rows:>10}{legacy:>11}{chunked_s:>11.2f}{speedup:>10}{n_rows / chunked_s:>13.0f}"
+                  f"{X.nbytes / 1e6:>9.1f}{identical:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Per-worker memory with pickled, .npz and memory-mapped model artifacts
+======================================================================
+
+Starts --workers interpreters per artifact format, like gunicorn workers on
+one host. Each loads the models, serves a spread of predictions and then
+reports its memory from /proc/self/smaps_rollup while all of them are still
+alive, so pages shared through the page cache are counted once in PSS:
+
+    RSS      resident pages, shared or not (what `ps` and `top` show)
+    PSS      RSS with each shared page divided by the processes mapping it
+    private  pages only this worker holds
+
+Usage (from backend-api/, Linux only):
+    python models/numpy_runtime.py --output models/improved_enhanced_runtime
+    python models/numpy_runtime.py --output models/improved_enhanced_runtime.npz
+    python benchmarks/bench_worker_memory.py --workers 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, 'models')
+
+
+def smaps_rollup():
+    """Return RSS, PSS and private memory of this process in MB"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'rss_mb': fields['Rss'],
+        'pss_mb': fields['Pss'],
+        'private_mb': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def worker(artifact, path):
+    """Runs inside each child: load, predict, report, then stay alive until the parent is done"""
+    import itertools
+
+    sys.path.append(MODELS_DIR)
+    from feature_encoder import SYMPTOM_VOCABULARY
+    from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
+
+    predictor = ImprovedEnhancedMedicalPredictor()
+    if artifact == 'pickle':
+        predictor.load_models(path)
+    else:
+        predictor.load_numpy_runtime(path)
+
+    # Touch a realistic share of the model: 200 different requests, one at a time
+    for ids in itertools.islice(itertools.combinations(range(len(SYMPTOM_VOCABULARY)), 3), 0, 20000, 100):
+        predictor.predict_disease([SYMPTOM_VOCABULARY[i] for i in ids])
+
+    print(json.dumps(smaps_rollup()), flush=True)
+    sys.stdin.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--model', default=os.path.join(MODELS_DIR, 'improved_enhanced_models.pkl'))
+    parser.add_argument('--npz', default=os.path.join(MODELS_DIR, 'improved_enhanced_runtime.npz'))
+    parser.add_argument('--mmap', default=os.path.join(MODELS_DIR, 'improved_enhanced_runtime'))
+    parser.add_argument('--child', choices=['pickle', 'npz', 'mmap'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        worker(args.child, args.path)
+        return
+
+    print("=" * 78)
+    print(f"{'artifact':<10}{'workers':>9}{'RSS/worker':>13}{'PSS/worker':>13}{'private/worker':>16}{'total PSS':>13}")
+    print("=" * 78)
+    for artifact, path in [('pickle', args.model), ('npz', args.npz), ('mmap', args.mmap)]:
+        if not os.path.exists(path):
+            print(f"{artifact:<10}  skipped, {path} not found")
+            continue
+        children = [
+            subprocess.Popen([sys.executable, __file__, '--child', artifact, '--path', path],
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+            for _ in range(args.workers)
+        ]
+        # Read every report before releasing any worker so all mappings are live at once
+        reports = [json.loads(child.stdout.readline()) for child in children]
+        for child in children:
+            child.stdin.close()
+            child.wait()
+
+        def mean(key):
+            return sum(report[key] for report in reports) / len(reports)
+
+        print(f"{artifact:<10}{args.workers:>9}{mean('rss_mb'):>13.0f}{mean('pss_mb'):>13.0f}"
+              f"{mean('private_mb'):>16.0f}{mean('pss_mb') * args.workers:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
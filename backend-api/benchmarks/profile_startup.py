@@ -0,0 +1,276 @@
+"""
+Cold-start profiler for every entry point
+=========================================
+
+Launches each entry point in a fresh interpreter (python -X importtime) and
+drives its first two requests in-process, then writes one JSON report:
+
+    ready_s          interpreter launch until the entry point module is imported
+    import_s         importing the entry point module alone
+    first_ms         the first request (pays any lazy model or dataset load)
+    second_ms        the same request again
+    peak_rss_mb      peak resident memory of the process after both requests
+    modules          modules imported by the entry point
+    import_tree      -X importtime tree of the entry point's imports (ms),
+                     pruned to nodes above --min-ms and --depth levels deep
+
+Flask apps are driven through app.test_client(); the api/ serverless
+handlers (BaseHTTPRequestHandler subclasses) are served on a loopback port.
+An entry point that fails to import or to answer is reported with its error
+and the others still run. The image-recognition request stops at input
+validation, so the profile never calls the external captioning API.
+
+--baseline compares against an earlier report and prints the change per
+metric; with --fail-over PCT it exits non-zero when ready time or first
+request latency grew by more than PCT percent, for use in review.
+
+Usage (from backend-api/):
+    python benchmarks/profile_startup.py --output startup_profile.json
+    python benchmarks/profile_startup.py --only backend-api api-predict --baseline startup_profile.json --fail-over 20
+    python benchmarks/profile_startup.py --workdir backend=/path/with/datasets/and/svc.pkl
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BASE_DIR)
+
+PREDICT_SYMPTOMS = ['itching', 'skin_rash', 'nodal_skin_eruptions']
+
+# name -> (entry point file and working directory relative to the repository, kind, request)
+# kind is 'wsgi' for a Flask module exposing app, 'handler' for a serverless handler class;
+# a request is (method, path, body), with the body sent as JSON or, under 'form', as form data
+ENTRY_POINTS = {
+    'backend-api': ('backend-api/main.py', 'backend-api', 'wsgi',
+                    ('POST', '/predict', {'symptoms': PREDICT_SYMPTOMS})),
+    'backend-api-wsgi': ('backend-api/wsgi.py', 'backend-api', 'wsgi',
+                         ('POST', '/predict', {'symptoms': PREDICT_SYMPTOMS})),
+    'chatbot-service': ('backend-api/chatbot-service/app.py', 'backend-api/chatbot-service', 'wsgi',
+                        ('GET', '/get_chats', None)),
+    'backend': ('backend/app.py', 'backend', 'wsgi',
+                ('POST', '/predict', {'symptoms': PREDICT_SYMPTOMS})),
+    'root': ('main.py', '.', 'wsgi',
+             ('POST', '/predict', {'form': {'symptoms': ','.join(PREDICT_SYMPTOMS)}})),
+    'api-predict': ('api/predict.py', 'api', 'handler',
+                    ('POST', '/api/predict', {'symptoms': PREDICT_SYMPTOMS})),
+    'api-check-disease': ('api/check_disease.py', 'api', 'handler',
+                          ('POST', '/api/check_disease', {'disease_name': 'Diabetes'})),
+    'api-chatbot': ('api/chatbot.py', 'api', 'handler',
+                    ('POST', '/api/chatbot', {'input': 'I have a headache'})),
+    'api-image-recognition': ('api/image-recognition.py', 'api', 'handler',
+                              ('POST', '/api/image-recognition', {'image': ''})),
+}
+
+MARKER = '@@profile_startup@@'
+
+# Runs in the profiled interpreter: argv is path, kind, request JSON, launch time
+DRIVER = r'''
+import http.client, http.server, importlib.util, json, os, resource, sys, threading, time
+
+MARKER = %(marker)r
+path, kind, request, launched = sys.argv[1], sys.argv[2], json.loads(sys.argv[3]), float(sys.argv[4])
+method, url, body = request
+sys.path.insert(0, os.path.dirname(path))
+name = os.path.splitext(os.path.basename(path))[0].replace('-', '_')
+result = {}
+
+def send_wsgi(client):
+    kwargs = {}
+    if body is not None:
+        kwargs = {'data': body['form']} if 'form' in body else {'json': body}
+    response = client.open(url, method=method, **kwargs)
+    response.get_data()
+    return response.status_code
+
+def send_handler(port):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+    data = json.dumps(body).encode() if body is not None else None
+    connection.request(method, url, body=data, headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    return response.status
+
+sys.stderr.write(MARKER + '\n')
+sys.stderr.flush()
+try:
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    result['import_s'] = time.perf_counter() - start
+    result['ready_s'] = time.time() - launched
+    sys.stderr.write(MARKER + '\n')
+    sys.stderr.flush()
+
+    if kind == 'wsgi':
+        client = module.app.test_client()
+        send = lambda: send_wsgi(client)
+    else:
+        server = http.server.HTTPServer(('127.0.0.1', 0), module.handler)
+        server.RequestHandlerClass.log_message = lambda *args: None
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        send = lambda: send_handler(server.server_port)
+    for label in ('first', 'second'):
+        start = time.perf_counter()
+        result[f'{label}_status'] = send()
+        result[f'{label}_ms'] = (time.perf_counter() - start) * 1000
+except BaseException as e:
+    result['error'] = f'{type(e).__name__}: {e}'
+    sys.stderr.write(MARKER + '\n')
+finally:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result['peak_rss_mb'] = rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    sys.stdout.write('\n' + MARKER + json.dumps(result) + '\n')
+    sys.stdout.flush()
+    os._exit(0)
+''' % {'marker': MARKER}
+
+
+def import_tree(lines, min_ms, depth):
+    """Nested {module, self_ms, cumulative_ms, children} nodes from -X importtime lines
+
+    importtime prints a module after everything it imported, indented two spaces
+    per level, so each line adopts the pending lines one level deeper.
+    """
+    pending = {}
+    count = 0
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            self_ms, cumulative_ms = int(self_us) / 1000, int(cumulative_us) / 1000
+        except ValueError:
+            continue  # the column header
+        level = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        node = {'module': name.strip(), 'self_ms': round(self_ms, 2), 'cumulative_ms': round(cumulative_ms, 2)}
+        children = pending.pop(level + 1, [])
+        if children:
+            node['children'] = children
+        pending.setdefault(level, []).append(node)
+        count += 1
+
+    def prune(nodes, level):
+        kept = sorted((node for node in nodes if node['cumulative_ms'] >= min_ms),
+                      key=lambda node: node['cumulative_ms'], reverse=True)
+        for node in kept:
+            children = node.pop('children', [])
+            if level < depth and children:
+                node['children'] = prune(children, level + 1)
+        return kept
+
+    roots = [node for level in sorted(pending) for node in pending[level]]
+    total_ms = sum(node['cumulative_ms'] for node in roots)
+    return prune(roots, 1), count, round(total_ms, 2)
+
+
+def profile(name, args):
+    relative_path, relative_cwd, kind, request = ENTRY_POINTS[name]
+    path = os.path.join(REPO_DIR, relative_path)
+    cwd = args.workdirs.get(name, os.path.join(REPO_DIR, relative_cwd))
+    if not os.path.exists(path):
+        return {'path': relative_path, 'error': 'entry point not found'}
+
+    command = [sys.executable, '-X', 'importtime', '-c', DRIVER, path, kind, json.dumps(request), repr(time.time())]
+    try:
+        process = subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return {'path': relative_path, 'error': f'timed out after {args.timeout}s'}
+
+    report = {'path': relative_path, 'cwd': os.path.relpath(cwd, REPO_DIR)}
+    results = [line[len(MARKER):] for line in process.stdout.splitlines() if line.startswith(MARKER)]
+    if not results:
+        report['error'] = f'interpreter exited with {process.returncode}: {process.stderr.strip()[-500:]}'
+        return report
+    report.update(json.loads(results[-1]))
+
+    # The entry point's own imports are the lines between the two markers
+    sections = process.stderr.split(MARKER + '\n')
+    lines = sections[1].splitlines() if len(sections) > 1 else []
+    report['import_tree'], report['modules'], report['import_tree_ms'] = import_tree(lines, args.min_ms, args.depth)
+    return report
+
+
+METRICS = ['ready_s', 'import_s', 'first_ms', 'second_ms', 'peak_rss_mb', 'modules']
+
+
+def compare(report, baseline, fail_over):
+    """Print each metric's change against a baseline report; returns the regressions over fail_over percent"""
+    regressions = []
+    print()
+    print("=" * 84)
+    print(f"{'entry point':<24}{'metric':<14}{'baseline':>12}{'now':>12}{'change':>10}")
+    print("=" * 84)
+    for name, entry in report['entry_points'].items():
+        before = baseline.get('entry_points', {}).get(name)
+        if not before or 'error' in entry or 'error' in before:
+            continue
+        for metric in METRICS:
+            if metric not in entry or metric not in before or not before[metric]:
+                continue
+            change = (entry[metric] - before[metric]) / before[metric] * 100
+            print(f"{name:<24}{metric:<14}{before[metric]:>12.2f}{entry[metric]:>12.2f}{change:>+9.0f}%")
+            if fail_over is not None and metric in ('ready_s', 'first_ms') and change > fail_over:
+                regressions.append(f"{name} {metric} {change:+.0f}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=list(ENTRY_POINTS), help='entry points to profile (default: all)')
+    parser.add_argument('--workdir', action='append', default=[], metavar='NAME=DIR',
+                        help='run an entry point in another working directory (e.g. one holding its datasets)')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='smallest cumulative import time kept in the tree')
+    parser.add_argument('--depth', type=int, default=3, help='levels of the import tree kept')
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--output', default='startup_profile.json')
+    parser.add_argument('--baseline', help='earlier report to compare against')
+    parser.add_argument('--fail-over', type=float, help='exit 1 when ready_s or first_ms grew by more than this percent')
+    args = parser.parse_args()
+    args.workdirs = {}
+    for item in args.workdir:
+        name, _, directory = item.partition('=')
+        if name not in ENTRY_POINTS or not directory:
+            parser.error(f"--workdir expects NAME=DIR with NAME one of {', '.join(ENTRY_POINTS)}")
+        args.workdirs[name] = os.path.abspath(directory)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'entry_points': {},
+    }
+    print("=" * 96)
+    print(f"{'entry point':<24}{'ready s':>9}{'import s':>10}{'first ms':>10}{'second ms':>11}"
+          f"{'RSS MB':>8}{'modules':>9}  status")
+    print("=" * 96)
+    for name in args.only or ENTRY_POINTS:
+        entry = report['entry_points'][name] = profile(name, args)
+        if 'import_s' not in entry:
+            print(f"{name:<24}  {entry['error'][:68]}")
+            continue
+        status = entry['error'][:30] if 'error' in entry else f"{entry['first_status']}/{entry['second_status']}"
+        print(f"{name:<24}{entry['ready_s']:>9.2f}{entry['import_s']:>10.2f}{entry.get('first_ms', 0):>10.1f}"
+              f"{entry.get('second_ms', 0):>11.1f}{entry['peak_rss_mb']:>8.0f}{entry['modules']:>9}  {status}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.fail_over)
+        if regressions:
+            print(f"\n❌ Cold-start regressions over {args.fail_over:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""
+CPU sizing shared by the gunicorn config and the ASGI entry point
+
+Imports nothing but the standard library, so it can run before numpy loads.
+"""
+import os
+
+
+def limit_blas_threads():
+    """One BLAS/OpenMP thread per worker thread: the workers already use every core and
+    nested thread pools would oversubscribe them. Must run before numpy loads."""
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ.setdefault(var, '1')
+
+
+def available_cpus():
+    """CPUs this process may run on (respects container CPU sets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
@@ -0,0 +1,38 @@
+"""
+Gunicorn settings for production serving (gunicorn -c gunicorn.conf.py wsgi:app)
+
+Inference is CPU bound, so the default is one worker process per available CPU
+with a couple of threads each to overlap request I/O with another request's
+model pass. Every value can be overridden from the environment.
+"""
+import os
+import sys
+
+# gunicorn runs this file before it puts the working directory on the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cpu_resources import available_cpus, limit_blas_threads
+
+limit_blas_threads()
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', available_cpus()))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+worker_class = 'gthread'
+
+# Load the models and warm them up once in the master before forking (see wsgi.py)
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+keepalive = 5
+accesslog = '-'
+
+
+def post_worker_init(worker):
+    """Start the model/dataset reload watcher in each worker.
+
+    Threads don't survive the fork, and gunicorn resets the worker's signal
+    handlers after post_fork, so this runs once the worker is initialized.
+    """
+    import main
+    main.start_reload_watcher()
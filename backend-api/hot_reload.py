@@ -0,0 +1,78 @@
+import os
+import signal
+import threading
+
+
+def files_fingerprint(paths):
+    """Modification time and size of every path (directories: of every file inside), None if missing
+
+    Directories are listed through their resolved path, so swapping a version
+    symlink to a new export (see numpy_runtime.save_arrays) changes the fingerprint
+    even when the new files have the same sizes and times.
+    """
+    fingerprint = {}
+    for path in paths:
+        if os.path.isdir(path):
+            root = os.path.realpath(path)
+            entries = sorted(os.path.join(root, name) for name in os.listdir(root))
+        else:
+            entries = [path]
+        for entry in entries:
+            try:
+                stat = os.stat(entry)
+                fingerprint[entry] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                fingerprint[entry] = None
+    return fingerprint
+
+
+class ReloadWatcher:
+    """Background thread that calls on_change(forced) when watched files change or a reload is requested.
+
+    Files are polled every interval seconds (0 disables polling) and a change only
+    triggers once the files look the same on two consecutive polls, so artifacts
+    that are still being copied are not loaded half-written. request_reload(), also
+    bound to a signal by install_signal_handler(), triggers a forced reload right away.
+    """
+
+    def __init__(self, paths, on_change, interval=10.0):
+        self.paths = paths
+        self.on_change = on_change
+        self.interval = interval
+        self._requested = threading.Event()
+        self._thread = None
+        self._fingerprint = files_fingerprint(self.paths())
+
+    def request_reload(self):
+        self._requested.set()
+
+    def install_signal_handler(self, signum=signal.SIGUSR2):
+        """Request a reload when the process receives signum (main thread only)"""
+        signal.signal(signum, lambda *_: self.request_reload())
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='reload-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        pending = None
+        while True:
+            requested = self._requested.wait(self.interval if self.interval > 0 else None)
+            self._requested.clear()
+            current = files_fingerprint(self.paths())
+            if not requested:
+                if current == self._fingerprint:
+                    pending = None
+                    continue
+                if current != pending:
+                    # Changed since the last poll: wait for it to settle
+                    pending = current
+                    continue
+            pending = None
+            try:
+                self.on_change(requested)
+            except Exception as e:
+                print(f"Error reloading: {e}")
+            self._fingerprint = current
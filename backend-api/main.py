@@ -1,18 +1,32 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, has_request_context
 from flask_cors import CORS
-import pandas as pd
 import numpy as np
-import pickle
 import warnings
 import sys
 import os
 import json
+import threading
 
 # Add the models directory to the path
 models_path = os.path.join(os.path.dirname(__file__), 'models')
 if os.path.exists(models_path):
     sys.path.append(models_path)
 
+from prediction_cache import PredictionCache
+from hot_reload import ReloadWatcher, files_fingerprint
+from symptom_index import SymptomIndex
+from feature_encoder import SYMPTOM_VOCABULARY
+from medical_rules import NO_RULE
+from disease_catalog import DiseaseCatalog
+from dataset_bundle import DEFAULT_BUNDLE_NAME, open_bundle, read_table
+from symptom_extractor import SymptomExtractor
+from json_fragments import dumps, splice
+
+try:
+    from answer_table import AnswerTable
+except ImportError:
+    AnswerTable = None
+
 # Try to import the improved enhanced model
 try:
     from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
@@ -41,231 +55,430 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
-# Global predictor instance
-_predictor = None
+# Model runtime used for serving: 'sklearn' (pickled estimators) or 'numpy'
+# (arrays exported by models/numpy_runtime.py, evaluated without sklearn)
+MODEL_RUNTIME = os.environ.get('MODEL_RUNTIME', 'sklearn')
 
-def get_predictor():
-    """Get or create the predictor instance"""
-    global _predictor
-    if _predictor is None:
-        try:
-            _predictor = ImprovedEnhancedMedicalPredictor()
-            
-            # Try to load pre-trained models with fallback paths
-            base_dir = os.path.dirname(__file__)
-            model_paths = [
-                os.path.join(base_dir, 'models', 'improved_enhanced_models.pkl'),
-                os.path.join(base_dir, '..', 'models', 'improved_enhanced_models.pkl'),
-                'models/improved_enhanced_models.pkl'
-            ]
-            
-            model_loaded = False
-            for model_path in model_paths:
-                if os.path.exists(model_path):
-                    try:
-                        with open(model_path, 'rb') as f:
-                            data = pickle.load(f)
-                            _predictor.models = data['models']
-                            _predictor.label_encoder = data['label_encoder']
-                            _predictor.feature_names = data['feature_names']
-                        print(f"✅ Pre-trained models loaded successfully from {model_path}!")
-                        model_loaded = True
-                        break
-                    except Exception as e:
-                        print(f"Error loading model from {model_path}: {e}")
-                        continue
-            
-            if not model_loaded:
-                # Train new models if pre-trained ones don't exist
-                print("Training new models...")
+# Maximum number of cases accepted by /predict/batch
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 1000))
+
+# Default prediction mode ('ensemble' runs every model, 'cascade' stops early once
+# the winning probability reaches CASCADE_THRESHOLD)
+PREDICTION_MODE = os.environ.get('PREDICTION_MODE', 'ensemble')
+CASCADE_THRESHOLD = float(os.environ.get('CASCADE_THRESHOLD', 0.9))
+
+# In-process LRU cache of prediction results keyed by the canonical symptom set
+# (set PREDICTION_CACHE_SIZE=0 to disable)
+_prediction_cache = PredictionCache(int(os.environ.get('PREDICTION_CACHE_SIZE', 1024)))
+
+# Precomputed answers for small symptom combinations (built with models/answer_table.py);
+# only used when it was built from the loaded model
+ANSWER_TABLE_PATH = os.environ.get('ANSWER_TABLE_PATH', os.path.join(os.path.dirname(__file__), 'models', 'answer_table'))
+
+# Declarative medical override rules (see models/medical_rules.py)
+MEDICAL_RULES_PATH = os.environ.get('MEDICAL_RULES_PATH', os.path.join(os.path.dirname(__file__), 'models', 'medical_rules.json'))
+
+# Synonyms table used to map free-text symptoms onto the model vocabulary
+SYMPTOM_SYNONYMS_PATH = os.environ.get('SYMPTOM_SYNONYMS_PATH', os.path.join(os.path.dirname(__file__), 'models', 'symptom_synonyms.json'))
+
+# Seconds between checks of the model artifacts and datasets for changes
+# (0 disables polling; SIGUSR2 still triggers a reload)
+RELOAD_INTERVAL = float(os.environ.get('RELOAD_INTERVAL', 10))
+
+# Pre-trained model locations, tried in order
+MODEL_PATHS = [
+    os.path.join(os.path.dirname(__file__), 'models', 'improved_enhanced_models.pkl'),
+    os.path.join(os.path.dirname(__file__), '..', 'models', 'improved_enhanced_models.pkl'),
+    'models/improved_enhanced_models.pkl'
+]
+
+# Datasets the disease catalog is built from (read at startup and on reload, never per request)
+DATASET_FILES = {
+    'symptoms': 'symtoms_df.csv',
+    'description': 'description.csv',
+    'precautions': 'precautions_df.csv',
+    'medications': 'medications.csv',
+    'diets': 'diets.csv',
+    'workout': 'workout_df.csv',
+}
+
+# Binary bundle of the dataset CSVs (models/dataset_bundle.py), used instead of parsing
+# them when present and still matching their checksums
+DATASET_BUNDLE_PATH = os.environ.get('DATASET_BUNDLE_PATH', os.path.join(os.path.dirname(__file__), 'datasets', DEFAULT_BUNDLE_NAME))
+
+# Symptom name index (exact names, synonyms, prefixes and misspellings), built once at startup
+_symptom_index = SymptomIndex.load(SYMPTOM_SYNONYMS_PATH)
+
+# Aho-Corasick automaton over the same names and synonyms, for free-text input
+_symptom_extractor = SymptomExtractor(_symptom_index)
+
+# Longest free-text input accepted by /predict and /symptoms/extract, in characters
+MAX_TEXT_LENGTH = int(os.environ.get('MAX_TEXT_LENGTH', 20000))
+
+def runtime_paths():
+    """NumPy runtime locations, preferring the memory-mapped directory format, which workers share"""
+    return [
+        model_path.replace('improved_enhanced_models.pkl', runtime_name)
+        for model_path in MODEL_PATHS
+        for runtime_name in ('improved_enhanced_runtime', 'improved_enhanced_runtime.npz')
+    ]
+
+class ServingState:
+    """Predictor, answer table, disease catalog and dataset rows that a request reads together.
+
+    A reload builds a complete new ServingState and replaces the single _state reference;
+    each request pins the state it started with (see pin_serving_state), so in-flight
+    requests finish on the old version. The catalog (disease IDs, names, symptoms and
+    information) is built with the predictor, and results only carry IDs until they are
+    serialized from it.
+    """
+
+    def __init__(self, datasets, predictor=None, answer_table=None, model_fingerprint=None, catalog=None):
+        self.datasets = datasets
+        self.predictor = predictor
+        self.answer_table = answer_table
+        self.model_fingerprint = model_fingerprint
+        self.catalog = catalog
+
+_state = None
+_state_lock = threading.Lock()
+
+def current_state():
+    """Serving state pinned to the current request, or the latest one outside requests"""
+    if has_request_context() and 'serving_state' in g:
+        return g.serving_state
+    return _state
+
+@app.before_request
+def pin_serving_state():
+    g.serving_state = _state
+
+def load_answer_table(predictor):
+    """Load the precomputed answer table if it matches the predictor's model, else None"""
+    if AnswerTable is None or not ANSWER_TABLE_PATH or not os.path.exists(ANSWER_TABLE_PATH):
+        return None
+    try:
+        table = AnswerTable.load(ANSWER_TABLE_PATH)
+    except Exception as e:
+        print(f"Error loading answer table from {ANSWER_TABLE_PATH}: {e}")
+        return None
+    if table.model_version != predictor.model_version:
+        print(f"Warning: answer table {ANSWER_TABLE_PATH} was built from another model, ignoring it")
+        return None
+    if table.rules_version != predictor.rules.version:
+        print(f"Warning: answer table {ANSWER_TABLE_PATH} was built with other medical rules, ignoring it")
+        return None
+    if list(table.symptoms) != SYMPTOM_VOCABULARY:
+        print(f"Warning: answer table {ANSWER_TABLE_PATH} was built with another symptom vocabulary, ignoring it")
+        return None
+    print(f"✅ Answer table loaded: {len(table)} combinations of up to {table.max_size} symptoms")
+    return table
+
+def load_predictor(train_if_missing=True):
+    """Create a predictor from the first loadable model artifact, or None"""
+    predictor = ImprovedEnhancedMedicalPredictor()
+    
+    model_loaded = False
+    if MODEL_RUNTIME == 'numpy':
+        for runtime_path in runtime_paths():
+            if os.path.exists(runtime_path):
+                try:
+                    predictor.load_numpy_runtime(runtime_path)
+                    print(f"✅ NumPy runtime loaded successfully from {runtime_path}!")
+                    model_loaded = True
+                    break
+                except Exception as e:
+                    print(f"Error loading NumPy runtime from {runtime_path}: {e}")
+                    continue
+    
+    if not model_loaded:
+        for model_path in MODEL_PATHS:
+            if os.path.exists(model_path):
                 try:
-                    enhanced_data = _predictor.load_and_preprocess_data()
-                    X_test, y_test = _predictor.train_models(enhanced_data)
-                    print("✅ New models trained successfully!")
+                    predictor.load_models(model_path)
+                    print(f"✅ Pre-trained models loaded successfully from {model_path}!")
+                    model_loaded = True
+                    break
                 except Exception as e:
-                    print(f"Error training models: {e}")
-                    _predictor = None
+                    print(f"Error loading model from {model_path}: {e}")
+                    continue
+    
+    if not model_loaded:
+        if not train_if_missing:
+            return None
+        # Train new models if pre-trained ones don't exist
+        print("Training new models...")
+        try:
+            training_data = predictor.load_and_preprocess_data()
+            X_test, y_test = predictor.train_models(training_data)
+            print("✅ New models trained successfully!")
         except Exception as e:
-            print(f"Error initializing predictor: {e}")
-            _predictor = None
-    return _predictor
+            print(f"Error training models: {e}")
+            return None
+    
+    predictor.load_rules(MEDICAL_RULES_PATH)
+    print(f"✅ {len(predictor.rules)} medical rules loaded from {MEDICAL_RULES_PATH}")
+    return predictor
+
+def get_predictor():
+    """Get or create the predictor instance of the current serving state"""
+    state = current_state()
+    if state.predictor is None:
+        with _state_lock:
+            if state.predictor is None:
+                try:
+                    state.model_fingerprint = files_fingerprint(model_artifact_paths())
+                    predictor = load_predictor()
+                    if predictor is not None:
+                        state.answer_table = load_answer_table(predictor)
+                        state.catalog = DiseaseCatalog.build(predictor.label_encoder.classes_, state.datasets)
+                    state.predictor = predictor
+                except Exception as e:
+                    print(f"Error initializing predictor: {e}")
+    return state.predictor
+
+def get_catalog():
+    """Disease catalog of the current serving state, built from the datasets alone if no model loads"""
+    state = current_state()
+    if state.catalog is None and get_predictor() is None:
+        build_dataset_catalog(state)
+    return state.catalog
+
+def build_dataset_catalog(state):
+    """Build the catalog of a serving state from its datasets alone, for when no model is loaded"""
+    with _state_lock:
+        if state.catalog is None:
+            state.catalog = DiseaseCatalog.build((), state.datasets)
+    return state.catalog
+
+def dataset_paths(filename):
+    """Candidate locations of a dataset: the local datasets folder (deployment), then the parent one"""
+    base_dir = os.path.dirname(__file__)
+    return [
+        os.path.join(base_dir, 'datasets', filename),
+        os.path.join(base_dir, '..', 'datasets', filename)
+    ]
 
 # Load the datasets - try local first, then fallback to relative paths
 def load_dataset(filename):
-    """Load dataset with fallback paths"""
-    base_dir = os.path.dirname(__file__)
-    # Try local datasets folder first (for deployment)
-    local_path = os.path.join(base_dir, 'datasets', filename)
-    if os.path.exists(local_path):
-        return pd.read_csv(local_path)
-    # Try parent datasets folder
-    parent_path = os.path.join(base_dir, '..', 'datasets', filename)
-    if os.path.exists(parent_path):
-        return pd.read_csv(parent_path)
+    """Load dataset rows with fallback paths"""
+    for path in dataset_paths(filename):
+        if os.path.exists(path):
+            return read_table(path)
     raise FileNotFoundError(f"Dataset not found: {filename}. Make sure datasets are in the backend-api/datasets folder.")
 
+def dataset_source(filename):
+    """The CSV load_dataset would read for a dataset, or None"""
+    return next((path for path in dataset_paths(filename) if os.path.exists(path)), None)
+
+def load_datasets():
+    """Load the rows of every dataset the disease catalog is built from, from the bundle when it is fresh"""
+    bundle = open_bundle(DATASET_BUNDLE_PATH, {filename: dataset_source(filename) for filename in DATASET_FILES.values()})
+    return {
+        name: bundle.rows(filename) if bundle is not None and filename in bundle else load_dataset(filename)
+        for name, filename in DATASET_FILES.items()
+    }
+
 # Load datasets
 try:
-    description = load_dataset('description.csv')
-    precautions = load_dataset('precautions_df.csv')
-    medications = load_dataset('medications.csv')
-    diets = load_dataset('diets.csv')
-    workout = load_dataset('workout_df.csv')
+    _state = ServingState(load_datasets())
 except Exception as e:
     print(f"Error loading datasets: {e}")
     # Create empty dataframes as fallback
-    description = pd.DataFrame()
-    precautions = pd.DataFrame()
-    medications = pd.DataFrame()
-    diets = pd.DataFrame()
-    workout = pd.DataFrame()
-
-def helper(dis):
-    """Helper function to get disease information"""
+    _state = ServingState({name: [] for name in DATASET_FILES})
+
+def model_artifact_paths():
+    """Model artifacts whose changes require loading a new predictor"""
+    return MODEL_PATHS + runtime_paths() + [MEDICAL_RULES_PATH] + ([ANSWER_TABLE_PATH] if ANSWER_TABLE_PATH else [])
+
+def watched_paths():
+    """Model artifacts and datasets whose changes trigger a reload"""
+    return model_artifact_paths() + [DATASET_BUNDLE_PATH] + [
+        path for filename in DATASET_FILES.values() for path in dataset_paths(filename)
+    ]
+
+def reload_serving_state(force=False):
+    """Build the new predictor, answer table and datasets off to the side, then swap them in at once
+
+    Without force the loaded models are kept when no model artifact changed.
+    """
+    global _state
+    old_state = _state
+    print("Reloading model artifacts and datasets...")
+    datasets = load_datasets()
+    
+    model_fingerprint = files_fingerprint(model_artifact_paths())
+    if not force and old_state.predictor is not None and model_fingerprint == old_state.model_fingerprint:
+        # Only the datasets changed: keep serving the loaded models
+        predictor, answer_table = old_state.predictor, old_state.answer_table
+        catalog = DiseaseCatalog.build(predictor.label_encoder.classes_, datasets)
+    else:
+        predictor = load_predictor(train_if_missing=False)
+        if predictor is None:
+            print("Reload aborted: no model could be loaded, keeping the current version")
+            return False
+        answer_table = load_answer_table(predictor)
+        catalog = DiseaseCatalog.build(predictor.label_encoder.classes_, datasets)
+        # Warm the new models up before they take traffic
+        for symptoms in warmup_cases(catalog):
+            predictor.predict_labels([_symptom_index.resolve(symptoms)[0]])
+    
+    with _state_lock:
+        _state = ServingState(datasets, predictor, answer_table, model_fingerprint, catalog)
+    if predictor is not old_state.predictor:
+        _prediction_cache.clear()
+    print(f"✅ Reloaded, serving model version {predictor.model_version}")
+    return True
+
+_reload_watcher = None
+
+def start_reload_watcher():
+    """Reload when artifacts or datasets change or on SIGUSR2; call once in each serving process"""
+    global _reload_watcher
+    if _reload_watcher is None:
+        _reload_watcher = ReloadWatcher(watched_paths, reload_serving_state, RELOAD_INTERVAL)
+        if threading.current_thread() is threading.main_thread():
+            _reload_watcher.install_signal_handler()
+        _reload_watcher.start()
+    return _reload_watcher
+
+def helper(disease_id):
+    """Description, precautions, medications, diets and workouts of a disease, from the catalog"""
+    return current_state().catalog.info(disease_id)
+
+def summarize_prediction(disease_id, member_labels, confidences, rule=NO_RULE, differential=None):
+    """Turn per-model labels and top probabilities into
+    (disease ID, confidence, method, {model: (disease ID, confidence)}, rule index, differential)
+
+    Everything stays an integer ID until build_result; differential is a list of
+    (disease ID, probability) pairs or None.
+    """
+    # Confidence is the top probability of the most confident model
+    max_confidence = max(confidences.values(), default=0)
+    individual_predictions = {
+        name: (int(member_labels[name]), max_prob)
+        for name, max_prob in confidences.items() if name in member_labels
+    }
+    
+    # rule names the medical rule that decided the prediction, if any
+    method = 'rule_validation' if rule != NO_RULE else 'ml_prediction'
+    
+    return int(disease_id), max_confidence, method, individual_predictions, int(rule), differential
+
+def error_result(message):
+    """Result tuple reporting a failed prediction (method 'error', message in the disease slot)"""
+    return message, 0.0, "error", {}, NO_RULE, None
+
+def top_probabilities(probabilities):
+    """Reduce each model's probability vector to its top probability"""
+    return {name: max(prob) for name, prob in probabilities.items()}
+
+def lookup_answer(symptom_ids, cascade_threshold=None, top_k=None):
+    """Answer sorted symptom IDs from the precomputed table, or None to run the models"""
+    state = current_state()
+    # The table keeps each model's top label only, so differentials need the live models
+    if state.answer_table is None or cascade_threshold is not None or top_k is not None:
+        return None
+    answer = state.answer_table.lookup_ids(symptom_ids)
+    if answer is None:
+        return None
+    return summarize_prediction(*answer)
+
+def summarize_predictions(predictor, predicted, top_k=None, weights=None):
+    """Summarize predict_labels output, ranking differentials for every row at once"""
+    labels, predictions, probabilities, fired = predicted
+    differentials = (predictor.top_k_labels(probabilities, top_k, weights) if top_k is not None
+                     else [None] * len(labels))
+    return [
+        summarize_prediction(label, members, top_probabilities(member_probabilities), rule, differential)
+        for label, members, member_probabilities, rule, differential
+        in zip(labels, predictions, probabilities, fired, differentials)
+    ]
+
+def prediction_cache_key(symptom_ids, cascade_threshold, top_k, weights):
+    """Cache key covering every option that changes a prediction result"""
+    return (symptom_ids, cascade_threshold, top_k, tuple(sorted(weights.items())) if weights else None)
+
+def cache_version(predictor):
+    """Version of the cached results: a reload that changes the model or the medical rules invalidates them"""
+    return (predictor.model_version, predictor.rules.version)
+
+def get_predicted_value(symptom_ids, cascade_threshold=None, top_k=None, weights=None):
+    """Get predicted disease using the improved enhanced model directly"""
     try:
-        # Clean disease name (remove extra spaces)
-        clean_dis = dis.strip()
-        
-        # Get description
-        desc = description[description['Disease'] == clean_dis]['Description'].values
-        if len(desc) > 0:
-            desc = desc[0]
-        else:
-            desc = "Description not available"
-        
-        # Get precautions
-        prec_cols = [col for col in precautions.columns if col.startswith('Precaution_')]
-        prec = []
-        for col in prec_cols:
-            val = precautions[precautions['Disease'] == clean_dis][col].values
-            if len(val) > 0 and pd.notna(val[0]) and val[0].strip():
-                prec.append(val[0])
-        if not prec:
-            prec = ["Precautions not available"]
-        
-        # Get medications
-        med = medications[medications['Disease'] == clean_dis]['Medication'].values
-        if len(med) > 0:
-            med = med.tolist()
-        else:
-            med = ["Medications not available"]
+        predictor = get_predictor()
+        if predictor is None:
+            return error_result("Error: Model not available")
         
-        # Get diets
-        diet = diets[diets['Disease'] == clean_dis]['Diet'].values
-        if len(diet) > 0:
-            diet = diet.tolist()
-        else:
-            diet = ["Diet information not available"]
+        # Serve repeated symptom combinations from the cache without touching the models
+        symptom_ids = tuple(sorted(set(symptom_ids)))
+        version = cache_version(predictor)
+        cache_key = prediction_cache_key(symptom_ids, cascade_threshold, top_k, weights)
+        cached = _prediction_cache.get(cache_key, version)
+        if cached is not None:
+            return cached
         
-        # Get workouts (note: workout dataset uses lowercase 'disease' column)
-        work = workout[workout['disease'] == clean_dis]['workout'].values
-        if len(work) > 0:
-            work = work.tolist()
-        else:
-            work = ["Workout information not available"]
+        # Small combinations of known symptoms are answered from the precomputed table
+        result = lookup_answer(symptom_ids, cascade_threshold, top_k)
+        if result is not None:
+            _prediction_cache.put(cache_key, result, version)
+            return result
         
-        return desc, prec, med, diet, work
+        # Get prediction
+        predicted = predictor.predict_labels([symptom_ids], cascade_threshold=cascade_threshold)
+        result = summarize_predictions(predictor, predicted, top_k, weights)[0]
+        _prediction_cache.put(cache_key, result, version)
+        return result
     except Exception as e:
-        print(f"Error in helper function: {e}")
-        return "Error occurred", ["Error"], ["Error"], ["Error"], ["Error"]
+        print(f"Error in prediction: {e}")
+        return error_result("Error occurred during prediction")
 
-def get_predicted_value(patient_symptoms):
-    """Get predicted disease using the improved enhanced model directly"""
+def get_predicted_values(id_lists, cascade_threshold=None, top_k=None, weights=None):
+    """Get predicted diseases for a batch of symptom ID lists with one model pass"""
     try:
         predictor = get_predictor()
         if predictor is None:
-            return "Error: Model not available", 0.0, "error", {}
+            return [error_result("Error: Model not available") for _ in id_lists]
         
-        # Get prediction
-        predicted_disease, predictions, probabilities = predictor.predict_disease(patient_symptoms)
-        
-        # Debug: Print what we're getting from the predictor
-        print(f"DEBUG: predicted_disease = {predicted_disease}")
-        print(f"DEBUG: predictions = {predictions}")
-        print(f"DEBUG: probabilities = {probabilities}")
-        
-        # Load disease names mapping from the symptoms dataset
-        try:
-            symptoms_df = load_dataset('symtoms_df.csv')
-            disease_names = symptoms_df['Disease'].unique().tolist()
-            print(f"DEBUG: Available diseases = {disease_names}")
-        except Exception as e:
-            print(f"DEBUG: Error loading disease names: {e}")
-            disease_names = []
-        
-        # Calculate confidence from probabilities
-        max_confidence = 0
-        individual_predictions = {}
-        
-        # Map model names to template keys
-        model_mapping = {
-            'random_forest': 'random_forest',
-            'gradient_boosting': 'gradient_boosting', 
-            'svm': 'svm',
-            'neural_network': 'neural_network'
-        }
-        
-        for name, prob in probabilities.items():
-            max_prob = max(prob)
-            if max_prob > max_confidence:
-                max_confidence = max_prob
-            
-            # Store individual model predictions with standardized names
-            if name in predictions:
-                # Convert model name to lowercase and replace spaces/underscores
-                clean_name = name.lower().replace(' ', '_').replace('-', '_')
-                if clean_name in model_mapping:
-                    # Convert numerical prediction to disease name
-                    prediction_value = predictions[name]
-                    disease_name = predicted_disease  # Default to main prediction
-                    
-                    # If prediction is a number, try to map it to disease name
-                    if isinstance(prediction_value, (int, float)) and disease_names:
-                        try:
-                            prediction_index = int(prediction_value)
-                            if 0 <= prediction_index < len(disease_names):
-                                disease_name = disease_names[prediction_index]
-                        except (ValueError, IndexError):
-                            disease_name = predicted_disease
-                    elif isinstance(prediction_value, str):
-                        disease_name = prediction_value
-                    
-                    individual_predictions[model_mapping[clean_name]] = {
-                        'disease': disease_name,
-                        'confidence': max_prob
-                    }
-        
-        print(f"DEBUG: individual_predictions = {individual_predictions}")
+        # Answer cached combinations directly and run the models once over the rest
+        id_lists = [tuple(sorted(set(symptom_ids))) for symptom_ids in id_lists]
+        version = cache_version(predictor)
+        cache_keys = [prediction_cache_key(symptom_ids, cascade_threshold, top_k, weights) for symptom_ids in id_lists]
+        results = [_prediction_cache.get(key, version) for key in cache_keys]
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = lookup_answer(id_lists[i], cascade_threshold, top_k)
+        missing = [i for i, result in enumerate(results) if result is None]
         
-        # Check if any medical rules were applied
-        rule_applied = check_rules_applied(patient_symptoms, predicted_disease)
-        method = 'rule_validation' if rule_applied else 'ml_prediction'
+        if missing:
+            predicted = predictor.predict_labels([id_lists[i] for i in missing], cascade_threshold=cascade_threshold)
+            summaries = summarize_predictions(predictor, predicted, top_k, weights)
+            for i, result in zip(missing, summaries):
+                results[i] = result
+                _prediction_cache.put(cache_keys[i], result, version)
         
-        return predicted_disease, max_confidence, method, individual_predictions
+        return results
     except Exception as e:
-        print(f"Error in prediction: {e}")
-        return "Error occurred during prediction", 0.0, "error", {}
+        print(f"Error in batch prediction: {e}")
+        return [error_result("Error occurred during prediction") for _ in id_lists]
 
-def check_rules_applied(symptoms, predicted_disease):
-    """Check if any medical rules were applied"""
-    symptoms_lower = [s.lower() for s in symptoms]
-    
-    # Rule 1: Diabetes vs Hyperthyroidism
-    if predicted_disease == 'Diabetes ':
-        if ('irregular_sugar_level' in symptoms_lower or 'polyuria' in symptoms_lower) and 'mood_swings' not in symptoms_lower:
-            return True
-    
-    # Rule 2: Typhoid
-    if predicted_disease == 'Typhoid':
-        if 'chills' in symptoms_lower and 'vomiting' in symptoms_lower and 'high_fever' in symptoms_lower:
-            return True
-    
-    # Rule 3: Fungal infection
-    if predicted_disease == 'Fungal infection':
-        if 'itching' in symptoms_lower and 'skin_rash' in symptoms_lower and 'nodal_skin_eruptions' in symptoms_lower:
-            return True
-    
-    return False
+def warmup_cases(catalog, max_cases=50):
+    """One symptom combination per disease: the symptoms the catalog lists for it"""
+    return [list(catalog.symptoms(i)) for i in range(len(catalog)) if catalog.symptoms(i)][:max_cases]
+
+def warmup(max_cases=50):
+    """Load the predictor and replay one symptom combination per disease through the models and helper"""
+    import time
+    start = time.time()
+    predictor = get_predictor()
+    if predictor is None:
+        return 0
+    cases = warmup_cases(get_catalog(), max_cases)
+    for symptoms in cases:
+        labels, _, _, _ = predictor.predict_labels([_symptom_index.resolve(symptoms)[0]])
+        helper(int(labels[0]))
+    print(f"✅ Warmed up with {len(cases)} cases in {time.time() - start:.1f}s")
+    return len(cases)
 
 @app.route('/')
 def home():
@@ -275,61 +488,291 @@ def home():
         'message': 'Medical Prediction API is running',
         'endpoints': {
             '/predict': 'POST - Predict disease from symptoms',
-            '/check_disease': 'POST - Get disease details'
+            '/predict/batch': 'POST - Predict diseases for a list of symptom lists',
+            '/cache/stats': 'GET - Prediction cache hit/miss/eviction counters',
+            '/check_disease': 'POST - Get disease details',
+            '/check_disease/batch': 'POST - Get the symptoms of many diseases',
+            '/diseases_by_symptoms': 'POST - Rank diseases by symptoms shared with the given ones',
+            '/diseases/similar': 'POST - Diseases with the most similar symptom sets'
         }
     })
 
+def parse_symptoms(symptoms_input):
+    """Normalize a list or comma separated string of symptoms into a clean list"""
+    if isinstance(symptoms_input, list):
+        if not all(isinstance(s, str) for s in symptoms_input):
+            raise ValueError("symptoms must be strings")
+        return [s.strip() for s in symptoms_input if s.strip()]
+    if not isinstance(symptoms_input, str):
+        raise ValueError("symptoms must be a list of strings or a comma separated string")
+    return [s.strip() for s in symptoms_input.split(',') if s.strip()]
+
+def request_data():
+    """Fields of the request: its JSON body, which must be an object, or its form data"""
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            raise ValueError("Request body must be a JSON object")
+        return data
+    return request.form
+
+def string_field(data, name):
+    """A text field of the request data ('' when missing)"""
+    value = data.get(name, '')
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    return value
+
+def parse_cascade_threshold(options):
+    """Return the cascade threshold requested in options, or None for the full ensemble"""
+    mode = options.get('mode') or PREDICTION_MODE
+    if mode == 'ensemble':
+        return None
+    if mode != 'cascade':
+        raise ValueError(f"Unknown prediction mode: {mode}")
+    threshold = options.get('cascade_threshold')
+    if threshold in (None, ''):
+        return CASCADE_THRESHOLD
+    try:
+        threshold = float(threshold)
+    except (TypeError, ValueError):
+        raise ValueError("cascade_threshold must be in (0, 1]")
+    if not 0 < threshold <= 1:
+        raise ValueError("cascade_threshold must be in (0, 1]")
+    return threshold
+
+def parse_top_k(options):
+    """Return the requested number of differential diagnoses, or None when not requested"""
+    top_k = options.get('top_k')
+    if top_k in (None, ''):
+        return None
+    try:
+        top_k = int(top_k)
+    except (TypeError, ValueError):
+        raise ValueError("top_k must be a positive integer")
+    if top_k < 1:
+        raise ValueError("top_k must be a positive integer")
+    return top_k
+
+def parse_weights(options):
+    """Return the requested {model: weight} for averaging member probabilities, or None"""
+    weights = options.get('weights')
+    if not weights:
+        return None
+    if isinstance(weights, str):
+        weights = json.loads(weights)
+    if not isinstance(weights, dict):
+        raise ValueError("weights must map model names to numbers")
+    parsed = {}
+    for name, weight in weights.items():
+        try:
+            parsed[name] = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid weight for {name}: {weight}")
+        if not parsed[name] >= 0:
+            raise ValueError(f"Weight for {name} must be non-negative")
+    return parsed
+
+def extract_symptoms(text):
+    """(symptom IDs, mentions) found in free text by one pass of the extractor"""
+    if not isinstance(text, str):
+        raise ValueError("text must be a string")
+    if len(text) > MAX_TEXT_LENGTH:
+        raise ValueError(f"text too long: at most {MAX_TEXT_LENGTH} characters")
+    mentions = _symptom_extractor.find(text)
+    symptom_ids = list(dict.fromkeys(mention['id'] for mention in mentions))
+    return symptom_ids, mentions
+
+def spelling_suggestions(unrecognized):
+    """{input: up to five symptom names it may have meant} for unrecognized symptoms"""
+    return {text: [s['symptom'] for s in _symptom_index.suggest(text, 5)] for text in unrecognized}
+
+def unrecognized_error(unrecognized):
+    """400 payload for symptoms that match nothing, with spelling suggestions for each"""
+    return {
+        'error': 'None of the symptoms were recognized',
+        'unrecognized_symptoms': unrecognized,
+        'suggestions': spelling_suggestions(unrecognized),
+    }
+
+def build_result(symptoms_list, disease_id, confidence, method, individual_predictions, rule=NO_RULE,
+                 differential=None):
+    """Build the per-request JSON members for one prediction, turning its disease and rule IDs back into names
+
+    The disease's name and information are not included; render_result splices
+    them in from the catalog's pre-rendered JSON.
+    """
+    state = current_state()
+    catalog = state.catalog
+    rule_id = state.predictor.rules.rule_id(rule)
+    
+    result = {
+        'confidence': confidence,
+        'method': method,
+        'rule_id': rule_id,
+        'symptoms': symptoms_list,
+        'individual_predictions': {
+            name: {'disease': catalog.disease_name(label), 'confidence': member_confidence}
+            for name, (label, member_confidence) in individual_predictions.items()
+        },
+        'models_run': list(individual_predictions)
+    }
+    if differential is not None:
+        # Top candidates by the members' averaged probabilities, most likely first
+        result['differential_diagnosis'] = [
+            {'disease': catalog.disease_name(label), 'probability': probability} for label, probability in differential
+        ]
+    return result
+
+def render_result(result, disease_id):
+    """JSON bytes of a build_result payload with the disease's cached name and information spliced in"""
+    return splice(current_state().catalog.info_json(disease_id), result)
+
+def json_response(body, status=200):
+    """Response for JSON bytes that are already rendered"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
         # Support both JSON and form data
-        if request.is_json:
-            data = request.get_json()
-            symptoms_input = data.get('symptoms', [])
-            if isinstance(symptoms_input, list):
-                symptoms_list = [s.strip() for s in symptoms_input if s and s.strip()]
-            else:
-                symptoms_list = [s.strip() for s in str(symptoms_input).split(',') if s.strip()]
-        else:
-            user_symptoms = request.form.get('symptoms', '')
-            symptoms_list = [symptom.strip() for symptom in user_symptoms.split(',') if symptom.strip()]
+        try:
+            data = request_data()
+            symptoms_list = parse_symptoms(data.get('symptoms', []))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        text = data.get('text')
         
-        if not symptoms_list:
+        if not symptoms_list and not text:
             return jsonify({'error': 'Please enter at least one symptom'}), 400
         
-        # Get prediction using improved system
-        predicted_disease, confidence, method, individual_predictions = get_predicted_value(symptoms_list)
+        try:
+            cascade_threshold = parse_cascade_threshold(data)
+            top_k = parse_top_k(data)
+            weights = parse_weights(data)
+            mentions = None
+            if text and not symptoms_list:
+                # Free-text mode: every symptom name or synonym mentioned in the sentence
+                symptom_ids, mentions = extract_symptoms(text)
+                if not symptom_ids:
+                    return jsonify({'error': 'No symptoms found in text', 'text': text}), 400
+                symptoms_list = [_symptom_index.vocabulary[i] for i in symptom_ids]
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if method == 'error':
-            return jsonify({'error': f'Prediction error: {predicted_disease}'}), 500
+        # Map names and synonyms onto symptom IDs; misspellings only get suggestions
+        symptom_ids, unrecognized = _symptom_index.resolve(symptoms_list)
+        if not symptom_ids:
+            return jsonify(unrecognized_error(unrecognized)), 400
         
-        # Get disease information
-        description, precautions, medications, diets, workouts = helper(predicted_disease)
+        # Get prediction using improved system
+        disease_id, confidence, method, individual_predictions, rule, differential = get_predicted_value(
+            symptom_ids, cascade_threshold=cascade_threshold, top_k=top_k, weights=weights
+        )
         
-        # Prepare result data
-        result_data = {
-            'predicted_disease': predicted_disease,
-            'disease': predicted_disease,  # Support both keys
-            'confidence': confidence,
-            'method': method,
-            'symptoms': symptoms_list,
-            'description': description,
-            'precautions': precautions,
-            'medications': medications,
-            'diet': diets,
-            'workout': workouts,
-            'diets': diets,  # Support both keys
-            'workouts': workouts,  # Support both keys
-            'individual_predictions': individual_predictions
-        }
+        if method == 'error':
+            return jsonify({'error': f'Prediction error: {disease_id}'}), 500
         
         # Return JSON response (API-only backend)
-        return jsonify(result_data)
+        result = build_result(symptoms_list, disease_id, confidence, method, individual_predictions,
+                              rule, differential)
+        result['normalized_symptoms'] = [_symptom_index.vocabulary[i] for i in symptom_ids]
+        result['unrecognized_symptoms'] = unrecognized
+        result['suggestions'] = spelling_suggestions(unrecognized)
+        if mentions is not None:
+            result['extracted_symptoms'] = mentions
+        return json_response(render_result(result, disease_id))
         
     except Exception as e:
         print(f"Error in predict route: {e}")
         return jsonify({'error': 'An error occurred during prediction', 'details': str(e)}), 500
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        try:
+            data = request_data()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        cases = data.get('cases', data.get('symptoms', []))
+        
+        if not isinstance(cases, list) or not cases:
+            return jsonify({'error': 'Please provide a non-empty list of symptom lists in "cases"'}), 400
+        if len(cases) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch too large: at most {MAX_BATCH_SIZE} cases per request'}), 413
+        
+        try:
+            cascade_threshold = parse_cascade_threshold(data)
+            top_k = parse_top_k(data)
+            weights = parse_weights(data)
+            symptom_lists = [parse_symptoms(case) for case in cases]
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        resolved = [_symptom_index.resolve(symptoms) for symptoms in symptom_lists]
+        valid = [i for i, (symptom_ids, _) in enumerate(resolved) if symptom_ids]
+        
+        # One vectorized pass over every case with a recognized symptom
+        predictions = get_predicted_values([resolved[i][0] for i in valid], cascade_threshold=cascade_threshold,
+                                           top_k=top_k, weights=weights)
+        
+        results = [
+            unrecognized_error(unrecognized) if symptoms else {'error': 'Please enter at least one symptom'}
+            for symptoms, (_, unrecognized) in zip(symptom_lists, resolved)
+        ]
+        for i, (disease_id, confidence, method, individual_predictions, rule, differential) in zip(valid, predictions):
+            if method == 'error':
+                results[i] = {'error': f'Prediction error: {disease_id}'}
+            else:
+                result = build_result(symptom_lists[i], disease_id, confidence, method,
+                                      individual_predictions, rule, differential)
+                symptom_ids, result['unrecognized_symptoms'] = resolved[i]
+                result['normalized_symptoms'] = [_symptom_index.vocabulary[j] for j in symptom_ids]
+                result['suggestions'] = spelling_suggestions(result['unrecognized_symptoms'])
+                results[i] = render_result(result, disease_id)
+        
+        # Error entries are still dicts; predictions are already rendered
+        rendered = b','.join(result if isinstance(result, bytes) else dumps(result) for result in results)
+        return json_response(splice(b'"results":[' + rendered + b']', {'count': len(results)}))
+        
+    except Exception as e:
+        print(f"Error in predict batch route: {e}")
+        return jsonify({'error': 'An error occurred during batch prediction', 'details': str(e)}), 500
+
+def disease_symptoms_result(catalog, disease_name):
+    """/check_disease payload for a disease name, or None if the catalog lists no symptoms for it"""
+    disease_id = catalog.disease_id(disease_name)
+    all_symptoms = catalog.symptoms(disease_id) if disease_id is not None else ()
+    if not all_symptoms:
+        return None
+    return {
+        'disease_name': catalog.disease_name(disease_id),
+        'all_symptoms': list(all_symptoms),
+        'symptom_count': len(all_symptoms)
+    }
+
+def parse_limit(options, default=10, maximum=50):
+    """Number of ranked results requested in options, clamped to [1, maximum]"""
+    try:
+        return min(max(int(options.get('limit', default)), 1), maximum)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+
+def ranked_diseases(catalog, ranking, symptom_ids):
+    """JSON entries for (disease ID, matched, jaccard) rankings, with the shared symptom names"""
+    sets = catalog.symptom_sets
+    entries = []
+    for disease_id, matched, jaccard in ranking:
+        symptoms = catalog.symptoms(disease_id)
+        entries.append({
+            'disease': catalog.disease_name(disease_id),
+            'matched_symptoms': [name for name in symptoms if sets.symptom_ids[name] in symptom_ids],
+            'matched_count': matched,
+            'symptom_count': len(symptoms),
+            'jaccard': round(jaccard, 4),
+        })
+    return entries
+
 @app.route('/check_disease', methods=['POST', 'OPTIONS'])
 def check_disease():
     # Handle CORS preflight
@@ -337,38 +780,23 @@ def check_disease():
         return '', 200
     try:
         # Support both JSON and form data
-        if request.is_json:
-            data = request.get_json()
-            disease_name = data.get('disease_name', '')
-        else:
-            disease_name = request.form.get('disease_name', '')
+        try:
+            disease_name = string_field(request_data(), 'disease_name')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         if not disease_name:
             return jsonify({'error': 'No disease name provided'}), 400
         
-        # Get all symptoms for the given disease from the symptoms dataset
+        # Get all symptoms listed for the given disease
         try:
-            symptoms_df = load_dataset('symtoms_df.csv')
-            disease_symptoms = symptoms_df[symptoms_df['Disease'] == disease_name]
+            # Name lookups go through the catalog, so spacing and case differences don't matter
+            result = disease_symptoms_result(get_catalog(), disease_name)
             
-            if disease_symptoms.empty:
+            if result is None:
                 return jsonify({'error': 'Disease not found'}), 404
             
-            # Extract all unique symptoms for this disease
-            all_symptoms = set()
-            for _, row in disease_symptoms.iterrows():
-                # Check all symptom columns (Symptom_1, Symptom_2, Symptom_3, Symptom_4, etc.)
-                symptom_cols = [col for col in row.index if col.startswith('Symptom_')]
-                for col in symptom_cols:
-                    symptom = row[col]
-                    if pd.notna(symptom) and str(symptom).strip():
-                        all_symptoms.add(str(symptom).strip())
-            
-            return jsonify({
-                'disease_name': disease_name,
-                'all_symptoms': list(all_symptoms),
-                'symptom_count': len(all_symptoms)
-            })
+            return jsonify(result)
         except Exception as e:
             print(f"Error in check_disease route: {e}")
             return jsonify({'error': f'An error occurred: {str(e)}'}), 500
@@ -377,6 +805,123 @@ def check_disease():
         print(f"Error in check_disease route: {e}")
         return jsonify({'error': 'An error occurred during prediction'}), 500
 
+@app.route('/check_disease/batch', methods=['POST'])
+def check_disease_batch():
+    """Symptoms of many diseases in one call ({"disease_names": [...]}), one result per name"""
+    try:
+        names = request_data().get('disease_names', [])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not isinstance(names, list) or not names:
+        return jsonify({'error': 'Please provide a non-empty list of disease names in "disease_names"'}), 400
+    if not all(isinstance(name, str) for name in names):
+        return jsonify({'error': 'disease_names must be strings'}), 400
+    if len(names) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Batch too large: at most {MAX_BATCH_SIZE} diseases per request'}), 413
+    catalog = get_catalog()
+    results = []
+    for name in names:
+        result = disease_symptoms_result(catalog, name) if name else None
+        results.append(result or {'disease_name': name, 'error': 'Disease not found'})
+    return jsonify({'results': results, 'count': len(results)})
+
+@app.route('/diseases_by_symptoms', methods=['POST'])
+def diseases_by_symptoms():
+    """Diseases whose listed symptoms overlap the given ones most, without running the models"""
+    try:
+        data = request_data()
+        symptoms_list = parse_symptoms(data.get('symptoms', []))
+        limit = parse_limit(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not symptoms_list:
+        return jsonify({'error': 'Please enter at least one symptom'}), 400
+    symptom_ids, unrecognized = _symptom_index.resolve(symptoms_list)
+    if not symptom_ids:
+        return jsonify(unrecognized_error(unrecognized)), 400
+    catalog = get_catalog()
+    ranking = catalog.symptom_sets.rank_by_symptoms(symptom_ids, limit)
+    return jsonify({
+        'diseases': ranked_diseases(catalog, ranking, set(symptom_ids)),
+        'normalized_symptoms': [_symptom_index.vocabulary[i] for i in symptom_ids],
+        'unrecognized_symptoms': unrecognized,
+        'suggestions': spelling_suggestions(unrecognized),
+    })
+
+@app.route('/diseases/similar', methods=['POST'])
+def similar_diseases():
+    """Diseases with the most similar symptom sets (Jaccard) to {"disease_name": ...}"""
+    try:
+        data = request_data()
+        disease_name = string_field(data, 'disease_name')
+        limit = parse_limit(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not disease_name:
+        return jsonify({'error': 'No disease name provided'}), 400
+    catalog = get_catalog()
+    disease_id = catalog.disease_id(disease_name)
+    if disease_id is None or not catalog.symptoms(disease_id):
+        return jsonify({'error': 'Disease not found'}), 404
+    sets = catalog.symptom_sets
+    symptom_ids = {sets.symptom_ids[name] for name in catalog.symptoms(disease_id)}
+    return jsonify({
+        'disease_name': catalog.disease_name(disease_id),
+        'similar_diseases': ranked_diseases(catalog, sets.similar_diseases(disease_id, limit), symptom_ids),
+    })
+
+@app.route('/symptoms/suggest')
+def suggest_symptoms():
+    """Autocomplete: symptoms completing the q prefix, or the closest spellings when none does"""
+    query = request.args.get('q', '')
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    return jsonify({'query': query, 'suggestions': _symptom_index.suggest(query, limit)})
+
+@app.route('/symptoms/normalize', methods=['POST'])
+def normalize_symptoms():
+    """Resolve free-text symptoms to canonical names and IDs without running a prediction
+
+    Like /predict, only exact names and synonyms resolve. A misspelling within a few edits
+    is reported as a 'fuzzy' candidate next to the suggestions, but is left unresolved.
+    """
+    try:
+        symptoms_list = parse_symptoms(request_data().get('symptoms', []))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    resolved = []
+    for text in symptoms_list:
+        match = _symptom_index.lookup(text)
+        if match is not None and match[1] == 'exact':
+            symptom_id, kind, score = match
+            resolved.append({'input': text, 'symptom': _symptom_index.vocabulary[symptom_id], 'id': symptom_id,
+                             'match': kind, 'score': round(score, 3)})
+            continue
+        entry = {'input': text, 'symptom': None, 'suggestions': spelling_suggestions([text])[text]}
+        if match is not None:
+            symptom_id, kind, score = match
+            entry['closest'] = {'symptom': _symptom_index.vocabulary[symptom_id], 'id': symptom_id,
+                                'match': kind, 'score': round(score, 3)}
+        resolved.append(entry)
+    normalized, unrecognized = _symptom_index.normalize(symptoms_list)
+    return jsonify({'symptoms': resolved, 'normalized': normalized, 'unrecognized': unrecognized})
+
+@app.route('/symptoms/extract', methods=['POST'])
+def extract_symptoms_route():
+    """Symptom mentions found in free text, with character spans, without running a prediction"""
+    try:
+        text = request_data().get('text', '')
+        symptom_ids, mentions = extract_symptoms(text)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'text': text, 'symptoms': [_symptom_index.vocabulary[i] for i in symptom_ids], 'mentions': mentions})
+
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(_prediction_cache.stats())
+
 @app.route('/about')
 def about():
     return jsonify({'message': 'About page - API only backend'})
@@ -409,4 +954,5 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '0.0.0.0')
     debug = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
+    start_reload_watcher()
     app.run(host=host, port=port, debug=debug)
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Precomputed answer table for small symptom combinations
+=======================================================
+
+Runs the full ensemble plus the medical rules (predict_labels) over every
+combination of up to --max-size known symptoms and stores the answers in a
+compact sorted table:
+
+    packed symptom IDs (uint64) -> disease ID, confidence, per-model label/confidence, rule fired
+
+Symptom IDs are positions in SYMPTOM_VOCABULARY; a combination is packed as
+sum((id + 1) << 8 * i) over its ascending IDs, so up to 8 symptoms fit in one key.
+Lookups are a single binary search over the sorted keys. Like the NumPy
+runtime, a directory output is memory-mapped and shared between workers.
+
+Usage (from backend-api/):
+    python models/answer_table.py --max-size 3 --output models/answer_table
+"""
+import itertools
+import json
+import time
+
+import numpy as np
+
+from feature_encoder import SYMPTOM_VOCABULARY
+from numpy_runtime import load_arrays, save_arrays
+
+ANSWER_TABLE_FORMAT_VERSION = 2
+MAX_PACKED_SYMPTOMS = 8
+
+
+def pack_symptom_ids(ids):
+    """Pack ascending symptom IDs into one integer key"""
+    key = 0
+    for i, symptom_id in enumerate(sorted(ids)):
+        key |= (symptom_id + 1) << (8 * i)
+    return key
+
+
+class AnswerTable:
+    """Sorted packed-key table answering small symptom combinations with one lookup"""
+
+    def __init__(self, arrays, meta):
+        self.keys = arrays['keys']
+        self.disease = arrays['disease']
+        self.confidence = arrays['confidence']
+        self.member_labels = arrays['member_labels']
+        self.member_confidence = arrays['member_confidence']
+        self.rule = arrays['rule']
+        self.classes = arrays['classes']
+        self.members = meta['members']
+        self.max_size = meta['max_size']
+        self.model_version = meta['model_version']
+        self.rules_version = meta['rules_version']
+        self.rule_ids = meta['rule_ids']
+        self.symptoms = meta['symptoms']
+
+    @classmethod
+    def load(cls, path):
+        arrays = load_arrays(path)
+        meta = json.loads(str(arrays.pop('meta')))
+        if meta.get('format_version') != ANSWER_TABLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported answer table format version: {meta.get('format_version')}")
+        return cls(arrays, meta)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup_ids(self, symptom_ids):
+        """Return (label, predictions, confidences, rule index) for unique symptom IDs, or None
+
+        IDs are positions in the table's symptoms list; the rule index is -1 when no rule fired.
+        """
+        if not symptom_ids or len(symptom_ids) > self.max_size:
+            return None
+        key = np.uint64(pack_symptom_ids(symptom_ids))
+        i = int(np.searchsorted(self.keys, key))
+        if i >= len(self.keys) or self.keys[i] != key:
+            return None
+
+        predictions = {name: int(self.member_labels[i, j]) for j, name in enumerate(self.members)}
+        confidences = {name: float(self.member_confidence[i, j]) for j, name in enumerate(self.members)}
+        return int(self.disease[i]), predictions, confidences, int(self.rule[i])
+
+
+def build_answer_table(predictor, max_size, path, batch_size=8192):
+    """Enumerate all combinations of up to max_size symptoms through the predictor and save the table"""
+    if not 1 <= max_size <= MAX_PACKED_SYMPTOMS:
+        raise ValueError(f"max_size must be between 1 and {MAX_PACKED_SYMPTOMS}")
+
+    members = list(predictor.models)
+    rules = predictor.rules if predictor.rules is not None else predictor.load_rules()
+    keys, disease, confidence, member_labels, member_confidence, rule = [], [], [], [], [], []
+
+    combinations = itertools.chain.from_iterable(
+        itertools.combinations(range(len(SYMPTOM_VOCABULARY)), size) for size in range(1, max_size + 1)
+    )
+    start = time.time()
+    done = 0
+    while True:
+        chunk = list(itertools.islice(combinations, batch_size))
+        if not chunk:
+            break
+        labels, predictions, probabilities, fired = predictor.predict_labels(chunk)
+
+        keys.extend(pack_symptom_ids(ids) for ids in chunk)
+        disease.append(labels)
+        member_labels.append(np.array([[row[name] for name in members] for row in predictions]))
+        confs = np.array([[max(row[name]) for name in members] for row in probabilities])
+        member_confidence.append(confs)
+        confidence.append(confs.max(axis=1))
+        rule.append(fired)
+
+        done += len(chunk)
+        print(f"   {done} combinations ({time.time() - start:.0f}s)")
+
+    keys = np.array(keys, dtype=np.uint64)
+    order = np.argsort(keys)
+    arrays = {
+        'keys': keys[order],
+        'disease': np.concatenate(disease)[order].astype(np.uint16),
+        'confidence': np.concatenate(confidence)[order].astype(np.float64),
+        'member_labels': np.concatenate(member_labels)[order].astype(np.uint16),
+        'member_confidence': np.concatenate(member_confidence)[order].astype(np.float64),
+        'rule': np.concatenate(rule)[order].astype(np.int16),
+        'classes': np.asarray(predictor.label_encoder.classes_),
+    }
+    meta = {
+        'format_version': ANSWER_TABLE_FORMAT_VERSION,
+        'max_size': max_size,
+        'model_version': predictor.model_version,
+        'rules_version': rules.version,
+        'rule_ids': rules.ids,
+        'members': members,
+        'symptoms': SYMPTOM_VOCABULARY,
+    }
+    arrays['meta'] = np.array(json.dumps(meta))
+    save_arrays(path, arrays)
+    return len(keys)
+
+
+def main():
+    import argparse
+
+    from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
+
+    parser = argparse.ArgumentParser(description='Precompute answers for all small symptom combinations')
+    parser.add_argument('--max-size', type=int, default=3, help='largest symptom combination to enumerate')
+    parser.add_argument('--model', default='models/improved_enhanced_models.pkl')
+    parser.add_argument('--runtime', help='enumerate with an exported NumPy runtime instead of the pickle')
+    parser.add_argument('--output', default='models/answer_table',
+                        help='directory of memory-mappable .npy files, or a single .npz archive')
+    args = parser.parse_args()
+
+    predictor = ImprovedEnhancedMedicalPredictor()
+    # sklearn's compiled tree evaluation is the faster choice for large batches
+    if args.runtime:
+        predictor.load_numpy_runtime(args.runtime)
+    else:
+        predictor.load_models(args.model)
+
+    print(f"Building answer table for up to {args.max_size} symptoms...")
+    count = build_answer_table(predictor, args.max_size, args.output)
+    print(f"✅ {count} answers saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
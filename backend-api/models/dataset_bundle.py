@@ -0,0 +1,269 @@
+"""
+Compact binary bundle of the serving datasets
+=============================================
+
+Every entry point used to parse the same CSVs on each cold start. This module
+converts them once into a single columnar file and loads it back with the
+standard library alone, so the stdlib-only api/ functions can use it too.
+
+File layout (all integers little-endian):
+
+    b'MDSBNDL1'                      magic
+    uint32, uint32                   header and string table lengths in bytes
+    header                           JSON: format version, string count, and per
+                                     table its SHA-256, row count and columns
+    string table                     every distinct cell, UTF-8, NUL separated
+    columns                          per table and column, one uint32 code per
+                                     row: 0 for a missing cell, i + 1 for string i
+
+Cells are interned in one string table, so the many repeated symptom and
+disease names are stored and decoded once. Each table records the SHA-256,
+size and modification time of the CSV it came from; open_bundle treats the
+bundle as stale when a source CSV that is present no longer matches, and
+callers then read the CSVs as before. A CSV is only hashed when its size or
+modification time differs from the recorded ones (after a copy, or an edit).
+
+Usage (from backend-api/):
+    python models/dataset_bundle.py --datasets datasets --output datasets/datasets.bundle
+"""
+import csv
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'MDSBNDL1'
+BUNDLE_FORMAT_VERSION = 1
+DEFAULT_BUNDLE_NAME = 'datasets.bundle'
+
+# The CSVs the services read while serving; training data stays CSV
+SERVING_DATASETS = (
+    'symtoms_df.csv',
+    'description.csv',
+    'precautions_df.csv',
+    'medications.csv',
+    'diets.csv',
+    'workout_df.csv',
+)
+
+
+def read_table(path):
+    """Rows of a CSV file as dicts of column name -> string"""
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def file_checksum(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _codes(values):
+    codes = array('I', values)
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    return codes
+
+
+def write_bundle(path, sources):
+    """Convert CSV files ({table name: CSV path}) into one bundle at path; returns the header"""
+    strings, string_codes = [], {}
+    tables, blobs = {}, []
+    for name, source in sources.items():
+        with open(source, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            columns = next(reader, [])
+            cells = [[] for _ in columns]
+            rows = 0
+            for row in reader:
+                # Blank lines are not rows, as for csv.DictReader
+                if not row:
+                    continue
+                if len(row) > len(columns):
+                    raise ValueError(f"{source}: row {rows + 2} has more cells than the header")
+                for i, column_cells in enumerate(cells):
+                    value = row[i] if i < len(row) else None
+                    if value is None:
+                        column_cells.append(0)
+                        continue
+                    if '\0' in value:
+                        raise ValueError(f"{source}: row {rows + 2} contains a NUL character")
+                    code = string_codes.get(value)
+                    if code is None:
+                        code = string_codes[value] = len(strings) + 1
+                        strings.append(value)
+                    column_cells.append(code)
+                rows += 1
+        stat = os.stat(source)
+        tables[name] = {'sha256': file_checksum(source), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                        'rows': rows, 'columns': columns}
+        blobs.extend(_codes(column_cells).tobytes() for column_cells in cells)
+
+    header = {'format_version': BUNDLE_FORMAT_VERSION, 'strings': len(strings), 'tables': tables}
+    header_bytes = json.dumps(header).encode('utf-8')
+    string_bytes = '\0'.join(strings).encode('utf-8')
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<II', len(header_bytes), len(string_bytes)))
+        f.write(header_bytes)
+        f.write(string_bytes)
+        for blob in blobs:
+            f.write(blob)
+    # Readers never see a half-written bundle
+    os.replace(tmp_path, path)
+    return header
+
+
+class DatasetBundle:
+    """Tables of a loaded bundle, decoded to rows or columns on request"""
+
+    def __init__(self, header, strings, codes):
+        self.header = header
+        self.tables = header['tables']
+        self._strings = strings
+        self._codes = codes
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a dataset bundle")
+        header_length, strings_length = struct.unpack_from('<II', data, len(MAGIC))
+        offset = len(MAGIC) + 8
+        header = json.loads(data[offset:offset + header_length])
+        if header.get('format_version') != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset bundle format version: {header.get('format_version')}")
+        offset += header_length
+        strings = [None]
+        if header['strings']:
+            strings.extend(data[offset:offset + strings_length].decode('utf-8').split('\0'))
+        offset += strings_length
+
+        codes = {}
+        for name, table in header['tables'].items():
+            columns = []
+            for _ in table['columns']:
+                column = array('I')
+                column.frombytes(data[offset:offset + 4 * table['rows']])
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                columns.append(column)
+                offset += 4 * table['rows']
+            codes[name] = columns
+        return cls(header, strings, codes)
+
+    def __contains__(self, name):
+        return name in self.tables
+
+    def checksum(self, name):
+        return self.tables[name]['sha256']
+
+    def rows(self, name):
+        """Rows of a table as dicts of column name -> string, exactly as read_table returns them"""
+        strings = self._strings
+        columns = self.tables[name]['columns']
+        decoded = [[strings[code] for code in column] for column in self._codes[name]]
+        return [dict(zip(columns, values)) for values in zip(*decoded)]
+
+    def columns(self, name):
+        """Table as {column name: values}, with None for empty and missing cells"""
+        strings = self._strings
+        return {
+            column: [strings[code] or None for code in codes]
+            for column, codes in zip(self.tables[name]['columns'], self._codes[name])
+        }
+
+    def dataframe(self, name):
+        """Table as a pandas DataFrame with the column names and dtypes pd.read_csv gives its CSV
+
+        Blank header cells become 'Unnamed: <position>', empty cells NaN, and columns whose
+        cells all parse as numbers int64 or float64. pandas is only imported here.
+        """
+        import pandas as pd
+        strings = self._strings
+        rows = self.tables[name]['rows']
+        # Without rows read_csv leaves every column object
+        frame = pd.DataFrame({
+            column or f'Unnamed: {i}': [strings[code] or None for code in codes]
+            for i, (column, codes) in enumerate(zip(self.tables[name]['columns'], self._codes[name]))
+        }, dtype=None if rows else object)
+        for column in frame.columns if rows else ():
+            try:
+                frame[column] = pd.to_numeric(frame[column])
+            except (TypeError, ValueError):
+                pass
+        return frame
+
+    def source_changed(self, name, path):
+        """Whether the CSV at path differs from the one table name was converted from"""
+        table = self.tables[name]
+        stat = os.stat(path)
+        if stat.st_size == table.get('size') and stat.st_mtime_ns == table.get('mtime_ns'):
+            return False
+        return file_checksum(path) != table['sha256']
+
+    def stale_tables(self, sources):
+        """Tables whose source CSV ({table name: path}) exists but no longer matches its checksum"""
+        return [
+            name for name, path in sources.items()
+            if name in self.tables and path and os.path.exists(path) and self.source_changed(name, path)
+        ]
+
+
+def open_bundle(path, sources=None):
+    """The bundle at path, or None when it is missing, unreadable or stale against its CSVs
+
+    sources maps table names to the CSVs they are converted from; by default the
+    CSVs next to the bundle. CSVs that are not present are not checked, so a
+    bundle can be deployed without them.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        bundle = DatasetBundle.load(path)
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not load dataset bundle {path}: {e}")
+        return None
+    if sources is None:
+        sources = {name: os.path.join(os.path.dirname(path), name) for name in bundle.tables}
+    stale = bundle.stale_tables(sources)
+    if stale:
+        print(f"Warning: dataset bundle {path} is stale ({', '.join(stale)} changed), reading the CSVs; "
+              f"rebuild it with models/dataset_bundle.py")
+        return None
+    return bundle
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Convert the serving CSV datasets into one binary bundle')
+    parser.add_argument('--datasets', default='datasets', help='directory holding the CSVs')
+    parser.add_argument('--files', nargs='+', default=list(SERVING_DATASETS), help='CSV files to include')
+    parser.add_argument('--output', help=f'bundle path (default: <datasets>/{DEFAULT_BUNDLE_NAME})')
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(args.datasets, DEFAULT_BUNDLE_NAME)
+    sources = {name: os.path.join(args.datasets, name) for name in args.files}
+    header = write_bundle(output, sources)
+    source_bytes = sum(os.path.getsize(path) for path in sources.values())
+    print(f"✅ {len(header['tables'])} tables, {header['strings']} distinct strings: "
+          f"{source_bytes / 1024:.0f} KB of CSV -> {os.path.getsize(output) / 1024:.0f} KB at {output}")
+
+    start = time.perf_counter()
+    bundle = open_bundle(output, sources)
+    tables = {name: bundle.rows(name) for name in bundle.tables}
+    print(f"   loaded and decoded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    mismatched = [name for name, path in sources.items() if tables[name] != read_table(path)]
+    if mismatched:
+        raise SystemExit(f"❌ Bundle rows differ from the CSVs: {mismatched}")
+    print("   rows match the CSVs")
+
+
+if __name__ == '__main__':
+    main()
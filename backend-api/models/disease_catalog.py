@@ -0,0 +1,152 @@
+"""
+Immutable disease catalog built once per dataset version
+========================================================
+
+Everything the request handlers need to know about diseases, read from the
+CSV datasets at startup (and again on a hot reload) instead of per request:
+
+- name <-> ID mapping (a Registry, so IDs match the model's encoded labels)
+- disease ID -> the symptoms listed for it in symtoms_df.csv
+- disease ID -> a DiseaseInfo record with the description, precautions,
+  medications, diets and workouts, fallbacks already filled in
+
+- symptom <-> disease bitsets for overlap ranking (a SymptomSetIndex)
+- disease ID -> the name and DiseaseInfo pre-rendered as JSON object members,
+  which /predict splices into its response (see json_fragments.py)
+
+The catalog only holds tuples, strings and bytes and is never modified after
+it is built; a reload builds a new one and swaps it in with the rest of the
+serving state. The rows come from the csv module or the dataset bundle
+(dataset_bundle.py), so no DataFrame is involved.
+"""
+from collections import namedtuple
+
+from json_fragments import members
+from registry import Registry
+from symptom_sets import SymptomSetIndex
+
+# Columns naming the disease (the workout dataset uses lowercase)
+DISEASE_COLUMNS = ('Disease', 'disease')
+
+# Everything helper returns for one disease; unpacks like the tuple helper always returned
+DiseaseInfo = namedtuple('DiseaseInfo', ['description', 'precautions', 'medications', 'diets', 'workouts'])
+
+# Fallbacks for a disease missing from a dataset, as helper always returned them
+MISSING_INFO = DiseaseInfo(
+    "Description not available",
+    ("Precautions not available",),
+    ("Medications not available",),
+    ("Diet information not available",),
+    ("Workout information not available",),
+)
+
+
+def disease_of(row):
+    """Disease name of a dataset row, or None"""
+    for column in DISEASE_COLUMNS:
+        if row.get(column):
+            return row[column]
+    return None
+
+
+def info_members(name, info):
+    """Response members for a disease's name and DiseaseInfo, in /predict's key order"""
+    return {
+        'predicted_disease': name,
+        'disease': name,  # Support both keys
+        'description': info.description,
+        'precautions': info.precautions,
+        'medications': info.medications,
+        'diet': info.diets,
+        'workout': info.workouts,
+        'diets': info.diets,  # Support both keys
+        'workouts': info.workouts,  # Support both keys
+    }
+
+
+class DiseaseCatalog:
+    """Disease names, IDs, symptoms and information, looked up by disease ID"""
+
+    def __init__(self, registry, symptoms, info):
+        self.registry = registry
+        self._symptoms = tuple(symptoms)
+        self.symptom_sets = SymptomSetIndex(self._symptoms, registry.symptoms)
+        self._info = tuple(info)
+        self._info_json = tuple(
+            members(info_members(registry.disease_name(disease_id), record))
+            for disease_id, record in enumerate(self._info)
+        )
+
+    @classmethod
+    def build(cls, classes, tables):
+        """Catalog for a model's classes (in label order) from dataset rows keyed by table name
+
+        tables holds the rows of 'symptoms' (symtoms_df.csv), 'description', 'precautions',
+        'medications', 'diets' and 'workout'; any table may be missing or empty.
+        """
+        names = [disease_of(row) for rows in tables.values() for row in rows]
+        registry = Registry(classes, [name for name in names if name])
+        n = len(registry.diseases)
+
+        def rows_by_disease(table):
+            grouped = [[] for _ in range(n)]
+            for row in tables.get(table, ()):
+                name = disease_of(row)
+                disease_id = registry.disease_id(name) if name else None
+                if disease_id is not None:
+                    grouped[disease_id].append(row)
+            return grouped
+
+        def values(rows, column, missing):
+            found = tuple(row[column] for row in rows if row.get(column) is not None)
+            return found or missing
+
+        symptoms = []
+        for rows in rows_by_disease('symptoms'):
+            listed = {}
+            for row in rows:
+                for column, value in row.items():
+                    if column and column.startswith('Symptom_') and value and value.strip():
+                        listed.setdefault(value.strip())
+            symptoms.append(tuple(listed))
+
+        info = []
+        grouped = {table: rows_by_disease(table) for table in ('description', 'precautions', 'medications',
+                                                                 'diets', 'workout')}
+        for disease_id in range(n):
+            description = grouped['description'][disease_id]
+            precautions = grouped['precautions'][disease_id]
+            # Only the first precautions row counts, skipping blank cells
+            first = precautions[0] if precautions else {}
+            listed = tuple(value for column, value in first.items()
+                           if column and column.startswith('Precaution_') and value and value.strip())
+            info.append(DiseaseInfo(
+                description[0]['Description'] if description else MISSING_INFO.description,
+                listed or MISSING_INFO.precautions,
+                values(grouped['medications'][disease_id], 'Medication', MISSING_INFO.medications),
+                values(grouped['diets'][disease_id], 'Diet', MISSING_INFO.diets),
+                values(grouped['workout'][disease_id], 'workout', MISSING_INFO.workouts),
+            ))
+        return cls(registry, symptoms, info)
+
+    def __len__(self):
+        return len(self._info)
+
+    def disease_id(self, name):
+        """ID of a disease name in any spacing or case, or None"""
+        return self.registry.disease_id(name)
+
+    def disease_name(self, disease_id):
+        return self.registry.disease_name(disease_id)
+
+    def symptoms(self, disease_id):
+        """Symptoms listed for a disease in the symptoms dataset, in first-seen order"""
+        return self._symptoms[disease_id]
+
+    def info(self, disease_id):
+        """DiseaseInfo record of a disease (one tuple index, nothing computed per call)"""
+        return self._info[disease_id]
+
+    def info_json(self, disease_id):
+        """info_members of a disease as JSON bytes without braces, rendered when the catalog was built"""
+        return self._info_json[disease_id]
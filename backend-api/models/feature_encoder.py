@@ -0,0 +1,240 @@
+import numpy as np
+
+# All possible symptoms, in the order the feature columns were created at training time.
+# NOTE: 'fluid_overload' appears twice; the second entry maps onto the same feature column.
+ALL_SYMPTOMS = [
+    'itching', 'skin_rash', 'nodal_skin_eruptions', 'continuous_sneezing', 'shivering',
+    'chills', 'joint_pain', 'stomach_pain', 'acidity', 'ulcers_on_tongue', 'muscle_wasting',
+    'vomiting', 'burning_micturition', 'spotting_ urination', 'fatigue', 'weight_gain',
+    'anxiety', 'cold_hands_and_feets', 'mood_swings', 'weight_loss', 'restlessness',
+    'lethargy', 'patches_in_throat', 'irregular_sugar_level', 'cough', 'high_fever',
+    'sunken_eyes', 'breathlessness', 'sweating', 'dehydration', 'indigestion', 'headache',
+    'yellowish_skin', 'dark_urine', 'nausea', 'loss_of_appetite', 'pain_behind_the_eyes',
+    'back_pain', 'constipation', 'abdominal_pain', 'diarrhoea', 'mild_fever', 'yellow_urine',
+    'yellowing_of_eyes', 'acute_liver_failure', 'fluid_overload', 'swelling_of_stomach',
+    'swelled_lymph_nodes', 'malaise', 'blurred_and_distorted_vision', 'phlegm',
+    'throat_irritation', 'redness_of_eyes', 'sinus_pressure', 'runny_nose', 'congestion',
+    'chest_pain', 'weakness_in_limbs', 'fast_heart_rate', 'pain_during_bowel_movements',
+    'pain_in_anal_region', 'bloody_stool', 'irritation_in_anus', 'neck_pain', 'dizziness',
+    'cramps', 'bruising', 'obesity', 'swollen_legs', 'swollen_blood_vessels',
+    'puffy_face_and_eyes', 'enlarged_thyroid', 'brittle_nails', 'swollen_extremeties',
+    'excessive_hunger', 'extra_marital_contacts', 'drying_and_tingling_lips', 'slurred_speech',
+    'knee_pain', 'hip_joint_pain', 'muscle_weakness', 'stiff_neck', 'swelling_joints',
+    'movement_stiffness', 'spinning_movements', 'loss_of_balance', 'unsteadiness',
+    'weakness_of_one_body_side', 'loss_of_smell', 'bladder_discomfort', 'foul_smell_of urine',
+    'continuous_feel_of_urine', 'passage_of_gases', 'internal_itching', 'toxic_look_(typhos)',
+    'depression', 'irritability', 'muscle_pain', 'altered_sensorium', 'red_spots_over_body',
+    'belly_pain', 'abnormal_menstruation', 'dischromic _patches', 'watering_from_eyes',
+    'increased_appetite', 'polyuria', 'family_history', 'mucoid_sputum', 'rusty_sputum',
+    'lack_of_concentration', 'visual_disturbances', 'receiving_blood_transfusion',
+    'receiving_unsterile_injections', 'coma', 'stomach_bleeding', 'distention_of_abdomen',
+    'history_of_alcohol_consumption', 'fluid_overload', 'blood_in_sputum',
+    'prominent_veins_on_calf', 'palpitations', 'painful_walking', 'pus_filled_pimples',
+    'blackheads', 'scurring', 'skin_peeling', 'silver_like_dusting', 'small_dents_in_nails',
+    'inflammatory_nails', 'blister', 'red_sore_around_nose', 'yellow_crust_ooze'
+]
+
+# Unique symptom vocabulary (first occurrence order); the index is the symptom ID
+SYMPTOM_VOCABULARY = list(dict.fromkeys(ALL_SYMPTOMS))
+
+# Symptom categories: feature name -> member symptoms
+SYMPTOM_CATEGORIES = [
+    ('skin_symptoms_count', ['itching', 'skin_rash', 'nodal_skin_eruptions', 'dischromic _patches',
+                             'pus_filled_pimples', 'blackheads', 'scurring', 'skin_peeling',
+                             'silver_like_dusting', 'blister', 'red_sore_around_nose', 'yellow_crust_ooze']),
+    ('respiratory_symptoms_count', ['continuous_sneezing', 'cough', 'breathlessness', 'phlegm',
+                                    'throat_irritation', 'sinus_pressure', 'runny_nose', 'congestion']),
+    ('gastrointestinal_symptoms_count', ['stomach_pain', 'vomiting', 'nausea', 'abdominal_pain',
+                                         'diarrhoea', 'constipation', 'indigestion', 'loss_of_appetite']),
+    ('neurological_symptoms_count', ['headache', 'dizziness', 'mood_swings', 'anxiety', 'depression',
+                                     'irritability', 'altered_sensorium', 'coma']),
+    ('metabolic_symptoms_count', ['fatigue', 'weight_loss', 'weight_gain', 'irregular_sugar_level',
+                                  'excessive_hunger', 'polyuria', 'increased_appetite']),
+]
+
+# Disease-specific symptom scores: feature name -> key symptoms
+DISEASE_SCORE_GROUPS = [
+    ('diabetes_symptom_score', ['fatigue', 'weight_loss', 'irregular_sugar_level', 'polyuria', 'increased_appetite']),
+    ('diabetes_secondary_score', ['excessive_hunger', 'blurred_and_distorted_vision', 'slow_healing_wounds']),
+    ('hyperthyroidism_symptom_score', ['fatigue', 'weight_loss', 'mood_swings', 'restlessness', 'sweating']),
+    ('hyperthyroidism_secondary_score', ['fast_heart_rate', 'palpitations', 'enlarged_thyroid', 'anxiety']),
+    ('typhoid_symptom_score', ['chills', 'vomiting', 'high_fever', 'toxic_look_(typhos)', 'abdominal_pain']),
+    ('fungal_symptom_score', ['itching', 'skin_rash', 'nodal_skin_eruptions', 'dischromic _patches']),
+]
+
+# Symptom combination indicators used to separate Diabetes from Hyperthyroidism
+DIABETES_INDICATORS = ['irregular_sugar_level', 'polyuria']
+HYPERTHYROIDISM_INDICATORS = ['mood_swings', 'sweating']
+
+# Weight loss context features
+WEIGHT_LOSS_CONTEXT_FEATURES = [
+    'weight_loss_diabetes_context',
+    'weight_loss_hyperthyroidism_context',
+    'weight_loss_generic_context',
+]
+
+# Feature names in the order create_feature_vector + add_enhanced_features produce them
+CANONICAL_FEATURE_NAMES = (
+    [f'symptom_{symptom}' for symptom in SYMPTOM_VOCABULARY]
+    + ['symptom_count']
+    + [name for name, _ in SYMPTOM_CATEGORIES]
+    + [name for name, _ in DISEASE_SCORE_GROUPS]
+    + ['diabetes_indicators', 'hyperthyroidism_indicators']
+    + WEIGHT_LOSS_CONTEXT_FEATURES
+)
+
+
+class SymptomFeatureEncoder:
+    """Precompiled symptom encoder producing model-ready feature rows in one step.
+
+    Symptoms are mapped to term columns through a dict built once. Category counts,
+    disease scores and indicator groups are all computed with a single matrix product
+    of the per-row term counts against a precomputed group mask.
+    """
+
+    def __init__(self, feature_names=None):
+        self.feature_names = list(feature_names) if feature_names is not None else list(CANONICAL_FEATURE_NAMES)
+
+        # Term index: vocabulary symptoms first, then any extra terms only used by groups
+        terms = list(SYMPTOM_VOCABULARY)
+        for _, members in SYMPTOM_CATEGORIES + DISEASE_SCORE_GROUPS:
+            for symptom in members:
+                if symptom not in terms:
+                    terms.append(symptom)
+        self.terms = terms
+        self.term_index = {term: i for i, term in enumerate(terms)}
+        self.n_symptoms = len(SYMPTOM_VOCABULARY)
+
+        # Group mask: categories, scores, then diabetes/hyperthyroidism indicators and weight loss
+        groups = [members for _, members in SYMPTOM_CATEGORIES + DISEASE_SCORE_GROUPS]
+        groups += [DIABETES_INDICATORS, HYPERTHYROIDISM_INDICATORS, ['weight_loss']]
+        self.group_mask = np.zeros((len(terms), len(groups)), dtype=np.float64)
+        for j, members in enumerate(groups):
+            for symptom in members:
+                self.group_mask[self.term_index[symptom], j] = 1
+        self.n_count_groups = len(SYMPTOM_CATEGORIES) + len(DISEASE_SCORE_GROUPS)
+        # Same mask with a trailing all-zero row, so term ID -1 (empty slot) contributes nothing
+        self.padded_group_mask = np.vstack([self.group_mask, np.zeros((1, len(groups)))]).astype(np.uint8)
+
+        # Column permutation from the canonical layout to the trained feature order
+        canonical_index = {name: i for i, name in enumerate(CANONICAL_FEATURE_NAMES)}
+        missing = [name for name in self.feature_names if name not in canonical_index]
+        if missing:
+            raise ValueError(f"Unknown feature names for encoder: {missing}")
+        self.columns = np.array([canonical_index[name] for name in self.feature_names], dtype=np.intp)
+        self.canonical_order = self.feature_names == CANONICAL_FEATURE_NAMES
+
+        # Single-row lookups: output position of each symptom, groups of each term and
+        # output positions of the group counts followed by the count/derived features
+        position = {name: i for i, name in enumerate(self.feature_names)}
+        self.symptom_positions = [position[f'symptom_{symptom}'] for symptom in SYMPTOM_VOCABULARY]
+        self.term_groups = [tuple(int(k) for k in np.flatnonzero(self.group_mask[j])) for j in range(len(terms))]
+        derived_names = ['symptom_count', 'diabetes_indicators', 'hyperthyroidism_indicators'] + WEIGHT_LOSS_CONTEXT_FEATURES
+        self.group_positions = np.array(
+            [position[name] for name, _ in SYMPTOM_CATEGORIES + DISEASE_SCORE_GROUPS]
+            + [position[name] for name in derived_names],
+            dtype=np.intp
+        )
+
+    def encode(self, symptoms, dtype=np.float64):
+        """Encode one symptom list into a (1, n_features) matrix"""
+        term_index = self.term_index
+        term_ids = [term_index[symptom] for symptom in symptoms if symptom in term_index]
+        return self._encode_row(term_ids, len(symptoms), dtype)
+
+    def encode_symptom_ids(self, symptom_ids, dtype=np.float64):
+        """Encode one list of symptom IDs (positions in SYMPTOM_VOCABULARY) into a (1, n_features) matrix"""
+        return self._encode_row(symptom_ids, len(symptom_ids), dtype)
+
+    def _encode_row(self, term_ids, symptom_count, dtype):
+        row = np.zeros((1, len(self.feature_names)), dtype=dtype)
+        group_counts = [0] * self.group_mask.shape[1]
+        for j in term_ids:
+            if j < self.n_symptoms:
+                row[0, self.symptom_positions[j]] = 1
+            for group in self.term_groups[j]:
+                group_counts[group] += 1
+
+        # Same derived flags as encode_counts, on Python scalars
+        g = self.n_count_groups
+        diabetes = group_counts[g] > 0
+        hyperthyroidism = group_counts[g + 1] > 0
+        weight_loss = group_counts[g + 2] > 0
+        row[0, self.group_positions] = group_counts[:g] + [
+            symptom_count, diabetes, hyperthyroidism,
+            weight_loss and diabetes,
+            weight_loss and not diabetes and hyperthyroidism,
+            weight_loss and not diabetes and not hyperthyroidism,
+        ]
+        return row
+
+    def encode_batch(self, symptom_lists, dtype=np.float64):
+        """Encode a list of symptom lists into an (n, n_features) matrix"""
+        n_rows = len(symptom_lists)
+        counts = np.zeros((n_rows, len(self.terms)), dtype=np.float64)
+        term_index = self.term_index
+        for i, symptoms in enumerate(symptom_lists):
+            row = counts[i]
+            for symptom in symptoms:
+                j = term_index.get(symptom)
+                if j is not None:
+                    row[j] += 1
+        lengths = np.fromiter((len(symptoms) for symptoms in symptom_lists), dtype=np.float64, count=n_rows)
+        return self.encode_counts(counts, lengths, dtype=dtype)
+
+    def encode_symptom_id_lists(self, id_lists, dtype=np.float64):
+        """Encode lists of unique symptom IDs into an (n, n_features) matrix"""
+        n_rows = len(id_lists)
+        lengths = np.fromiter((len(ids) for ids in id_lists), dtype=np.intp, count=n_rows)
+        counts = np.zeros((n_rows, len(self.terms)), dtype=np.float64)
+        counts[np.repeat(np.arange(n_rows), lengths), np.fromiter(
+            (i for ids in id_lists for i in ids), dtype=np.intp, count=int(lengths.sum()))] = 1
+        return self.encode_counts(counts, lengths.astype(np.float64), dtype=dtype)
+
+    def encode_counts(self, counts, symptom_count, dtype=np.float64):
+        """Build feature rows from an (n, n_terms) term count matrix and per-row symptom counts"""
+        v = self.n_symptoms
+        out = np.empty((counts.shape[0], len(CANONICAL_FEATURE_NAMES)), dtype=dtype)
+        np.minimum(counts[:, :v], 1, out=out[:, :v], casting='unsafe')
+        return self._finish(out, counts @ self.group_mask, symptom_count)
+
+    def encode_ids(self, term_ids, symptom_count, dtype=np.float64, out=None):
+        """Build feature rows from an (n, slots) matrix of term IDs, -1 for empty or unknown slots
+
+        Rows are written into out (e.g. a slice of a preallocated training matrix) when given.
+        """
+        v = self.n_symptoms
+        n_rows = term_ids.shape[0]
+        if out is not None and self.canonical_order:
+            rows = out
+        else:
+            rows = np.empty((n_rows, len(CANONICAL_FEATURE_NAMES)), dtype=out.dtype if out is not None else dtype)
+        rows[:, :v] = 0
+        row_index, slot_index = np.nonzero((term_ids >= 0) & (term_ids < v))
+        rows[row_index, term_ids[row_index, slot_index]] = 1
+        group_counts = self.padded_group_mask[term_ids].sum(axis=1)
+        return self._finish(rows, group_counts, symptom_count, out)
+
+    def _finish(self, rows, group_counts, symptom_count, out=None):
+        """Fill the count, group and flag columns of canonical rows and reorder them to feature_names"""
+        v = self.n_symptoms
+        g = self.n_count_groups
+
+        # 0/1 flags for the diabetes indicator, hyperthyroidism indicator and weight loss
+        flags = np.minimum(group_counts[:, g:], 1)
+        diabetes, hyperthyroidism, weight_loss = flags[:, 0], flags[:, 1], flags[:, 2]
+        weight_loss_not_diabetes = weight_loss * (1 - diabetes)
+
+        rows[:, v] = symptom_count
+        rows[:, v + 1:v + 1 + g] = group_counts[:, :g]
+        k = v + 1 + g
+        rows[:, k:k + 2] = flags[:, :2]
+        rows[:, k + 2] = weight_loss * diabetes
+        rows[:, k + 3] = weight_loss_not_diabetes * hyperthyroidism
+        rows[:, k + 4] = weight_loss_not_diabetes * (1 - hyperthyroidism)
+        if self.canonical_order:
+            return rows
+        if out is None:
+            return rows[:, self.columns]
+        out[...] = rows[:, self.columns]
+        return out
@@ -1,24 +1,53 @@
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.svm import SVC
-from sklearn.neural_network import MLPClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from sklearn.preprocessing import LabelEncoder
 import pickle
 import warnings
+import uuid
+import time
+from feature_encoder import (
+    ALL_SYMPTOMS, SYMPTOM_CATEGORIES, DISEASE_SCORE_GROUPS,
+    DIABETES_INDICATORS, HYPERTHYROIDISM_INDICATORS, CANONICAL_FEATURE_NAMES, SymptomFeatureEncoder
+)
+from medical_rules import DEFAULT_RULES_PATH, MedicalRules, symptom_bitsets
+# pandas, sklearn and scipy are only needed for training and are imported by the
+# methods that train; serving imports NumPy alone (the pickle pulls in the
+# sklearn estimators it needs when it is loaded, the NumPy runtime none at all)
 warnings.filterwarnings('ignore')
 
+# Ensemble members ordered from cheapest to most expensive per request,
+# used by the confidence-gated cascade in predict_diseases
+CASCADE_ORDER = ['neural_network', 'svm', 'gradient_boosting', 'random_forest']
+
+# Members ordered by typical fit time, longest first, so a process pool finishes
+# the slow fits early instead of starting them last
+TRAINING_ORDER = ['gradient_boosting', 'svm', 'random_forest', 'neural_network']
+
+def _fit_model(model, X_train, y_train, X_test, y_test):
+    """Fit one ensemble member; runs in a worker process when training in parallel"""
+    from sklearn.metrics import accuracy_score
+    start = time.time()
+    model.fit(X_train, y_train)
+    fit_time = time.time() - start
+    accuracy = accuracy_score(y_test, model.predict(X_test))
+    return model, accuracy, fit_time
+
+def artifact_version(path):
+    """Fingerprint a model artifact by name, modification time and size"""
+    import os
+    stat = os.stat(path)
+    return f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
 class ImprovedEnhancedMedicalPredictor:
     def __init__(self):
         self.models = {}
-        self.label_encoder = LabelEncoder()
+        self.label_encoder = None
         self.symptom_weights = {}
         self.disease_symptom_importance = {}
+        self.encoder = None
+        self.rules = None
+        self.model_version = None
         
     def load_and_preprocess_data(self):
-        """Load and preprocess the symptoms dataset with enhanced features"""
+        """Load the symptoms dataset as an (X, y) training set with enhanced features"""
         print("Loading and preprocessing data...")
         
         # Load the symptoms dataset with fallback paths
@@ -33,75 +62,51 @@ class ImprovedEnhancedMedicalPredictor:
             '../../ProjectAML/datasets/symtoms_df.csv'
         ]
         
-        df = None
-        for path in dataset_paths:
-            if os.path.exists(path):
-                df = pd.read_csv(path)
-                break
-        
-        if df is None:
+        path = next((path for path in dataset_paths if os.path.exists(path)), None)
+        if path is None:
             raise FileNotFoundError("Could not find symtoms_df.csv in any expected location")
         
-        # Create a more comprehensive dataset
-        enhanced_data = []
-        
-        for _, row in df.iterrows():
-            disease = row['Disease']
-            symptoms = [row['Symptom_1'], row['Symptom_2'], row['Symptom_3'], row['Symptom_4']]
-            symptoms = [s.strip() for s in symptoms if pd.notna(s) and s.strip()]
-            
-            # Create binary feature vector
-            feature_vector = self.create_feature_vector(symptoms)
-            
-            # Add enhanced features
-            enhanced_features = self.add_enhanced_features(symptoms, disease)
-            feature_vector.update(enhanced_features)
+        return self.build_training_matrix(path)
+    
+    def build_training_matrix(self, path, chunksize=100_000):
+        """Build the (X, y) training set from a symptoms CSV, reading it in chunks
+
+        X is a preallocated uint8 matrix in CANONICAL_FEATURE_NAMES order with the same
+        values create_feature_vector/add_enhanced_features give per row; y holds the
+        Disease column as a str array (label classes of that dtype can be saved with
+        allow_pickle=False by the NumPy runtime and the answer table).
+        """
+        import pandas as pd
+        encoder = SymptomFeatureEncoder()
+        
+        # Every record takes at least one line, so the line count bounds the row count
+        with open(path, 'rb') as f:
+            max_rows = max(sum(1 for _ in f) - 1, 0)
+        X = np.empty((max_rows, len(CANONICAL_FEATURE_NAMES)), dtype=np.uint8)
+        diseases = []
+        n_rows = 0
+        
+        for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str):
+            symptom_cols = [col for col in chunk.columns if col.startswith('Symptom_')]
+            term_ids = np.empty((len(chunk), len(symptom_cols)), dtype=np.int16)
+            symptom_count = np.zeros(len(chunk), dtype=np.int64)
+            for j, col in enumerate(symptom_cols):
+                symptoms = chunk[col].str.strip()
+                symptom_count += (symptoms.notna() & (symptoms != '')).to_numpy()
+                # Codes are positions in encoder.terms, -1 for empty cells and unknown symptoms
+                term_ids[:, j] = pd.Categorical(symptoms, categories=encoder.terms).codes
             
-            enhanced_data.append({
-                'disease': disease,
-                'symptoms': symptoms,
-                'features': feature_vector
-            })
+            encoder.encode_ids(term_ids, symptom_count, out=X[n_rows:n_rows + len(chunk)])
+            diseases.append(chunk['Disease'].to_numpy(dtype=object))
+            n_rows += len(chunk)
         
-        return enhanced_data
+        y = np.concatenate(diseases).astype(str) if diseases else np.array([], dtype=str)
+        return X[:n_rows], y
     
     def create_feature_vector(self, symptoms):
         """Create binary feature vector for symptoms"""
-        # Define all possible symptoms
-        all_symptoms = [
-            'itching', 'skin_rash', 'nodal_skin_eruptions', 'continuous_sneezing', 'shivering',
-            'chills', 'joint_pain', 'stomach_pain', 'acidity', 'ulcers_on_tongue', 'muscle_wasting',
-            'vomiting', 'burning_micturition', 'spotting_ urination', 'fatigue', 'weight_gain',
-            'anxiety', 'cold_hands_and_feets', 'mood_swings', 'weight_loss', 'restlessness',
-            'lethargy', 'patches_in_throat', 'irregular_sugar_level', 'cough', 'high_fever',
-            'sunken_eyes', 'breathlessness', 'sweating', 'dehydration', 'indigestion', 'headache',
-            'yellowish_skin', 'dark_urine', 'nausea', 'loss_of_appetite', 'pain_behind_the_eyes',
-            'back_pain', 'constipation', 'abdominal_pain', 'diarrhoea', 'mild_fever', 'yellow_urine',
-            'yellowing_of_eyes', 'acute_liver_failure', 'fluid_overload', 'swelling_of_stomach',
-            'swelled_lymph_nodes', 'malaise', 'blurred_and_distorted_vision', 'phlegm',
-            'throat_irritation', 'redness_of_eyes', 'sinus_pressure', 'runny_nose', 'congestion',
-            'chest_pain', 'weakness_in_limbs', 'fast_heart_rate', 'pain_during_bowel_movements',
-            'pain_in_anal_region', 'bloody_stool', 'irritation_in_anus', 'neck_pain', 'dizziness',
-            'cramps', 'bruising', 'obesity', 'swollen_legs', 'swollen_blood_vessels',
-            'puffy_face_and_eyes', 'enlarged_thyroid', 'brittle_nails', 'swollen_extremeties',
-            'excessive_hunger', 'extra_marital_contacts', 'drying_and_tingling_lips', 'slurred_speech',
-            'knee_pain', 'hip_joint_pain', 'muscle_weakness', 'stiff_neck', 'swelling_joints',
-            'movement_stiffness', 'spinning_movements', 'loss_of_balance', 'unsteadiness',
-            'weakness_of_one_body_side', 'loss_of_smell', 'bladder_discomfort', 'foul_smell_of urine',
-            'continuous_feel_of_urine', 'passage_of_gases', 'internal_itching', 'toxic_look_(typhos)',
-            'depression', 'irritability', 'muscle_pain', 'altered_sensorium', 'red_spots_over_body',
-            'belly_pain', 'abnormal_menstruation', 'dischromic _patches', 'watering_from_eyes',
-            'increased_appetite', 'polyuria', 'family_history', 'mucoid_sputum', 'rusty_sputum',
-            'lack_of_concentration', 'visual_disturbances', 'receiving_blood_transfusion',
-            'receiving_unsterile_injections', 'coma', 'stomach_bleeding', 'distention_of_abdomen',
-            'history_of_alcohol_consumption', 'fluid_overload', 'blood_in_sputum',
-            'prominent_veins_on_calf', 'palpitations', 'painful_walking', 'pus_filled_pimples',
-            'blackheads', 'scurring', 'skin_peeling', 'silver_like_dusting', 'small_dents_in_nails',
-            'inflammatory_nails', 'blister', 'red_sore_around_nose', 'yellow_crust_ooze'
-        ]
-        
         feature_vector = {}
-        for symptom in all_symptoms:
+        for symptom in ALL_SYMPTOMS:
             feature_vector[f'symptom_{symptom}'] = 1 if symptom in symptoms else 0
         
         return feature_vector
@@ -114,56 +119,20 @@ class ImprovedEnhancedMedicalPredictor:
         enhanced_features['symptom_count'] = len(symptoms)
         
         # Symptom categories
-        skin_symptoms = ['itching', 'skin_rash', 'nodal_skin_eruptions', 'dischromic _patches', 
-                        'pus_filled_pimples', 'blackheads', 'scurring', 'skin_peeling', 
-                        'silver_like_dusting', 'blister', 'red_sore_around_nose', 'yellow_crust_ooze']
-        respiratory_symptoms = ['continuous_sneezing', 'cough', 'breathlessness', 'phlegm', 
-                               'throat_irritation', 'sinus_pressure', 'runny_nose', 'congestion']
-        gastrointestinal_symptoms = ['stomach_pain', 'vomiting', 'nausea', 'abdominal_pain', 
-                                    'diarrhoea', 'constipation', 'indigestion', 'loss_of_appetite']
-        neurological_symptoms = ['headache', 'dizziness', 'mood_swings', 'anxiety', 'depression', 
-                                'irritability', 'altered_sensorium', 'coma']
-        metabolic_symptoms = ['fatigue', 'weight_loss', 'weight_gain', 'irregular_sugar_level', 
-                             'excessive_hunger', 'polyuria', 'increased_appetite']
-        
-        enhanced_features['skin_symptoms_count'] = sum(1 for s in symptoms if s in skin_symptoms)
-        enhanced_features['respiratory_symptoms_count'] = sum(1 for s in symptoms if s in respiratory_symptoms)
-        enhanced_features['gastrointestinal_symptoms_count'] = sum(1 for s in symptoms if s in gastrointestinal_symptoms)
-        enhanced_features['neurological_symptoms_count'] = sum(1 for s in symptoms if s in neurological_symptoms)
-        enhanced_features['metabolic_symptoms_count'] = sum(1 for s in symptoms if s in metabolic_symptoms)
+        for name, category_symptoms in SYMPTOM_CATEGORIES:
+            enhanced_features[name] = sum(1 for s in symptoms if s in category_symptoms)
         
         # IMPROVED: Disease-specific symptom patterns with better differentiation
-        # Diabetes-specific features
-        diabetes_key_symptoms = ['fatigue', 'weight_loss', 'irregular_sugar_level', 'polyuria', 'increased_appetite']
-        diabetes_secondary_symptoms = ['excessive_hunger', 'blurred_and_distorted_vision', 'slow_healing_wounds']
-        enhanced_features['diabetes_symptom_score'] = sum(1 for s in symptoms if s in diabetes_key_symptoms)
-        enhanced_features['diabetes_secondary_score'] = sum(1 for s in symptoms if s in diabetes_secondary_symptoms)
-        
-        # Hyperthyroidism-specific features
-        hyperthyroidism_key_symptoms = ['fatigue', 'weight_loss', 'mood_swings', 'restlessness', 'sweating']
-        hyperthyroidism_secondary_symptoms = ['fast_heart_rate', 'palpitations', 'enlarged_thyroid', 'anxiety']
-        enhanced_features['hyperthyroidism_symptom_score'] = sum(1 for s in symptoms if s in hyperthyroidism_key_symptoms)
-        enhanced_features['hyperthyroidism_secondary_score'] = sum(1 for s in symptoms if s in hyperthyroidism_secondary_symptoms)
-        
-        # Typhoid-specific features
-        typhoid_key_symptoms = ['chills', 'vomiting', 'high_fever', 'toxic_look_(typhos)', 'abdominal_pain']
-        enhanced_features['typhoid_symptom_score'] = sum(1 for s in symptoms if s in typhoid_key_symptoms)
-        
-        # Fungal infection-specific features
-        fungal_key_symptoms = ['itching', 'skin_rash', 'nodal_skin_eruptions', 'dischromic _patches']
-        enhanced_features['fungal_symptom_score'] = sum(1 for s in symptoms if s in fungal_key_symptoms)
+        # (Diabetes, Hyperthyroidism, Typhoid and Fungal infection key/secondary symptoms)
+        for name, key_symptoms in DISEASE_SCORE_GROUPS:
+            enhanced_features[name] = sum(1 for s in symptoms if s in key_symptoms)
         
         # IMPROVED: Symptom combination features
         # Diabetes vs Hyperthyroidism differentiation
-        if 'irregular_sugar_level' in symptoms or 'polyuria' in symptoms:
-            enhanced_features['diabetes_indicators'] = 1
-        else:
-            enhanced_features['diabetes_indicators'] = 0
-            
-        if 'mood_swings' in symptoms or 'sweating' in symptoms:
-            enhanced_features['hyperthyroidism_indicators'] = 1
-        else:
-            enhanced_features['hyperthyroidism_indicators'] = 0
+        has_diabetes_indicator = any(s in symptoms for s in DIABETES_INDICATORS)
+        has_hyperthyroidism_indicator = any(s in symptoms for s in HYPERTHYROIDISM_INDICATORS)
+        enhanced_features['diabetes_indicators'] = 1 if has_diabetes_indicator else 0
+        enhanced_features['hyperthyroidism_indicators'] = 1 if has_hyperthyroidism_indicator else 0
         
         # IMPROVED: Weight loss context
         enhanced_features['weight_loss_diabetes_context'] = 0
@@ -171,145 +140,278 @@ class ImprovedEnhancedMedicalPredictor:
         enhanced_features['weight_loss_generic_context'] = 0
         
         if 'weight_loss' in symptoms:
-            if 'irregular_sugar_level' in symptoms or 'polyuria' in symptoms:
+            if has_diabetes_indicator:
                 enhanced_features['weight_loss_diabetes_context'] = 1
-            elif 'mood_swings' in symptoms or 'sweating' in symptoms:
+            elif has_hyperthyroidism_indicator:
                 enhanced_features['weight_loss_hyperthyroidism_context'] = 1
             else:
                 enhanced_features['weight_loss_generic_context'] = 1
         
         return enhanced_features
     
-    def train_models(self, enhanced_data):
-        """Train multiple models for ensemble prediction"""
+    def train_models(self, training_data, n_workers=1, rf_n_jobs=None, svm_probability='platt'):
+        """Train multiple models for ensemble prediction on (X, y) from load_and_preprocess_data
+
+        n_workers > 1 fits the members concurrently in a process pool;
+        rf_n_jobs is passed to the random forest as n_jobs.
+        svm_probability picks how the SVM's probabilities are calibrated: 'platt'
+        (SVC probability=True, 5-fold Platt scaling) or 'softmax' (SoftmaxSVC, a
+        temperature fitted on a hold-out split).
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from sklearn.model_selection import train_test_split
+        from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+        from sklearn.svm import SVC
+        from sklearn.neural_network import MLPClassifier
+        from sklearn.preprocessing import LabelEncoder
+        from svm_calibration import SoftmaxSVC
+        
         print("Training improved enhanced models...")
         
         # Prepare features and labels
-        feature_names = list(enhanced_data[0]['features'].keys())
+        X, y = training_data
+        feature_names = list(CANONICAL_FEATURE_NAMES)
         self.feature_names = feature_names  # Set as instance attribute
-        X = np.array([[d['features'][f] for f in feature_names] for d in enhanced_data])
-        y = [d['disease'] for d in enhanced_data]
+        self.encoder = SymptomFeatureEncoder(feature_names)
         
         # Encode labels
+        self.label_encoder = LabelEncoder()
         y_encoded = self.label_encoder.fit_transform(y)
+        self.rules = None
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(X, y_encoded, test_size=0.2, random_state=42, stratify=y_encoded)
         
         # Train multiple models with improved parameters
         models_config = {
-            'random_forest': RandomForestClassifier(n_estimators=300, max_depth=20, min_samples_split=5, random_state=42),
+            'random_forest': RandomForestClassifier(n_estimators=300, max_depth=20, min_samples_split=5, random_state=42, n_jobs=rf_n_jobs),
             'gradient_boosting': GradientBoostingClassifier(n_estimators=300, max_depth=10, learning_rate=0.1, random_state=42),
-            'svm': SVC(kernel='rbf', probability=True, C=10, gamma='scale', random_state=42),
+            'svm': (SoftmaxSVC(C=10, gamma='scale', random_state=42) if svm_probability == 'softmax'
+                    else SVC(kernel='rbf', probability=True, C=10, gamma='scale', random_state=42)),
             'neural_network': MLPClassifier(hidden_layer_sizes=(150, 100, 50), max_iter=1000, alpha=0.01, random_state=42)
         }
         
-        for name, model in models_config.items():
-            print(f"Training {name}...")
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
-            print(f"{name} accuracy: {accuracy:.4f}")
-            
-            self.models[name] = model
+        start = time.time()
+        results = {}
+        if n_workers > 1:
+            print(f"Training {len(models_config)} models in {n_workers} worker processes...")
+            ordered = sorted(models_config, key=lambda name: TRAINING_ORDER.index(name) if name in TRAINING_ORDER else len(TRAINING_ORDER))
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                futures = {
+                    name: pool.submit(_fit_model, models_config[name], X_train, y_train, X_test, y_test)
+                    for name in ordered
+                }
+                for name, future in futures.items():
+                    results[name] = future.result()
+                    print(f"{name} accuracy: {results[name][1]:.4f}")
+        else:
+            for name, model in models_config.items():
+                print(f"Training {name}...")
+                results[name] = _fit_model(model, X_train, y_train, X_test, y_test)
+                print(f"{name} accuracy: {results[name][1]:.4f}")
         
-        # Save models
+        # Keep the configured member order regardless of completion order
+        self.models = {}
+        for name in models_config:
+            self.models[name] = results[name][0]
+        # n_jobs only pays off while fitting; serving predicts a row at a time without joblib dispatch
+        self.models['random_forest'].set_params(n_jobs=None)
+        
+        print("Fit times:")
+        for name in models_config:
+            print(f"   {name:<20}{results[name][2]:>8.1f}s")
+        print(f"   {'total (wall clock)':<20}{time.time() - start:>8.1f}s")
+        
+        # Save models; model_id identifies this training run in every derived artifact
+        self.model_version = uuid.uuid4().hex
         with open('models/improved_enhanced_models.pkl', 'wb') as f:
             pickle.dump({
                 'models': self.models,
                 'label_encoder': self.label_encoder,
-                'feature_names': feature_names
+                'feature_names': feature_names,
+                'model_id': self.model_version
             }, f)
         
         print("Improved models saved successfully!")
         return X_test, y_test
     
-    def predict_disease(self, symptoms):
+    def load_models(self, model_path='models/improved_enhanced_models.pkl'):
+        """Load pre-trained models, label encoder and feature names from disk"""
+        with open(model_path, 'rb') as f:
+            data = pickle.load(f)
+            self.models = data['models']
+            self.label_encoder = data['label_encoder']
+            self.feature_names = data['feature_names']
+        self.encoder = SymptomFeatureEncoder(self.feature_names)
+        self.rules = None
+        self.model_version = data.get('model_id') or artifact_version(model_path)
+    
+    def load_numpy_runtime(self, runtime_path='models/improved_enhanced_runtime'):
+        """Load models exported with numpy_runtime.export_ensemble (no sklearn needed)"""
+        from numpy_runtime import load_ensemble
+        self.models, self.label_encoder, self.feature_names, model_id = load_ensemble(runtime_path)
+        self.encoder = SymptomFeatureEncoder(self.feature_names)
+        self.rules = None
+        self.model_version = model_id or artifact_version(runtime_path)
+    
+    def export_numpy_runtime(self, runtime_path='models/improved_enhanced_runtime'):
+        """Export the trained models to the pure-NumPy runtime format"""
+        from numpy_runtime import export_ensemble
+        return export_ensemble(self.models, self.label_encoder, self.feature_names, runtime_path,
+                               model_id=self.model_version)
+    
+    def load_rules(self, rules_path=DEFAULT_RULES_PATH):
+        """Compile the medical override rules against the label encoder's classes"""
+        self.rules = MedicalRules.load(self.label_encoder.classes_, rules_path)
+        return self.rules
+    
+    def predict_disease(self, symptoms, cascade_threshold=None):
         """Predict disease using ensemble of models with improved logic"""
-        # Load models if not already loaded
-        if not self.models:
-            with open('models/improved_enhanced_models.pkl', 'rb') as f:
-                data = pickle.load(f)
-                self.models = data['models']
-                self.label_encoder = data['label_encoder']
-                self.feature_names = data['feature_names']
-        
-        # Create feature vector
-        feature_vector = self.create_feature_vector(symptoms)
-        enhanced_features = self.add_enhanced_features(symptoms, "unknown")
-        feature_vector.update(enhanced_features)
-        
-        # Prepare input
-        X = np.array([[feature_vector[f] for f in self.feature_names]])
-        
-        # Get predictions from all models
-        predictions = {}
-        probabilities = {}
+        return self.predict_diseases([symptoms], cascade_threshold=cascade_threshold)[0]
+    
+    def predict_diseases(self, symptom_lists, cascade_threshold=None):
+        """Predict diseases for a batch of symptom lists with one pass per model
+        
+        With cascade_threshold set, members run cheapest first (CASCADE_ORDER) and a row
+        stops once its winning probability reaches the threshold, so only the models
+        present in that row's predictions/probabilities actually ran for it.
+        """
+        self._ensure_loaded()
+        
+        # Create one feature matrix for the whole batch
+        if len(symptom_lists) == 1:
+            X = self.encoder.encode(symptom_lists[0])
+        else:
+            X = self.encoder.encode_batch(symptom_lists)
         
-        for name, model in self.models.items():
-            pred = model.predict(X)[0]
-            prob = model.predict_proba(X)[0]
-            predictions[name] = pred
-            probabilities[name] = prob
+        labels, predictions, probabilities, fired = self._predict_encoded(X, cascade_threshold)
+        rule_ids = [self.rules.rule_id(index) for index in fired]
         
-        # IMPROVED: Enhanced ensemble prediction with medical rules
-        ensemble_pred = self.improved_ensemble_predict(predictions, probabilities, symptoms, feature_vector)
+        # Decode all predictions in one call
+        predicted_diseases = self.label_encoder.inverse_transform(labels) if len(labels) else []
         
-        # Decode prediction
-        predicted_disease = self.label_encoder.inverse_transform([ensemble_pred])[0]
+        return list(zip(predicted_diseases, predictions, probabilities, rule_ids))
+
+    def predict_labels(self, symptom_id_lists, cascade_threshold=None):
+        """Like predict_diseases, on lists of unique symptom IDs and without decoding anything
+
+        Returns (labels, predictions, probabilities, fired): the encoded label of each row
+        (its disease ID in the Registry), each row's {model: encoded label} and
+        {model: probabilities}, and the index of the medical rule that fired (NO_RULE if none).
+        """
+        self._ensure_loaded()
+        if len(symptom_id_lists) == 1:
+            X = self.encoder.encode_symptom_ids(symptom_id_lists[0])
+        else:
+            X = self.encoder.encode_symptom_id_lists(symptom_id_lists)
+        return self._predict_encoded(X, cascade_threshold)
+
+    def _ensure_loaded(self):
+        # Load models if not already loaded
+        if not self.models:
+            self.load_models()
+        if self.encoder is None:
+            self.encoder = SymptomFeatureEncoder(self.feature_names)
+        if self.rules is None:
+            self.load_rules()
+
+    def _predict_encoded(self, X, cascade_threshold):
+        n_rows = X.shape[0]
+        predictions = [{} for _ in range(n_rows)]
+        probabilities = [{} for _ in range(n_rows)]
         
-        return predicted_disease, predictions, probabilities
-    
-    def improved_ensemble_predict(self, predictions, probabilities, symptoms, feature_vector):
-        """Improved ensemble prediction with medical domain knowledge"""
-        
-        # Get the most confident prediction
-        max_confidence = 0
-        best_prediction = None
-        
-        for name, prob in probabilities.items():
-            max_prob = max(prob)
-            if max_prob > max_confidence:
-                max_confidence = max_prob
-                best_prediction = predictions[name]
-        
-        # IMPROVED: Apply medical rules for specific cases
-        predicted_disease_name = self.label_encoder.inverse_transform([best_prediction])[0]
-        
-        # Rule 1: Diabetes vs Hyperthyroidism differentiation
-        if predicted_disease_name in ['Diabetes ', 'Hyperthyroidism']:
-            # Check for diabetes-specific symptoms
-            if ('irregular_sugar_level' in symptoms or 'polyuria' in symptoms) and 'mood_swings' not in symptoms:
-                # Force Diabetes prediction
-                diabetes_idx = self.label_encoder.transform(['Diabetes '])[0]
-                return diabetes_idx
-            elif ('mood_swings' in symptoms or 'sweating' in symptoms) and 'irregular_sugar_level' not in symptoms:
-                # Force Hyperthyroidism prediction
-                hyperthyroidism_idx = self.label_encoder.transform(['Hyperthyroidism'])[0]
-                return hyperthyroidism_idx
-        
-        # Rule 2: Typhoid specific symptoms
-        if 'chills' in symptoms and 'vomiting' in symptoms and 'high_fever' in symptoms:
-            typhoid_idx = self.label_encoder.transform(['Typhoid'])[0]
-            return typhoid_idx
-        
-        # Rule 3: Fungal infection specific symptoms
-        if 'itching' in symptoms and 'skin_rash' in symptoms and 'nodal_skin_eruptions' in symptoms:
-            fungal_idx = self.label_encoder.transform(['Fungal infection'])[0]
-            return fungal_idx
-        
-        # If no specific rules apply, return the most confident prediction
-        return best_prediction
+        if cascade_threshold is None:
+            model_names = list(self.models)
+        else:
+            model_names = [name for name in CASCADE_ORDER if name in self.models]
+            model_names += [name for name in self.models if name not in model_names]
+        
+        # Run every model once over the rows still active; labels are the argmax
+        # of a single predict_proba call. Each row keeps the label of its most
+        # confident model (the first one on ties).
+        active = np.arange(n_rows)
+        best_confidence = np.zeros(n_rows)
+        best_prediction = np.zeros(n_rows, dtype=np.intp)
+        for name in model_names:
+            if len(active) == 0:
+                break
+            model = self.models[name]
+            probs = model.predict_proba(X[active])
+            labels = model.classes_[probs.argmax(axis=1)]
+            for row, label, prob in zip(active, labels, probs):
+                predictions[row][name] = label
+                probabilities[row][name] = prob
+            
+            top = probs.max(axis=1)
+            better = top > best_confidence[active]
+            best_prediction[active[better]] = labels[better]
+            best_confidence[active] = np.maximum(best_confidence[active], top)
+            if cascade_threshold is not None:
+                active = active[best_confidence[active] < cascade_threshold]
+        
+        # Medical override rules, checked for every row at once against its symptom bitset
+        bitsets = symptom_bitsets(X[:, self.encoder.symptom_positions] > 0)
+        ensemble_preds, fired = self.rules.apply(bitsets, best_prediction)
+        return ensemble_preds, predictions, probabilities, fired
+
+    def top_k_labels(self, probability_rows, k, weights=None):
+        """Top k (encoded label, probability) pairs per row from the members' averaged probability vectors
+
+        weights maps model names to non-negative weights (unlisted models weigh 1.0);
+        only the models that ran for a row are averaged. The k best classes come from
+        an argpartition followed by a sort of just those k.
+        """
+        top, top_probs = self._top_k(probability_rows, k, weights)
+        return [
+            [(int(label), float(prob)) for label, prob in zip(row_labels, row_probs)]
+            for row_labels, row_probs in zip(top, top_probs)
+        ]
+
+    def _top_k(self, probability_rows, k, weights):
+        n_classes = len(self.label_encoder.classes_)
+        k = min(k, n_classes)
+        averaged = np.zeros((len(probability_rows), n_classes))
+        for i, probabilities in enumerate(probability_rows):
+            names = list(probabilities)
+            member_weights = np.array([1.0 if weights is None else weights.get(name, 1.0) for name in names])
+            if member_weights.sum() <= 0:
+                member_weights = np.ones(len(names))
+            averaged[i] = member_weights @ np.stack([probabilities[name] for name in names]) / member_weights.sum()
+
+        top = np.argpartition(-averaged, k - 1, axis=1)[:, :k]
+        top_probs = np.take_along_axis(averaged, top, axis=1)
+        order = np.argsort(-top_probs, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_probs = np.take_along_axis(top_probs, order, axis=1)
+        return top, top_probs
 
 def main():
     """Main function to train the improved enhanced model"""
+    import argparse
+    import os
+    
+    parser = argparse.ArgumentParser(description='Train the improved enhanced ensemble')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes fitting members concurrently (0 = one per CPU, capped at the number of models)')
+    parser.add_argument('--rf-jobs', type=int, default=None,
+                        help='n_jobs for the random forest (-1 = all CPUs)')
+    parser.add_argument('--svm-probability', choices=['platt', 'softmax'], default='platt',
+                        help='SVM probability calibration (softmax: one SVC fit instead of six, cheaper predict_proba)')
+    args = parser.parse_args()
+    n_workers = args.workers if args.workers > 0 else min(os.cpu_count() or 1, 4)
+    
     predictor = ImprovedEnhancedMedicalPredictor()
     
     # Load and preprocess data
-    enhanced_data = predictor.load_and_preprocess_data()
+    training_data = predictor.load_and_preprocess_data()
     
     # Train models
-    X_test, y_test = predictor.train_models(enhanced_data)
+    X_test, y_test = predictor.train_models(training_data, n_workers=n_workers, rf_n_jobs=args.rf_jobs,
+                                             svm_probability=args.svm_probability)
+    
+    # Export the sklearn-free serving runtime alongside the pickle
+    predictor.export_numpy_runtime()
+    print("NumPy runtime exported successfully!")
     
     # Test with the problematic cases
     test_cases = [
@@ -328,10 +430,10 @@ def main():
     predictor.models = {}
     
     for i, test_symptoms in enumerate(test_cases, 1):
-        predicted_disease, predictions, probabilities = predictor.predict_disease(test_symptoms)
+        predicted_disease, predictions, probabilities, rule_id = predictor.predict_disease(test_symptoms)
         
         print(f"\n{i}. Test case: {test_symptoms}")
-        print(f"   Predicted disease: {predicted_disease}")
+        print(f"   Predicted disease: {predicted_disease}" + (f" (rule {rule_id})" if rule_id else ""))
         print("   Individual model predictions:")
         for name, pred in predictions.items():
             disease_name = predictor.label_encoder.inverse_transform([pred])[0]
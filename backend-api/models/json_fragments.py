@@ -0,0 +1,55 @@
+"""
+JSON bytes and pre-rendered response fragments
+==============================================
+
+Most of a /predict response is the same for every request that predicts a
+given disease: its name, description, precautions, medications, diets and
+workouts (twice, under both spellings of the diet and workout keys). The
+disease catalog renders that block once per disease as the members of a JSON
+object, without the braces; a response is then
+
+    b'{' + <dynamic members> + b',' + <cached disease members> + b'}'
+
+so only the prediction, confidence and symptom fields are serialized per
+request, whatever the length of the disease text.
+
+orjson is used when it is installed (it also serializes NumPy scalars and
+arrays directly); otherwise the standard json module produces the same
+compact UTF-8 output.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """NumPy scalars and arrays (and namedtuples under orjson) as plain Python values"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Compact UTF-8 JSON bytes of obj"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def members(obj):
+    """JSON bytes of a dict's members without the surrounding braces, ready to splice into an object"""
+    return dumps(obj)[1:-1] if obj else b''
+
+
+def splice(*parts):
+    """JSON object bytes from dicts of members and pre-rendered member fragments, in order
+
+    Keys must not repeat across parts; empty parts are skipped.
+    """
+    rendered = [part if isinstance(part, bytes) else members(part) for part in parts]
+    return b'{' + b','.join(part for part in rendered if part) + b'}'
@@ -0,0 +1,123 @@
+"""
+Declarative medical override rules compiled to symptom bitmasks
+===============================================================
+
+The rules live in medical_rules.json. Each rule's 'all', 'any' and 'none'
+symptom lists are compiled into integer bitmasks over SYMPTOM_VOCABULARY and
+its 'when_predicted' diseases into a bitmask over the label encoder's classes.
+A request's symptoms become one integer bitset, and a rule matches with a few
+AND/compare operations:
+
+    bits & required == required and (not any_of or bits & any_of)
+    and not bits & excluded and applies_to >> predicted & 1
+
+Every rule is also indexed under one of its symptoms (its first 'all'
+symptom, else each 'any' symptom), so a request only checks the rules whose
+anchor symptom it has. The first matching rule in file order wins, like the
+if-chain it replaces.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from feature_encoder import SYMPTOM_VOCABULARY
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'medical_rules.json')
+
+# No rule matched
+NO_RULE = -1
+
+
+def symptom_bitsets(present):
+    """Integer bitsets (bit i = SYMPTOM_VOCABULARY[i]) of an (n, len(SYMPTOM_VOCABULARY)) presence matrix"""
+    packed = np.packbits(np.asarray(present, dtype=bool), axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+
+class MedicalRules:
+    """Compiled rule set: symptom bitsets + predicted labels -> index of the first matching rule"""
+
+    def __init__(self, rules, classes, version=None):
+        classes = [str(c) for c in classes]
+        class_index = {name: i for i, name in enumerate(classes)}
+        symptom_index = {symptom: i for i, symptom in enumerate(SYMPTOM_VOCABULARY)}
+
+        def lookup(index, names, kind, rule_id):
+            unknown = [name for name in names if name not in index]
+            if unknown:
+                raise ValueError(f"Rule {rule_id}: unknown {kind} {unknown}")
+            return [index[name] for name in names]
+
+        def mask(positions):
+            return sum(1 << i for i in set(positions))
+
+        self.ids, self.targets = [], []
+        self.required, self.any_of, self.excluded, self.applies_to = [], [], [], []
+        # rules_by_symptom[i]: bitmask over rules anchored on symptom i; unanchored rules always run
+        self.rules_by_symptom = [0] * len(SYMPTOM_VOCABULARY)
+        self.unanchored = 0
+        for r, rule in enumerate(rules):
+            rule_id = rule['id']
+            if rule_id in self.ids:
+                raise ValueError(f"Duplicate rule id: {rule_id}")
+            self.ids.append(rule_id)
+            self.targets.append(lookup(class_index, [rule['disease']], 'disease', rule_id)[0])
+            required = lookup(symptom_index, rule.get('all', []), 'symptom', rule_id)
+            any_of = lookup(symptom_index, rule.get('any', []), 'symptom', rule_id)
+            self.required.append(mask(required))
+            self.any_of.append(mask(any_of))
+            self.excluded.append(mask(lookup(symptom_index, rule.get('none', []), 'symptom', rule_id)))
+            if 'when_predicted' in rule:
+                self.applies_to.append(mask(lookup(class_index, rule['when_predicted'], 'disease', rule_id)))
+            else:
+                self.applies_to.append(-1)
+
+            for anchor in (required[:1] or any_of):
+                self.rules_by_symptom[anchor] |= 1 << r
+            if not required and not any_of:
+                self.unanchored |= 1 << r
+        # The trailing entry is what NO_RULE (-1) indexes in apply; np.where discards it
+        self.target_labels = np.array(self.targets + [0], dtype=np.intp)
+        self.version = version
+
+    @classmethod
+    def load(cls, classes, path=DEFAULT_RULES_PATH):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        rules = json.loads(raw)['rules']
+        return cls(rules, classes, version=hashlib.sha256(raw).hexdigest()[:16])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def match(self, bits, predicted):
+        """Index of the first rule matching one symptom bitset and ensemble label, or NO_RULE"""
+        candidates = self.unanchored
+        remaining = bits
+        while remaining:
+            low = remaining & -remaining
+            candidates |= self.rules_by_symptom[low.bit_length() - 1]
+            remaining ^= low
+        while candidates:
+            low = candidates & -candidates
+            r = low.bit_length() - 1
+            candidates ^= low
+            required = self.required[r]
+            if (bits & required == required
+                    and (not self.any_of[r] or bits & self.any_of[r])
+                    and not bits & self.excluded[r]
+                    and self.applies_to[r] >> predicted & 1):
+                return r
+        return NO_RULE
+
+    def apply(self, bitsets, predicted):
+        """(labels, rule indexes): each predicted label with its first matching rule's disease substituted"""
+        fired = np.array([self.match(bits, int(label)) for bits, label in zip(bitsets, predicted)], dtype=np.intp)
+        labels = np.where(fired != NO_RULE, self.target_labels[fired], predicted)
+        return labels, fired
+
+    def rule_id(self, index):
+        """Identifier of a rule index from match/apply, or None for NO_RULE"""
+        return None if index == NO_RULE else self.ids[index]
@@ -0,0 +1,597 @@
+"""
+Pure-NumPy inference runtime for the improved enhanced ensemble
+===============================================================
+
+export_ensemble() flattens the trained sklearn members into plain arrays
+(tree node tables, support vectors with pairwise dual coefficients, MLP
+weight matrices) and load_ensemble() evaluates them again without importing
+sklearn. The runtime members expose classes_, predict and predict_proba so
+they are drop-in replacements for the estimators in predictor.models.
+
+An artifact path ending in .npz is a single zip archive that is read into
+memory. Any other path is a directory with one .npy file per array that is
+memory-mapped read-only, so worker processes on one host share the pages
+through the OS page cache instead of each holding a private copy. Each export
+writes a new version directory and swaps path over to it atomically (see
+save_arrays), so re-exporting never changes arrays a worker has mapped.
+
+Usage (from backend-api/):
+    python models/numpy_runtime.py --model models/improved_enhanced_models.pkl \\
+        --output models/improved_enhanced_runtime --verify-dataset datasets/symtoms_df.csv
+"""
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+
+RUNTIME_FORMAT_VERSION = 1
+
+
+def _version_dirs(path):
+    """Version directories written for path by save_arrays (named <path>.v<hex>)"""
+    parent, name = os.path.split(os.path.abspath(path))
+    pattern = re.compile(re.escape(name) + r'\.v[0-9a-f]+$')
+    return [os.path.join(parent, entry) for entry in os.listdir(parent)
+            if pattern.match(entry) and os.path.isdir(os.path.join(parent, entry))]
+
+
+def save_arrays(path, arrays):
+    """Save named arrays as one .npz archive, or as a directory of .npy files otherwise
+
+    Nothing that a worker may have loaded is written to in place: running workers
+    memory-map the directory files, and rewriting them would change their arrays
+    under them (or fault with SIGBUS once a file shrinks). A directory export goes
+    into a new sibling <path>.v<hex>, and path is then swapped to it as a symlink
+    with one atomic rename. An archive is written next to path and renamed over it.
+    The previous version is kept for loads still reading it; older ones are removed
+    (workers that mapped them keep their pages until they unmap).
+    """
+    if path.endswith('.npz'):
+        tmp_path = f'{path}.tmp-{os.getpid()}'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        return
+
+    version_dir = f'{os.path.abspath(path)}.v{time.time_ns():x}'
+    os.makedirs(version_dir)
+    for name, value in arrays.items():
+        np.save(os.path.join(version_dir, name + '.npy'), value, allow_pickle=False)
+
+    previous = os.path.realpath(path) if os.path.exists(path) else None
+    if os.path.isdir(path) and not os.path.islink(path):
+        # Directory from before versioned exports: move it aside (its inodes stay as they are)
+        previous = f'{os.path.abspath(path)}.v{time.time_ns():x}'
+        os.rename(path, previous)
+    tmp_link = f'{path}.tmp-{os.getpid()}'
+    os.symlink(os.path.basename(version_dir), tmp_link)
+    os.replace(tmp_link, path)
+
+    for old_dir in _version_dirs(path):
+        if old_dir not in (version_dir, previous):
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def load_arrays(path):
+    """Load named arrays saved by save_arrays; directories are memory-mapped read-only"""
+    if os.path.isdir(path):
+        # Resolve the version symlink once, so a concurrent export can't mix two versions
+        path = os.path.realpath(path)
+        return {
+            # Plain ndarray views of the mapping avoid np.memmap overhead on every operation
+            filename[:-4]: np.load(os.path.join(path, filename), mmap_mode='r', allow_pickle=False).view(np.ndarray)
+            for filename in os.listdir(path) if filename.endswith('.npy')
+        }
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+class ArrayLabelEncoder:
+    """Minimal LabelEncoder replacement backed by the fitted classes_ array"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+        self._index = {label: i for i, label in enumerate(self.classes_.tolist())}
+
+    def transform(self, labels):
+        try:
+            return np.array([self._index[label] for label in labels], dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"y contains previously unseen labels: {e}")
+
+    def inverse_transform(self, ids):
+        return self.classes_[np.asarray(ids, dtype=np.intp)]
+
+
+def _flatten_trees(trees, normalize):
+    """Concatenate sklearn tree_ objects into one node table with self-looping leaves"""
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        n_nodes = tree.node_count
+        left = tree.children_left.astype(np.int32)
+        right = tree.children_right.astype(np.int32)
+        leaf = left == -1
+        node_ids = np.arange(n_nodes, dtype=np.int32)
+        left[leaf] = node_ids[leaf]
+        right[leaf] = node_ids[leaf]
+
+        value = tree.value[:, 0, :].astype(np.float64)
+        if normalize:
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer
+
+        features.append(np.where(leaf, 0, tree.feature).astype(np.int32))
+        thresholds.append(np.where(leaf, 0.0, tree.threshold))
+        lefts.append(left + offset)
+        rights.append(right + offset)
+        values.append(value)
+        roots.append(offset)
+        offset += n_nodes
+        max_depth = max(max_depth, int(tree.max_depth))
+
+    arrays = {
+        'feature': np.concatenate(features),
+        'threshold': np.concatenate(thresholds),
+        'left': np.concatenate(lefts),
+        'right': np.concatenate(rights),
+        'value': np.concatenate(values),
+        'roots': np.array(roots, dtype=np.int32),
+    }
+    return arrays, max_depth
+
+
+class _TreeTable:
+    """Vectorized evaluation of many trees at once over a flat node table"""
+
+    def __init__(self, arrays, max_depth):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.max_depth = max_depth
+
+    def leaves(self, X):
+        """Return an (n_samples, n_trees) array with the leaf node reached in each tree"""
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        # Leaves loop back onto themselves, so max_depth steps reach every leaf
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+
+class _RuntimeClassifier:
+    """Shared predict()/predict_proba() for runtime members"""
+
+    # Rows evaluated at once; bounds the (rows x trees) node index temporaries
+    chunk_rows = 256
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def predict_proba(self, X):
+        X = np.asarray(X)
+        if len(X) <= self.chunk_rows:
+            return self._predict_proba(X)
+        return np.concatenate([
+            self._predict_proba(X[start:start + self.chunk_rows])
+            for start in range(0, len(X), self.chunk_rows)
+        ])
+
+
+class RandomForestRuntime(_RuntimeClassifier):
+    kind = 'random_forest'
+
+    def __init__(self, arrays, params):
+        self.classes_ = arrays['classes']
+        self.trees = _TreeTable(arrays, params['max_depth'])
+
+    @staticmethod
+    def export(model):
+        arrays, max_depth = _flatten_trees([est.tree_ for est in model.estimators_], normalize=True)
+        arrays['classes'] = np.asarray(model.classes_)
+        return arrays, {'max_depth': max_depth}
+
+    def _predict_proba(self, X):
+        # Accumulate tree by tree in the same order as sklearn so ties resolve identically
+        leaves = self.trees.leaves(X)
+        value = self.trees.value
+        proba = np.zeros((len(X), value.shape[1]))
+        for t in range(leaves.shape[1]):
+            proba += value[leaves[:, t]]
+        proba /= leaves.shape[1]
+        return proba
+
+
+class GradientBoostingRuntime(_RuntimeClassifier):
+    kind = 'gradient_boosting'
+
+    def __init__(self, arrays, params):
+        self.classes_ = arrays['classes']
+        self.init_raw = arrays['init_raw']
+        self.learning_rate = params['learning_rate']
+        self.n_stages = params['n_stages']
+        self.trees = _TreeTable(arrays, params['max_depth'])
+
+    @staticmethod
+    def export(model):
+        estimators = model.estimators_
+        arrays, max_depth = _flatten_trees([est.tree_ for est in estimators.ravel()], normalize=False)
+        arrays['classes'] = np.asarray(model.classes_)
+        params = {
+            'max_depth': max_depth,
+            'learning_rate': float(model.learning_rate),
+            'n_stages': int(estimators.shape[0]),
+        }
+        # The init estimator's raw prediction is the same for every sample
+        x0 = np.zeros((1, model.n_features_in_))
+        if hasattr(model, '_raw_predict_init'):
+            arrays['init_raw'] = np.asarray(model._raw_predict_init(x0), dtype=np.float64)[0]
+        else:
+            runtime = GradientBoostingRuntime(dict(arrays, init_raw=np.zeros(estimators.shape[1])), params)
+            decision = np.asarray(model.decision_function(x0), dtype=np.float64).reshape(1, -1)
+            arrays['init_raw'] = (decision - runtime.raw_predict(x0))[0]
+        return arrays, params
+
+    def raw_predict(self, X):
+        # Stage by stage, like sklearn's predict_stages: raw += learning_rate * tree value
+        leaves = self.trees.leaves(X)
+        value = self.trees.value[:, 0]
+        n_classes = len(self.init_raw)
+        raw = np.tile(self.init_raw, (len(X), 1))
+        for stage in range(self.n_stages):
+            raw += self.learning_rate * value[leaves[:, stage * n_classes:(stage + 1) * n_classes]]
+        return raw
+
+    def _predict_proba(self, X):
+        raw = self.raw_predict(X)
+        if raw.shape[1] == 1:
+            positive = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        raw = raw - raw.max(axis=1, keepdims=True)
+        proba = np.exp(raw)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+
+def _libsvm_multiclass_probability(pairwise):
+    """Pairwise coupling from libsvm (Wu, Lin and Weng), vectorized over samples.
+
+    pairwise[n, i, j] is P(class i | class i or j). Each sample stops iterating on the
+    same criterion as libsvm's multiclass_probability, so results match per sample.
+    """
+    n_samples, k = pairwise.shape[:2]
+    if n_samples == 1:
+        return _libsvm_multiclass_probability_single(pairwise[0])[None, :]
+    # Q[t][t] = sum_{j != t} r[j][t]^2, Q[t][j] = -r[j][t] * r[t][j]
+    r_t = np.swapaxes(pairwise, 1, 2)
+    Q = -r_t * pairwise
+    diag = (pairwise ** 2).sum(axis=1) - np.einsum('nii->ni', pairwise) ** 2
+    idx = np.arange(k)
+    Q[:, idx, idx] = diag
+
+    p = np.full((n_samples, k), 1.0 / k)
+    active = np.arange(n_samples)
+    eps = 0.005 / k
+    for _ in range(max(100, k)):
+        Qa, pa = Q[active], p[active]
+        Qp = np.einsum('nij,nj->ni', Qa, pa)
+        pQp = (pa * Qp).sum(axis=1)
+        converged = np.abs(Qp - pQp[:, None]).max(axis=1) < eps
+        if converged.all():
+            break
+        keep = ~converged
+        active, Qa, pa, Qp, pQp = active[keep], Qa[keep], pa[keep], Qp[keep], pQp[keep]
+        for t in range(k):
+            Qtt = Qa[:, t, t]
+            diff = (-Qp[:, t] + pQp) / Qtt
+            pa[:, t] += diff
+            scale = 1.0 + diff
+            pQp = (pQp + diff * (diff * Qtt + 2 * Qp[:, t])) / scale / scale
+            Qp = (Qp + diff[:, None] * Qa[:, t, :]) / scale[:, None]
+            pa /= scale[:, None]
+        p[active] = pa
+    return p
+
+
+def _libsvm_multiclass_probability_single(r):
+    """Single-sample pairwise coupling: Python floats for the scalar steps, NumPy for the vectors"""
+    k = r.shape[0]
+    Q = -r.T * r
+    Q[np.diag_indices(k)] = (r ** 2).sum(axis=0) - np.diag(r) ** 2
+    Q_diag = np.diag(Q).tolist()
+    p = np.full(k, 1.0 / k)
+    eps = 0.005 / k
+    for _ in range(max(100, k)):
+        Qp = Q @ p
+        pQp = float(p @ Qp)
+        if np.abs(Qp - pQp).max() < eps:
+            break
+        for t in range(k):
+            Qp_t = float(Qp[t])
+            diff = (-Qp_t + pQp) / Q_diag[t]
+            p[t] += diff
+            scale = 1.0 + diff
+            pQp = (pQp + diff * (diff * Q_diag[t] + 2 * Qp_t)) / scale / scale
+            Qp += diff * Q[t]
+            Qp /= scale
+            p /= scale
+    return p
+
+
+class SVCRuntime(_RuntimeClassifier):
+    kind = 'svm'
+
+    def __init__(self, arrays, params):
+        self.classes_ = arrays['classes']
+        self.support_vectors = arrays['support_vectors']
+        self.support_norms = arrays['support_norms']
+        self.pair_coef = arrays['pair_coef']
+        self.intercept = arrays['intercept']
+        self.prob_a = arrays.get('prob_a')
+        self.prob_b = arrays.get('prob_b')
+        self.pairs = arrays['pairs']
+        self.gamma = params['gamma']
+
+    @staticmethod
+    def export(model):
+        if not getattr(model, 'probability', False):
+            raise ValueError("SVC must be trained with probability=True")
+        arrays, params = SVCRuntime.export_kernel(model)
+        arrays['prob_a'] = np.asarray(model.probA_, dtype=np.float64)
+        arrays['prob_b'] = np.asarray(model.probB_, dtype=np.float64)
+        return arrays, params
+
+    @staticmethod
+    def export_kernel(model):
+        """Support vectors, pairwise dual coefficients and intercepts of a fitted RBF SVC"""
+        if model.kernel != 'rbf':
+            raise ValueError(f"Unsupported SVC kernel for the NumPy runtime: {model.kernel}")
+        support_vectors = np.asarray(model.support_vectors_, dtype=np.float64)
+        dual_coef = np.asarray(model._dual_coef_, dtype=np.float64)
+        n_support = np.asarray(model.n_support_)
+        starts = np.concatenate([[0], np.cumsum(n_support)])
+        n_classes = len(n_support)
+
+        # Lay the one-vs-one dual coefficients out as one column per class pair:
+        # class i vectors use dual_coef[j - 1], class j vectors use dual_coef[i]
+        pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+        pair_coef = np.zeros((len(support_vectors), len(pairs)))
+        for p, (i, j) in enumerate(pairs):
+            si = slice(starts[i], starts[i + 1])
+            sj = slice(starts[j], starts[j + 1])
+            pair_coef[si, p] = dual_coef[j - 1, si]
+            pair_coef[sj, p] = dual_coef[i, sj]
+
+        arrays = {
+            'classes': np.asarray(model.classes_),
+            'support_vectors': support_vectors,
+            'support_norms': (support_vectors ** 2).sum(axis=1),
+            'pair_coef': pair_coef,
+            'intercept': np.asarray(model._intercept_, dtype=np.float64),
+            'pairs': np.array(pairs, dtype=np.int32).reshape(-1, 2),
+        }
+        return arrays, {'gamma': float(model._gamma)}
+
+    def decision_values(self, X):
+        """One-vs-one decision values, one column per class pair (libsvm order)"""
+        X = np.asarray(X, dtype=np.float64)
+        sq_dist = (X ** 2).sum(axis=1)[:, None] + self.support_norms[None, :] - 2.0 * X @ self.support_vectors.T
+        kernel = np.exp(-self.gamma * np.maximum(sq_dist, 0.0))
+        return kernel @ self.pair_coef + self.intercept
+
+    def _predict_proba(self, X):
+        decision = self.decision_values(X)
+        # libsvm sigmoid_predict, written to avoid overflow on either side
+        f_ApB = decision * self.prob_a + self.prob_b
+        positive = f_ApB >= 0
+        exp_term = np.exp(-np.abs(f_ApB))
+        pair_prob = np.where(positive, exp_term / (1.0 + exp_term), 1.0 / (1.0 + exp_term))
+        min_prob = 1e-7
+        pair_prob = np.clip(pair_prob, min_prob, 1 - min_prob)
+
+        n_classes = len(self.classes_)
+        pairwise = np.zeros((decision.shape[0], n_classes, n_classes))
+        i, j = self.pairs[:, 0], self.pairs[:, 1]
+        pairwise[:, i, j] = pair_prob
+        pairwise[:, j, i] = 1.0 - pair_prob
+        return _libsvm_multiclass_probability(pairwise)
+
+
+class SoftmaxSVCRuntime(SVCRuntime):
+    """svm_calibration.SoftmaxSVC: softmax over one-vs-rest decision values with a fitted temperature"""
+    kind = 'svm_softmax'
+
+    def __init__(self, arrays, params):
+        super().__init__(arrays, params)
+        self.temperature = params['temperature']
+        # Pair p votes for pairs[p, 0] on a non-negative decision value and pairs[p, 1] otherwise
+        n_classes = len(self.classes_)
+        self.first = np.zeros((len(self.pairs), n_classes))
+        self.second = np.zeros((len(self.pairs), n_classes))
+        self.first[np.arange(len(self.pairs)), self.pairs[:, 0]] = 1.0
+        self.second[np.arange(len(self.pairs)), self.pairs[:, 1]] = 1.0
+
+    @staticmethod
+    def export(model):
+        arrays, params = SVCRuntime.export_kernel(model.svc_)
+        params['temperature'] = float(model.temperature_)
+        return arrays, params
+
+    def ovr_decision_values(self, X):
+        """sklearn's one-vs-rest transform of the one-vs-one decision values: votes plus a tie-breaker"""
+        decision = self.decision_values(X)
+        positive = (decision >= 0).astype(np.float64)
+        votes = positive @ self.first + (1.0 - positive) @ self.second
+        confidence = decision @ (self.first - self.second)
+        return votes + confidence / (3 * (np.abs(confidence) + 1))
+
+    def _predict_proba(self, X):
+        scores = self.ovr_decision_values(X) / self.temperature
+        scores = scores - scores.max(axis=1, keepdims=True)
+        proba = np.exp(scores)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+
+class MLPRuntime(_RuntimeClassifier):
+    kind = 'neural_network'
+
+    ACTIVATIONS = {
+        'identity': lambda x: x,
+        'relu': lambda x: np.maximum(x, 0),
+        'tanh': np.tanh,
+        'logistic': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    }
+
+    def __init__(self, arrays, params):
+        self.classes_ = arrays['classes']
+        self.n_layers = params['n_layers']
+        self.coefs = [arrays[f'coef_{i}'] for i in range(self.n_layers)]
+        self.intercepts = [arrays[f'intercept_{i}'] for i in range(self.n_layers)]
+        self.activation = params['activation']
+        self.out_activation = params['out_activation']
+
+    @staticmethod
+    def export(model):
+        arrays = {'classes': np.asarray(model.classes_)}
+        for i, (coef, intercept) in enumerate(zip(model.coefs_, model.intercepts_)):
+            arrays[f'coef_{i}'] = np.asarray(coef, dtype=np.float64)
+            arrays[f'intercept_{i}'] = np.asarray(intercept, dtype=np.float64)
+        params = {
+            'n_layers': len(model.coefs_),
+            'activation': model.activation,
+            'out_activation': model.out_activation_,
+        }
+        return arrays, params
+
+    def _predict_proba(self, X):
+        activation = np.asarray(X, dtype=np.float64)
+        hidden = self.ACTIVATIONS[self.activation]
+        for i in range(self.n_layers):
+            activation = activation @ self.coefs[i] + self.intercepts[i]
+            if i < self.n_layers - 1:
+                activation = hidden(activation)
+
+        if self.out_activation == 'softmax':
+            activation = activation - activation.max(axis=1, keepdims=True)
+            proba = np.exp(activation)
+            return proba / proba.sum(axis=1, keepdims=True)
+        positive = self.ACTIVATIONS[self.out_activation](activation)[:, 0]
+        return np.column_stack([1.0 - positive, positive])
+
+
+# sklearn estimator class name -> runtime class
+RUNTIME_TYPES = {
+    'RandomForestClassifier': RandomForestRuntime,
+    'GradientBoostingClassifier': GradientBoostingRuntime,
+    'SVC': SVCRuntime,
+    'SoftmaxSVC': SoftmaxSVCRuntime,
+    'MLPClassifier': MLPRuntime,
+}
+RUNTIME_KINDS = {cls.kind: cls for cls in RUNTIME_TYPES.values()}
+
+
+def export_ensemble(models, label_encoder, feature_names, path, model_id=None):
+    """Flatten the trained sklearn ensemble into plain arrays saved at path (see save_arrays)"""
+    arrays = {
+        'label_classes': np.asarray(label_encoder.classes_),
+        'feature_names': np.asarray(feature_names),
+    }
+    members = []
+    for name, model in models.items():
+        runtime_type = RUNTIME_TYPES.get(type(model).__name__)
+        if runtime_type is None:
+            raise ValueError(f"No NumPy runtime for model {name} ({type(model).__name__})")
+        member_arrays, params = runtime_type.export(model)
+        for key, value in member_arrays.items():
+            arrays[f'{name}.{key}'] = value
+        members.append({'name': name, 'kind': runtime_type.kind, 'params': params})
+
+    meta = {'format_version': RUNTIME_FORMAT_VERSION, 'members': members, 'model_id': model_id}
+    arrays['meta'] = np.array(json.dumps(meta))
+    save_arrays(path, arrays)
+    return path
+
+
+def load_ensemble(path):
+    """Load an exported ensemble; returns (models, label_encoder, feature_names, model_id)"""
+    arrays = load_arrays(path)
+    meta = json.loads(str(arrays['meta']))
+    if meta.get('format_version') != RUNTIME_FORMAT_VERSION:
+        raise ValueError(f"Unsupported runtime format version: {meta.get('format_version')}")
+
+    models = {}
+    for member in meta['members']:
+        prefix = member['name'] + '.'
+        member_arrays = {key[len(prefix):]: value for key, value in arrays.items() if key.startswith(prefix)}
+        models[member['name']] = RUNTIME_KINDS[member['kind']](member_arrays, member['params'])
+
+    label_encoder = ArrayLabelEncoder(arrays['label_classes'])
+    feature_names = arrays['feature_names'].tolist()
+    return models, label_encoder, feature_names, meta.get('model_id')
+
+
+def compare_predictions(reference_models, runtime_models, X):
+    """Per member: (label agreement, max absolute probability difference) on X"""
+    report = {}
+    for name, model in reference_models.items():
+        expected = model.predict_proba(X)
+        actual = runtime_models[name].predict_proba(X)
+        expected_labels = model.classes_[expected.argmax(axis=1)]
+        actual_labels = runtime_models[name].predict(X)
+        report[name] = (float(np.mean(expected_labels == actual_labels)), float(np.abs(expected - actual).max()))
+    return report
+
+
+def main():
+    """Export a pickled ensemble and check it against the sklearn originals"""
+    import argparse
+    import os
+    import pickle
+
+    parser = argparse.ArgumentParser(description='Export the sklearn ensemble to the NumPy runtime format')
+    parser.add_argument('--model', default='models/improved_enhanced_models.pkl')
+    parser.add_argument('--output', default='models/improved_enhanced_runtime',
+                        help='directory of memory-mappable .npy files, or a single .npz archive')
+    parser.add_argument('--verify-dataset', default='datasets/symtoms_df.csv',
+                        help='symptoms CSV whose rows are used to verify the export')
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        data = pickle.load(f)
+
+    from improved_enhanced_model import artifact_version
+    model_id = data.get('model_id') or artifact_version(args.model)
+    export_ensemble(data['models'], data['label_encoder'], data['feature_names'], args.output, model_id=model_id)
+    print(f"✅ NumPy runtime exported to {args.output}")
+
+    if args.verify_dataset and os.path.exists(args.verify_dataset):
+        import pandas as pd
+        from feature_encoder import SymptomFeatureEncoder
+
+        df = pd.read_csv(args.verify_dataset)
+        symptom_cols = [col for col in df.columns if col.startswith('Symptom_')]
+        symptom_lists = [
+            [s.strip() for s in row if pd.notna(s) and s.strip()]
+            for row in df[symptom_cols].itertuples(index=False)
+        ]
+        X = SymptomFeatureEncoder(data['feature_names']).encode_batch(symptom_lists)
+        models, _, _, _ = load_ensemble(args.output)
+
+        print(f"Verifying on {len(X)} rows of {args.verify_dataset}:")
+        for name, (agreement, max_diff) in compare_predictions(data['models'], models, X).items():
+            print(f"   {name}: label agreement {agreement:.4f}, max |proba diff| {max_diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()
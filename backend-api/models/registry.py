@@ -0,0 +1,70 @@
+"""
+Integer IDs for every disease and symptom
+=========================================
+
+The datasets and the label encoder spell some diseases differently
+('Diabetes ' with a trailing space in one file, 'Diabetes' in another, double
+spaces inside '(vertigo) Paroymsal  Positional Vertigo'). The registry gives
+each disease and symptom one dense integer ID and one normalized name, so
+features, rules, the answer table, the prediction cache and the disease
+information lookups all work on integers. Names only appear again when a
+response is serialized.
+
+- symptom IDs are positions in SYMPTOM_VOCABULARY (the feature columns, with
+  the duplicate 'fluid_overload' collapsed)
+- disease IDs start with the label encoder's classes in label order, so an
+  encoded model label is already the disease ID; diseases that only appear in
+  the datasets follow
+"""
+from feature_encoder import SYMPTOM_VOCABULARY
+
+
+def normalize_name(name):
+    """Name with surrounding whitespace stripped and inner runs of whitespace collapsed to one space"""
+    return ' '.join(str(name).split())
+
+
+class Registry:
+    """Dense disease and symptom IDs with their normalized names"""
+
+    def __init__(self, classes, disease_names=()):
+        self.symptoms = list(SYMPTOM_VOCABULARY)
+        self.symptom_ids = {name: i for i, name in enumerate(self.symptoms)}
+
+        self.diseases = []
+        self.disease_ids = {}
+        for i, name in enumerate(classes):
+            normalized = normalize_name(name)
+            if normalized in self.disease_ids:
+                raise ValueError(f"Model classes {self.diseases[self.disease_ids[normalized]]!r} and {name!r} "
+                                 f"normalize to the same disease")
+            self.disease_ids[normalized] = i
+            self.diseases.append(normalized)
+        self.n_classes = len(self.diseases)
+        for name in disease_names:
+            normalized = normalize_name(name)
+            if normalized and normalized not in self.disease_ids:
+                self.disease_ids[normalized] = len(self.diseases)
+                self.diseases.append(normalized)
+        # Case-insensitive fallback for names typed by clients
+        self._folded_ids = {}
+        for name, disease_id in self.disease_ids.items():
+            self._folded_ids.setdefault(name.casefold(), disease_id)
+
+    def disease_id(self, name):
+        """ID of a disease name in any spacing or case, or None"""
+        normalized = normalize_name(name)
+        disease_id = self.disease_ids.get(normalized)
+        if disease_id is None:
+            disease_id = self._folded_ids.get(normalized.casefold())
+        return disease_id
+
+    def symptom_id(self, name):
+        """ID of a canonical symptom name, or None"""
+        return self.symptom_ids.get(name)
+
+    def disease_name(self, disease_id):
+        return self.diseases[disease_id]
+
+    def symptom_names(self, symptom_ids):
+        return [self.symptoms[i] for i in symptom_ids]
@@ -0,0 +1,98 @@
+"""
+Softmax-calibrated SVM for the ensemble's 'svm' member
+======================================================
+
+SVC(probability=True) fits five extra cross-validation models for Platt
+scaling and couples the pairwise probabilities iteratively on every
+predict_proba call. SoftmaxSVC trains a plain SVC instead and turns its
+one-vs-rest decision values into probabilities with a softmax whose
+temperature is fitted once on a held-out split, then refits on all rows.
+The temperature is stored on the estimator, so it travels with the pickle
+and with the NumPy runtime export.
+"""
+import numpy as np
+from scipy.optimize import minimize_scalar
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+
+
+def pair_indicators(n_classes):
+    """(first, second) matrices mapping each one-vs-one pair in libsvm order to its two classes"""
+    pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+    first = np.zeros((len(pairs), n_classes))
+    second = np.zeros((len(pairs), n_classes))
+    for p, (i, j) in enumerate(pairs):
+        first[p, i] = 1.0
+        second[p, j] = 1.0
+    return first, second
+
+
+def ovr_decision_values(ovo, first, second):
+    """sklearn's one-vs-rest transform of one-vs-one decision values (votes plus a bounded
+    tie-breaker), as two matrix products instead of a Python loop over class pairs"""
+    positive = (ovo >= 0).astype(np.float64)
+    votes = positive @ first + (1.0 - positive) @ second
+    confidence = ovo @ (first - second)
+    return votes + confidence / (3 * (np.abs(confidence) + 1))
+
+
+def softmax(scores, temperature):
+    scores = scores / temperature
+    scores = scores - scores.max(axis=1, keepdims=True)
+    proba = np.exp(scores)
+    return proba / proba.sum(axis=1, keepdims=True)
+
+
+def fit_temperature(scores, y_index):
+    """Temperature minimizing the negative log-likelihood of softmax(scores / T) on (scores, y_index)"""
+    rows = np.arange(len(y_index))
+
+    def nll(log_temperature):
+        proba = softmax(scores, np.exp(log_temperature))
+        return -np.log(np.maximum(proba[rows, y_index], 1e-300)).mean()
+
+    result = minimize_scalar(nll, bounds=(np.log(1e-3), np.log(1e3)), method='bounded')
+    return float(np.exp(result.x))
+
+
+class SoftmaxSVC(ClassifierMixin, BaseEstimator):
+    """RBF SVC with temperature-scaled softmax probabilities over its one-vs-rest decision values"""
+
+    def __init__(self, C=1.0, kernel='rbf', gamma='scale', holdout=0.2, random_state=None):
+        self.C = C
+        self.kernel = kernel
+        self.gamma = gamma
+        self.holdout = holdout
+        self.random_state = random_state
+
+    def _svc(self):
+        return SVC(C=self.C, kernel=self.kernel, gamma=self.gamma, decision_function_shape='ovo',
+                   random_state=self.random_state)
+
+    def fit(self, X, y):
+        if len(np.unique(y)) < 3:
+            raise ValueError("SoftmaxSVC needs at least three classes for one-vs-rest decision values")
+        X_fit, X_cal, y_fit, y_cal = train_test_split(
+            X, y, test_size=self.holdout, random_state=self.random_state, stratify=y
+        )
+        calibration_svc = self._svc().fit(X_fit, y_fit)
+        first, second = pair_indicators(len(calibration_svc.classes_))
+        scores = ovr_decision_values(calibration_svc.decision_function(X_cal), first, second)
+        self.temperature_ = fit_temperature(scores, np.searchsorted(calibration_svc.classes_, y_cal))
+
+        self.svc_ = self._svc().fit(X, y)
+        self.classes_ = self.svc_.classes_
+        self.n_features_in_ = self.svc_.n_features_in_
+        self.pair_first_, self.pair_second_ = pair_indicators(len(self.classes_))
+        return self
+
+    def decision_function(self, X):
+        """One-vs-rest decision values, identical to SVC(decision_function_shape='ovr')"""
+        return ovr_decision_values(self.svc_.decision_function(X), self.pair_first_, self.pair_second_)
+
+    def predict_proba(self, X):
+        return softmax(self.decision_function(X), self.temperature_)
+
+    def predict(self, X):
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
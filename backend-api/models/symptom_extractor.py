@@ -0,0 +1,118 @@
+"""
+Free-text symptom extraction with an Aho-Corasick automaton
+===========================================================
+
+Finds every symptom name and synonym mentioned in a sentence such as
+"I've had a headache and high fever since Monday". The phrases come from a
+SymptomIndex (SYMPTOM_VOCABULARY plus symptom_synonyms.json) and are compiled
+once into an Aho-Corasick automaton over words rather than characters:
+
+- a phrase only matches whole words, so "rash" does not fire inside "brash"
+- one left-to-right pass over the input's words reports every phrase ending
+  at each word, following failure links instead of restarting, so the cost
+  is linear in the input length whatever the number of phrases
+
+Overlapping matches are resolved leftmost-longest, so "mild fever" gives
+mild_fever rather than also high_fever (whose synonym is "fever").
+Negations ("no fever") are not detected.
+"""
+import re
+
+from symptom_index import DEFAULT_SYNONYMS_PATH, SymptomIndex
+
+# Words are runs of letters and digits; everything else separates them
+_WORDS = re.compile(r'[^\W_]+')
+
+
+def phrase_words(text):
+    """Lowercase words of text, ignoring punctuation, underscores and spacing"""
+    return _WORDS.findall(str(text).lower())
+
+
+class SymptomExtractor:
+    """Word-level Aho-Corasick automaton over every symptom name and synonym"""
+
+    def __init__(self, index):
+        self.index = index
+        # State 0 is the root; goto[s] maps the next word to a state, fail[s] is the state for
+        # the longest proper suffix that is also a prefix, and output[s] is (symptom ID, words)
+        # of the phrase ending at s or None. next_output[s] is the nearest state down the
+        # failure chain with an output, so reporting costs one step per actual match.
+        self.goto, self.fail, self.output, self.next_output = [{}], [0], [None], [0]
+        for key, symptom_id in zip(index.keys, index.key_ids):
+            words = phrase_words(key)
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                child = self.goto[state].get(word)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[state][word] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    self.next_output.append(0)
+                state = child
+            # Keys come names first, so a synonym spelled like a name never replaces it
+            if self.output[state] is None:
+                self.output[state] = (symptom_id, len(words))
+
+        # Breadth-first, so every failure target is finished before it is used
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for word, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(word, 0)
+                self.fail[child] = target
+                self.next_output[child] = target if self.output[target] is not None else self.next_output[target]
+                queue.append(child)
+
+    @classmethod
+    def load(cls, synonyms_path=DEFAULT_SYNONYMS_PATH):
+        return cls(SymptomIndex.load(synonyms_path))
+
+    def __len__(self):
+        return len(self.goto)
+
+    def scan(self, words):
+        """Every (start word, end word, symptom ID) phrase occurrence in a list of words"""
+        goto, fail, output, next_output = self.goto, self.fail, self.output, self.next_output
+        matches = []
+        state = 0
+        for end, word in enumerate(words, 1):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            hit = state if output[state] is not None else next_output[state]
+            while hit:
+                symptom_id, length = output[hit]
+                matches.append((end - length, end, symptom_id))
+                hit = next_output[hit]
+        return matches
+
+    def find(self, text):
+        """Non-overlapping symptom mentions in text, leftmost-longest, as dicts with character spans"""
+        spans = [(m.start(), m.end()) for m in _WORDS.finditer(text)]
+        words = [text[start:end].lower() for start, end in spans]
+        mentions = []
+        covered = 0
+        for start, end, symptom_id in sorted(self.scan(words), key=lambda m: (m[0], m[0] - m[1])):
+            if start < covered:
+                continue
+            covered = end
+            begin, finish = spans[start][0], spans[end - 1][1]
+            mentions.append({
+                'id': symptom_id,
+                'symptom': self.index.vocabulary[symptom_id],
+                'matched': text[begin:finish],
+                'start': begin,
+                'end': finish,
+            })
+        return mentions
+
+    def extract(self, text):
+        """Symptom IDs mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(mention['id'] for mention in self.find(text)))
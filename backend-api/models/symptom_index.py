@@ -0,0 +1,237 @@
+"""
+Symptom name lookup: normalization, autocomplete and typo tolerance
+===================================================================
+
+Maps free-form symptom strings ("Skin Rash", "high-fever", "throwing up",
+"hight fevr") onto SYMPTOM_VOCABULARY. Three in-memory structures are built
+once from the vocabulary and the synonyms table (symptom_synonyms.json):
+
+- a dict from normalized text (lowercase, with spaces, underscores and hyphens
+  collapsed) to the symptom ID, covering exact names and synonyms
+- a prefix trie over every word start of every name and synonym, so "rash"
+  and "skin r" both complete to skin_rash; each node keeps its matches
+  pre-ranked, so a query walks the prefix and reads off the first entries
+- an inverted trigram index for misspellings: it collects candidates by
+  Dice similarity, and lookup reports the best candidate within a few edits
+  (transpositions count as one) as a 'fuzzy' match
+
+resolve, which feeds predictions, only accepts exact names and synonyms: a
+misspelling within a few edits can still be another symptom ("ear pain" is
+two edits from "eye pain"), so fuzzy matches are offered as suggestions and
+never silently substituted.
+"""
+import json
+import os
+import re
+from collections import Counter
+
+from feature_encoder import SYMPTOM_VOCABULARY
+
+DEFAULT_SYNONYMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'symptom_synonyms.json')
+
+# Minimum trigram Dice similarity for a key to be considered a misspelling candidate
+SIMILARITY_THRESHOLD = 0.3
+
+# Misspelling candidates checked for edit distance when resolving
+RESOLVE_CANDIDATES = 10
+
+_SEPARATORS = re.compile(r'[\s_\-]+')
+
+
+def normalize_text(text):
+    """Lowercase text with runs of spaces, underscores and hyphens collapsed to one space"""
+    return _SEPARATORS.sub(' ', str(text).lower()).strip()
+
+
+def max_edits(key):
+    """Edits tolerated when resolving a misspelling of key's length (one per four characters, up to three)"""
+    return min(len(key) // 4, 3)
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance between a and b, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def trigrams(key):
+    """Character trigrams of a normalized key, padded so word starts and ends count"""
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymptomIndex:
+    """Exact, prefix and trigram lookups from free text to SYMPTOM_VOCABULARY IDs"""
+
+    def __init__(self, vocabulary=SYMPTOM_VOCABULARY, synonyms=None):
+        self.vocabulary = list(vocabulary)
+        self.labels = [normalize_text(name) for name in self.vocabulary]
+        symptom_ids = {name: i for i, name in enumerate(self.vocabulary)}
+
+        # Canonical names first, so they rank ahead of synonyms and can't be shadowed by one
+        entries = [(label, i, False) for i, label in enumerate(self.labels)]
+        for name, terms in (synonyms or {}).items():
+            if name not in symptom_ids:
+                raise ValueError(f"Synonyms given for unknown symptom: {name}")
+            entries += [(normalize_text(term), symptom_ids[name], True) for term in terms]
+
+        self.exact = {}
+        self.keys, self.key_ids, self.key_is_synonym = [], [], []
+        for key, symptom_id, is_synonym in entries:
+            if not key:
+                continue
+            existing = self.exact.get(key)
+            if existing is not None:
+                if existing != symptom_id:
+                    raise ValueError(f"'{key}' names both {self.vocabulary[existing]} and {self.vocabulary[symptom_id]}")
+                continue
+            self.exact[key] = symptom_id
+            self.keys.append(key)
+            self.key_ids.append(symptom_id)
+            self.key_is_synonym.append(is_synonym)
+
+        # Trie nodes are dicts of child characters; node[None] lists the matching keys,
+        # best first: whole-key prefix before word prefix, names before synonyms, shorter first
+        self.trie = {}
+        for k, key in enumerate(self.keys):
+            word_starts = [0] + [m.end() for m in re.finditer(' ', key)]
+            for start in word_starts:
+                rank = (start > 0, self.key_is_synonym[k], len(key), key)
+                node = self.trie
+                for ch in key[start:]:
+                    node = node.setdefault(ch, {})
+                    node.setdefault(None, []).append((rank, k))
+        self._sort_trie(self.trie)
+
+        self.key_trigram_counts = []
+        self.trigram_index = {}
+        for k, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.key_trigram_counts.append(len(grams))
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(k)
+
+    @classmethod
+    def load(cls, synonyms_path=DEFAULT_SYNONYMS_PATH):
+        synonyms = {}
+        if synonyms_path and os.path.exists(synonyms_path):
+            with open(synonyms_path) as f:
+                synonyms = json.load(f)['synonyms']
+        return cls(SYMPTOM_VOCABULARY, synonyms)
+
+    def _sort_trie(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for ch, child in node.items():
+                if ch is None:
+                    # One entry per key (a key can reach a node through two word starts)
+                    seen = set()
+                    node[None] = [k for _, k in sorted(child) if not (k in seen or seen.add(k))]
+                else:
+                    stack.append(child)
+
+    def similar(self, key, threshold):
+        """(score, key index) of keys sharing trigrams with key, best first, score >= threshold"""
+        grams = trigrams(key)
+        shared = Counter(k for gram in grams for k in self.trigram_index.get(gram, ()))
+        scored = [
+            (2 * count / (len(grams) + self.key_trigram_counts[k]), k)
+            for k, count in shared.items()
+        ]
+        return sorted(((score, k) for score, k in scored if score >= threshold), key=lambda item: (-item[0], item[1]))
+
+    def lookup(self, text):
+        """Resolve one free-text symptom to (symptom ID, 'exact' | 'fuzzy', score), or None"""
+        key = normalize_text(text)
+        if not key:
+            return None
+        symptom_id = self.exact.get(key)
+        if symptom_id is not None:
+            return symptom_id, 'exact', 1.0
+        # Each candidate only has to beat the closest one so far
+        limit = max_edits(key)
+        best = None
+        for score, k in self.similar(key, SIMILARITY_THRESHOLD)[:RESOLVE_CANDIDATES]:
+            distance = edit_distance(key, self.keys[k], limit)
+            if distance <= limit:
+                best = (score, k)
+                limit = distance - 1
+                if limit < 1:
+                    break
+        if best is None:
+            return None
+        score, k = best
+        return self.key_ids[k], 'fuzzy', score
+
+    def normalize(self, symptoms):
+        """(canonical symptom names, unrecognized inputs) for a list of free-text symptoms"""
+        ids, unknown = self.resolve(symptoms)
+        return [self.vocabulary[i] for i in ids], unknown
+
+    def resolve(self, symptoms):
+        """(unique symptom IDs in input order, unrecognized inputs) for a list of free-text symptoms
+
+        Only exact names and synonyms resolve; misspellings are left unrecognized for
+        suggest to offer candidates.
+        """
+        ids, unknown = {}, []
+        for text in symptoms:
+            symptom_id = self.exact.get(normalize_text(text))
+            if symptom_id is None:
+                unknown.append(text)
+            else:
+                ids.setdefault(symptom_id)
+        return list(ids), unknown
+
+    def suggest(self, text, limit=10):
+        """Up to limit symptoms completing text, or the closest spellings when none does"""
+        key = normalize_text(text)
+        if not key or limit <= 0:
+            return []
+        suggestions = []
+        seen = set()
+
+        def add(k, match, score):
+            symptom_id = self.key_ids[k]
+            if symptom_id in seen:
+                return
+            seen.add(symptom_id)
+            suggestions.append({
+                'id': symptom_id,
+                'symptom': self.vocabulary[symptom_id],
+                'label': self.labels[symptom_id],
+                'matched': self.keys[k],
+                'match': match,
+                'score': round(score, 3),
+            })
+
+        node = self.trie
+        for ch in key:
+            node = node.get(ch)
+            if node is None:
+                break
+        if node is not None:
+            for k in node[None][:limit * 4]:
+                add(k, 'exact' if self.keys[k] == key else 'prefix', 1.0)
+                if len(suggestions) >= limit:
+                    break
+            return suggestions
+
+        # Nothing starts with the text: offer the closest spellings instead
+        for score, k in self.similar(key, SIMILARITY_THRESHOLD):
+            add(k, 'fuzzy', score)
+            if len(suggestions) >= limit:
+                break
+        return suggestions
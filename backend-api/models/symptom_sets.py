@@ -0,0 +1,89 @@
+"""
+Symptom <-> disease bitset index
+================================
+
+Inverted index over the symptoms listed for each disease in symtoms_df.csv,
+built once with the disease catalog:
+
+- disease ID -> symptom set, one row of a packed bit matrix (uint8, one bit
+  per symptom ID)
+- symptom ID -> the IDs of the diseases listing it, as sorted integer arrays
+
+Overlap with a query is one AND of the query's bit row against the whole
+matrix followed by a byte popcount table lookup and a row sum, so ranking all
+diseases by shared symptoms (or by Jaccard similarity to another disease) is
+a handful of NumPy operations whatever the number of diseases.
+
+Symptom IDs are positions in SYMPTOM_VOCABULARY, like everywhere else; a
+dataset symptom outside the vocabulary gets an ID after the vocabulary's.
+"""
+import numpy as np
+
+# Number of set bits in every byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(bits):
+    """Set bits in each row of a packed uint8 bit matrix"""
+    return _POPCOUNT[bits].sum(axis=-1, dtype=np.int64)
+
+
+class SymptomSetIndex:
+    """Disease symptom sets as packed bitsets, with the symptom -> diseases postings"""
+
+    def __init__(self, disease_symptoms, vocabulary):
+        self.symptoms = list(vocabulary)
+        self.symptom_ids = {name: i for i, name in enumerate(self.symptoms)}
+        for names in disease_symptoms:
+            for name in names:
+                if name not in self.symptom_ids:
+                    self.symptom_ids[name] = len(self.symptoms)
+                    self.symptoms.append(name)
+
+        members = np.zeros((len(disease_symptoms), len(self.symptoms)), dtype=bool)
+        for disease_id, names in enumerate(disease_symptoms):
+            members[disease_id, [self.symptom_ids[name] for name in names]] = True
+        self.bits = np.packbits(members, axis=1)
+        self.bits.setflags(write=False)
+        self.counts = popcount_rows(self.bits)
+        self.counts.setflags(write=False)
+        self.symptom_diseases = tuple(np.flatnonzero(column) for column in members.T)
+
+    def __len__(self):
+        return len(self.bits)
+
+    def query_bits(self, symptom_ids):
+        """Packed bit row of a set of symptom IDs"""
+        row = np.zeros(len(self.symptoms), dtype=bool)
+        row[list(symptom_ids)] = True
+        return np.packbits(row)
+
+    def diseases_with(self, symptom_id):
+        """IDs of the diseases listing a symptom, ascending"""
+        return self.symptom_diseases[symptom_id]
+
+    def rank_by_symptoms(self, symptom_ids, limit=10):
+        """Diseases sharing symptoms with the query, as (disease ID, matched, jaccard) best first
+
+        Ranked by the number of shared symptoms, then by Jaccard similarity (shared
+        over the union), so a disease listing few extra symptoms wins ties.
+        """
+        symptom_ids = set(symptom_ids)
+        if not symptom_ids or not len(self):
+            return []
+        matched = popcount_rows(self.bits & self.query_bits(symptom_ids))
+        jaccard = matched / (self.counts + len(symptom_ids) - matched)
+        candidates = np.flatnonzero(matched)
+        order = np.lexsort((candidates, -jaccard[candidates], -matched[candidates]))[:limit]
+        return [(int(d), int(matched[d]), float(jaccard[d])) for d in candidates[order]]
+
+    def similar_diseases(self, disease_id, limit=10):
+        """Other diseases by Jaccard similarity of their symptom sets, as (disease ID, shared, jaccard)"""
+        if not self.counts[disease_id]:
+            return []
+        shared = popcount_rows(self.bits & self.bits[disease_id])
+        jaccard = shared / np.maximum(self.counts + self.counts[disease_id] - shared, 1)
+        candidates = np.flatnonzero(shared)
+        candidates = candidates[candidates != disease_id]
+        order = np.lexsort((candidates, -jaccard[candidates]))[:limit]
+        return [(int(d), int(shared[d]), float(jaccard[d])) for d in candidates[order]]
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed answer table
+=================================
+
+Builds a table of every one and two symptom combination into a temporary
+directory and checks that lookup_ids answers exactly like predict_labels,
+whatever order the IDs come in, and misses anything it did not enumerate.
+
+Run from backend-api/ (needs a trained model):
+    python -m pytest test_answer_table.py
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from answer_table import AnswerTable, build_answer_table, pack_symptom_ids
+from feature_encoder import SYMPTOM_VOCABULARY
+from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
+from medical_rules import NO_RULE
+
+MODEL_PATH = os.path.join(BASE_DIR, 'models', 'improved_enhanced_models.pkl')
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    predictor = ImprovedEnhancedMedicalPredictor()
+    predictor.load_models(MODEL_PATH)
+    predictor.load_rules()
+    return predictor
+
+
+@pytest.fixture(scope='module')
+def table(predictor, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('answer_table') / 'table')
+    count = build_answer_table(predictor, 2, path)
+    n = len(SYMPTOM_VOCABULARY)
+    assert count == n + n * (n - 1) // 2
+    return AnswerTable.load(path)
+
+
+def test_packed_keys_ignore_order_and_are_distinct():
+    assert pack_symptom_ids([5, 1, 3]) == pack_symptom_ids([1, 3, 5])
+    assert pack_symptom_ids([0]) != pack_symptom_ids([0, 1])
+    assert pack_symptom_ids([1, 2]) != pack_symptom_ids([2, 3])
+
+
+def test_lookup_matches_predict_labels(predictor, table):
+    assert table.model_version == predictor.model_version
+    assert table.rules_version == predictor.rules.version
+    assert table.symptoms == SYMPTOM_VOCABULARY
+
+    rng = np.random.default_rng(0)
+    n = len(SYMPTOM_VOCABULARY)
+    id_lists = [[i] for i in range(n)] + [sorted(rng.choice(n, 2, replace=False).tolist()) for _ in range(500)]
+    labels, predictions, probabilities, fired = predictor.predict_labels(id_lists)
+    for i, ids in enumerate(id_lists):
+        label, members, confidences, rule = table.lookup_ids(ids[::-1])
+        assert label == labels[i], ids
+        assert members == predictions[i], ids
+        # The table was computed in larger batches, which can move the last bit of an MLP probability
+        assert confidences == pytest.approx({name: max(p) for name, p in probabilities[i].items()}, abs=1e-12), ids
+        assert rule == fired[i], ids
+
+
+def test_rules_are_stored_with_the_answers(predictor, table):
+    fired = [rule for rule in table.rule if rule != NO_RULE]
+    assert fired, "no medical rule fired for any enumerated combination"
+    assert all(0 <= rule < len(table.rule_ids) for rule in fired)
+
+
+def test_lookup_misses_what_was_not_enumerated(table):
+    assert table.lookup_ids([]) is None
+    assert table.lookup_ids([0, 1, 2]) is None
+    # A key beyond every enumerated one
+    assert table.lookup_ids([len(SYMPTOM_VOCABULARY)]) is None
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test the ASGI entry point
+=========================
+
+Drives asgi.app directly with asyncio and in-memory receive/send callables:
+lifespan startup, /predict on the inference executor, lookups on the event
+loop, the 503 once MAX_PENDING_INFERENCES predictions are in flight, request
+and response translation (headers, query strings, a body split across
+several messages), refused WebSocket connections, and a worker without a
+model that must never try to load one from a lookup.
+
+Run from backend-api/ (needs the datasets and a trained model):
+    python test_asgi.py
+    python -m pytest test_asgi.py
+"""
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import threading
+
+os.environ.setdefault('WARMUP_CASES', '5')
+os.environ.setdefault('RELOAD_INTERVAL', '0')
+
+import asgi
+import main
+
+
+async def _start_lifespan():
+    """Run lifespan startup like a server would; returns the messages the app sent"""
+    startup = asyncio.Event()
+    sent = []
+
+    async def receive():
+        if not startup.is_set():
+            startup.set()
+            return {'type': 'lifespan.startup'}
+        await asyncio.Event().wait()  # the server stays up; the task is cancelled below
+
+    async def send(message):
+        sent.append(message)
+
+    task = asyncio.ensure_future(asgi.app({'type': 'lifespan'}, receive, send))
+    while not sent:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    return sent
+
+
+def start_lifespan():
+    return asyncio.run(_start_lifespan())
+
+
+def http_request(method, path, chunks=(b'',), query=b'', headers=None):
+    """Send one request to asgi.app; returns (status, headers dict, body, thread that ran the Flask app)"""
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': query,
+        'headers': headers or [(b'content-type', b'application/json'),
+                               (b'content-length', str(sum(map(len, chunks))).encode())],
+        'server': ('127.0.0.1', 5000), 'client': ('127.0.0.1', 40000),
+    }
+    response = {'body': b''}
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = dict(message['headers'])
+        else:
+            response['body'] += message.get('body', b'')
+
+    # Record the thread the Flask app runs on for this request only
+    threads = []
+    call_flask = asgi.call_flask
+
+    def recording_call_flask(environ):
+        threads.append(threading.current_thread())
+        return call_flask(environ)
+
+    asgi.call_flask = recording_call_flask
+    try:
+        asyncio.run(asgi.app(scope, receive, send))
+    finally:
+        asgi.call_flask = call_flask
+    return response['status'], response['headers'], response['body'], (threads[0] if threads else None)
+
+
+def json_body(payload):
+    return json.dumps(payload).encode()
+
+
+def test_lifespan_startup():
+    """Startup warms the models up and reports complete"""
+    sent = start_lifespan()
+    assert sent == [{'type': 'lifespan.startup.complete'}], sent
+    assert main.current_state().predictor is not None
+    assert main.current_state().catalog is not None
+
+
+def test_predict_runs_on_executor():
+    """/predict runs on an inference thread and answers like the Flask app"""
+    payload = {'symptoms': ['itching', 'skin_rash', 'nodal_skin_eruptions']}
+    status, headers, body, thread = http_request('POST', '/predict', [json_body(payload)])
+    assert status == 200, body
+    assert thread.name.startswith('inference'), thread.name
+    assert json.loads(body) == main.app.test_client().post('/predict', json=payload).get_json()
+
+
+def test_lookup_runs_on_event_loop():
+    """/check_disease is answered on the event loop thread, not the executor"""
+    status, _, body, thread = http_request('POST', '/check_disease', [json_body({'disease_name': 'Diabetes '})])
+    assert status == 200, body
+    assert thread is threading.current_thread()
+    assert json.loads(body)['disease_name'] == 'Diabetes'
+
+
+def test_overloaded_predict_gets_503():
+    """With no room for another inference /predict is refused at once; lookups still answer"""
+    limit = asgi.MAX_PENDING_INFERENCES
+    asgi.MAX_PENDING_INFERENCES = 0
+    try:
+        status, headers, body, thread = http_request('POST', '/predict', [json_body({'symptoms': ['cough']})])
+        lookup_status = http_request('POST', '/check_disease', [json_body({'disease_name': 'Malaria'})])[0]
+    finally:
+        asgi.MAX_PENDING_INFERENCES = limit
+    assert status == 503, body
+    assert headers[b'retry-after'] == b'1'
+    assert headers[b'content-type'] == b'application/json'
+    assert 'error' in json.loads(body)
+    assert thread is None
+    assert lookup_status == 200
+
+
+def test_request_translation():
+    """Bodies split across messages, query strings and headers reach Flask and come back unchanged"""
+    payload = json_body({'disease_names': ['Diabetes', 'Malaria', 'Not a disease']})
+    status, headers, body, _ = http_request('POST', '/check_disease/batch', [payload[:5], payload[5:20], payload[20:]])
+    expected = main.app.test_client().post('/check_disease/batch', data=payload, content_type='application/json')
+    assert status == 200, body
+    assert body == expected.get_data()
+    assert headers[b'content-type'] == b'application/json'
+    assert headers[b'content-length'] == str(len(body)).encode()
+    assert headers[b'access-control-allow-origin'] == b'*'
+
+    status, _, body, _ = http_request('GET', '/symptoms/suggest', query=b'q=skin%20r&limit=3', headers=[])
+    assert status == 200, body
+    assert body == main.app.test_client().get('/symptoms/suggest?q=skin%20r&limit=3').get_data()
+
+    form = b'disease_name=Malaria'
+    status, _, body, _ = http_request('POST', '/check_disease', [form], headers=[
+        (b'content-type', b'application/x-www-form-urlencoded'), (b'content-length', str(len(form)).encode())])
+    assert status == 200, body
+    assert json.loads(body)['disease_name'] == 'Malaria'
+
+    assert http_request('GET', '/not-a-route', headers=[])[0] == 404
+
+
+def test_websocket_refused():
+    """WebSocket connections are closed before they are accepted"""
+    sent = []
+
+    async def receive():
+        return {'type': 'websocket.connect'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app({'type': 'websocket', 'path': '/predict', 'headers': []}, receive, send))
+    assert [message['type'] for message in sent] == ['websocket.close']
+
+
+def test_lookups_without_a_model_never_load_one():
+    """A worker whose model fails to load serves lookups from the dataset catalog on the loop"""
+    loads = []
+    load_predictor, state = main.load_predictor, main._state
+    main.load_predictor = lambda *args, **kwargs: loads.append(threading.current_thread()) or None
+    main._state = main.ServingState(state.datasets)
+    try:
+        assert start_lifespan() == [{'type': 'lifespan.startup.complete'}]
+        assert len(loads) == 1
+        status, _, body, thread = http_request('POST', '/check_disease', [json_body({'disease_name': 'Malaria'})])
+        assert status == 200, body
+        assert thread is threading.current_thread()
+        assert len(loads) == 1, "a lookup tried to load the model"
+    finally:
+        main.load_predictor, main._state = load_predictor, state
+
+
+if __name__ == "__main__":
+    print("🧪 Testing the ASGI entry point...")
+    print("=" * 50)
+    tests = [value for name, value in list(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    print("=" * 50)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+        sys.exit(1)
+    print(f"🎉 All {len(tests)} ASGI tests passed")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test the dataset bundle
+=======================
+
+Round trip from CSV to bundle and back to the rows csv.DictReader gives and
+the DataFrames pd.read_csv gives, and the staleness check: untouched CSVs are
+not hashed, touched but unchanged ones stay fresh, edited ones make the
+bundle stale.
+
+Run from backend-api/ (the last test needs the datasets):
+    python -m pytest test_dataset_bundle.py
+"""
+import os
+import sys
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+import dataset_bundle
+from dataset_bundle import SERVING_DATASETS, DatasetBundle, open_bundle, read_table, write_bundle
+
+# Unnamed index column, blank and missing cells, numbers with gaps, quoted commas and line breaks
+TRICKY_CSV = (
+    ',Disease,Symptom_1,Symptom_2,Score,Ratio\n'
+    '0,Diabetes ,polyuria,,3,0.5\n'
+    '1,"Fungal, infection","itching\nrash",skin_rash,,1\n'
+    '\n'
+    '2,Malaria,chills\n'
+    '3,Unicode ü,"""quoted""",x,4,2.25\n'
+)
+
+
+def write_sources(directory):
+    sources = {'tricky.csv': os.path.join(directory, 'tricky.csv'), 'empty.csv': os.path.join(directory, 'empty.csv')}
+    with open(sources['tricky.csv'], 'w', encoding='utf-8', newline='') as f:
+        f.write(TRICKY_CSV)
+    with open(sources['empty.csv'], 'w', encoding='utf-8') as f:
+        f.write('Disease,Description\n')
+    return sources
+
+
+def test_rows_round_trip(tmp_path):
+    sources = write_sources(tmp_path)
+    path = str(tmp_path / 'test.bundle')
+    write_bundle(path, sources)
+    bundle = open_bundle(path, sources)
+    for name, source in sources.items():
+        assert bundle.rows(name) == read_table(source), name
+
+
+def test_dataframes_match_read_csv(tmp_path):
+    sources = write_sources(tmp_path)
+    path = str(tmp_path / 'test.bundle')
+    write_bundle(path, sources)
+    bundle = DatasetBundle.load(path)
+    for name, source in sources.items():
+        pd.testing.assert_frame_equal(bundle.dataframe(name), pd.read_csv(source), obj=name)
+
+
+def test_untouched_csvs_are_not_hashed(tmp_path, monkeypatch):
+    sources = write_sources(tmp_path)
+    path = str(tmp_path / 'test.bundle')
+    write_bundle(path, sources)
+    hashed = []
+    checksum = dataset_bundle.file_checksum
+    monkeypatch.setattr(dataset_bundle, 'file_checksum', lambda p: hashed.append(p) or checksum(p))
+
+    assert open_bundle(path, sources) is not None
+    assert hashed == []
+
+    # Same content with a new modification time (a copy or checkout): hashed once, still fresh
+    stat = os.stat(sources['tricky.csv'])
+    os.utime(sources['tricky.csv'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert open_bundle(path, sources) is not None
+    assert hashed == [sources['tricky.csv']]
+
+
+def test_edited_csv_makes_the_bundle_stale(tmp_path):
+    sources = write_sources(tmp_path)
+    path = str(tmp_path / 'test.bundle')
+    write_bundle(path, sources)
+    with open(sources['tricky.csv'], 'a', encoding='utf-8') as f:
+        f.write('4,Typhoid,chills,,,\n')
+    assert DatasetBundle.load(path).stale_tables(sources) == ['tricky.csv']
+    assert open_bundle(path, sources) is None
+    # Missing CSVs are not checked, so a bundle can ship without them
+    os.remove(sources['tricky.csv'])
+    assert open_bundle(path, sources) is not None
+
+
+def test_serving_datasets_match_read_csv(tmp_path):
+    sources = {name: os.path.join(BASE_DIR, 'datasets', name) for name in SERVING_DATASETS}
+    path = str(tmp_path / 'datasets.bundle')
+    write_bundle(path, sources)
+    bundle = open_bundle(path, sources)
+    for name, source in sources.items():
+        assert bundle.rows(name) == read_table(source), name
+        pd.testing.assert_frame_equal(bundle.dataframe(name), pd.read_csv(source), obj=name)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the medical override rules
+===============================
+
+The compiled bitmask matching (models/medical_rules.py) against a plain
+reading of the rules over symptom name sets, for the shipped
+medical_rules.json and for rules exercising every clause, plus the errors a
+malformed rules file raises.
+
+Run from backend-api/:
+    python -m pytest test_medical_rules.py
+"""
+import json
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from feature_encoder import SYMPTOM_VOCABULARY
+from medical_rules import DEFAULT_RULES_PATH, NO_RULE, MedicalRules, symptom_bitsets
+
+CLASSES = ['Diabetes ', 'Fungal infection', 'Hyperthyroidism', 'Malaria', 'Typhoid']
+
+# One rule per clause, plus an unanchored rule that only looks at the prediction
+CLAUSE_RULES = [
+    {'id': 'none_only', 'disease': 'Malaria', 'none': ['itching'], 'when_predicted': ['Typhoid']},
+    {'id': 'all_and_any', 'disease': 'Typhoid', 'all': ['chills', 'high_fever'], 'any': ['vomiting', 'headache']},
+    {'id': 'any_only', 'disease': 'Fungal infection', 'any': ['itching', 'skin_rash'], 'none': ['high_fever']},
+    {'id': 'all_predicted', 'disease': 'Diabetes ', 'all': ['polyuria'], 'when_predicted': ['Hyperthyroidism']},
+]
+
+
+def reference_match(rules, symptoms, predicted):
+    """Index of the first rule matching a set of symptom names and a predicted class name"""
+    for r, rule in enumerate(rules):
+        if (set(rule.get('all', [])) <= symptoms
+                and (not rule.get('any') or set(rule['any']) & symptoms)
+                and not set(rule.get('none', [])) & symptoms
+                and ('when_predicted' not in rule or predicted in rule['when_predicted'])):
+            return r
+    return NO_RULE
+
+
+def random_cases(rules, count, seed=0):
+    """Random (symptom set, predicted label) pairs, biased towards the symptoms the rules mention"""
+    rng = random.Random(seed)
+    mentioned = sorted({s for rule in rules for key in ('all', 'any', 'none') for s in rule.get(key, [])})
+    cases = [(set(), 0)]
+    for _ in range(count):
+        symptoms = set(rng.sample(mentioned, rng.randint(0, len(mentioned))))
+        symptoms |= set(rng.sample(SYMPTOM_VOCABULARY, rng.randint(0, 3)))
+        cases.append((symptoms, rng.randrange(len(CLASSES))))
+    return cases
+
+
+def check_against_reference(rules):
+    compiled = MedicalRules(rules, CLASSES)
+    cases = random_cases(rules, 3000)
+    present = np.zeros((len(cases), len(SYMPTOM_VOCABULARY)), dtype=bool)
+    for i, (symptoms, _) in enumerate(cases):
+        present[i, [SYMPTOM_VOCABULARY.index(s) for s in symptoms]] = True
+    predicted = np.array([label for _, label in cases])
+
+    labels, fired = compiled.apply(symptom_bitsets(present), predicted)
+    for (symptoms, label), new_label, rule in zip(cases, labels, fired):
+        expected = reference_match(rules, symptoms, CLASSES[label])
+        assert rule == expected, (sorted(symptoms), CLASSES[label])
+        target = label if expected == NO_RULE else CLASSES.index(rules[expected]['disease'])
+        assert new_label == target
+        assert compiled.rule_id(rule) == (None if expected == NO_RULE else rules[expected]['id'])
+
+
+def test_shipped_rules_match_reference():
+    with open(DEFAULT_RULES_PATH) as f:
+        check_against_reference(json.load(f)['rules'])
+
+
+def test_every_clause_matches_reference():
+    check_against_reference(CLAUSE_RULES)
+
+
+def test_first_rule_in_file_order_wins():
+    rules = [{'id': 'second_anchor', 'disease': 'Malaria', 'all': ['vomiting', 'chills']},
+             {'id': 'first_anchor', 'disease': 'Typhoid', 'all': ['chills', 'vomiting']}]
+    compiled = MedicalRules(rules, CLASSES)
+    bits = symptom_bitsets([[s in ('chills', 'vomiting') for s in SYMPTOM_VOCABULARY]])[0]
+    assert compiled.match(bits, 0) == 0
+
+
+def test_version_is_the_file_hash(tmp_path):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps({'rules': CLAUSE_RULES}))
+    version = MedicalRules.load(CLASSES, str(path)).version
+    assert version == MedicalRules.load(CLASSES, str(path)).version
+    path.write_text(json.dumps({'rules': CLAUSE_RULES[:1]}))
+    assert MedicalRules.load(CLASSES, str(path)).version != version
+
+
+@pytest.mark.parametrize('rules, message', [
+    ([{'id': 'a', 'disease': 'Flu'}], "unknown disease"),
+    ([{'id': 'a', 'disease': 'Malaria', 'all': ['not_a_symptom']}], "unknown symptom"),
+    ([{'id': 'a', 'disease': 'Malaria', 'when_predicted': ['Flu']}], "unknown disease"),
+    ([{'id': 'a', 'disease': 'Malaria'}, {'id': 'a', 'disease': 'Typhoid'}], "Duplicate rule id"),
+])
+def test_malformed_rules_are_rejected(rules, message):
+    with pytest.raises(ValueError, match=message):
+        MedicalRules(rules, CLASSES)
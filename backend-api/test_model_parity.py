@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test that the fast model paths match their reference implementations
+====================================================================
+
+- SymptomFeatureEncoder against the dict path (create_feature_vector +
+  add_enhanced_features) the models were trained on
+- The NumPy runtime (numpy_runtime.py) against the sklearn ensemble it was
+  exported from, member by member and through predict_labels
+- build_training_matrix against the per-row read_csv + dict path it replaced
+- SoftmaxSVC against sklearn's one-vs-rest SVC, and its NumPy runtime export
+  against the estimator
+
+Cases are every row of datasets/symtoms_df.csv plus seeded random symptom
+lists with duplicates, unknown symptoms and empty lists.
+
+Run from backend-api/ (needs the datasets and a trained model):
+    python -m pytest test_model_parity.py
+"""
+import csv
+import os
+import pickle
+import random
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from feature_encoder import CANONICAL_FEATURE_NAMES, SYMPTOM_VOCABULARY, SymptomFeatureEncoder
+from improved_enhanced_model import ImprovedEnhancedMedicalPredictor
+
+SYMPTOMS_PATH = os.path.join(BASE_DIR, 'datasets', 'symtoms_df.csv')
+MODEL_PATH = os.path.join(BASE_DIR, 'models', 'improved_enhanced_models.pkl')
+
+
+def dataset_symptom_lists():
+    """Stripped, non-empty symptoms of every dataset row, as the models were trained on them"""
+    with open(SYMPTOMS_PATH, newline='', encoding='utf-8') as f:
+        return [
+            [value.strip() for column, value in row.items() if column.startswith('Symptom_') and value and value.strip()]
+            for row in csv.DictReader(f)
+        ]
+
+
+def random_symptom_lists(count, seed=0):
+    """Random symptom lists, some with duplicates, an unknown symptom or no symptoms at all"""
+    rng = random.Random(seed)
+    cases = [[], ['weight_loss'], ['weight_loss', 'sweating'], ['weight_loss', 'polyuria', 'mood_swings'],
+             ['fluid_overload', 'fluid_overload'], ['slow_healing_wounds', 'fatigue'], ['not_a_symptom']]
+    for _ in range(count):
+        symptoms = rng.sample(SYMPTOM_VOCABULARY, rng.randint(1, 8))
+        if rng.random() < 0.2:
+            symptoms.append(rng.choice(symptoms))
+        if rng.random() < 0.1:
+            symptoms.append('not_a_symptom')
+        cases.append(symptoms)
+    return cases
+
+
+def trained_feature_names():
+    with open(MODEL_PATH, 'rb') as f:
+        return pickle.load(f)['feature_names']
+
+
+def reference_features(symptom_lists, feature_names):
+    """Feature rows built with the dict path"""
+    predictor = ImprovedEnhancedMedicalPredictor()
+    rows = []
+    for symptoms in symptom_lists:
+        features = predictor.create_feature_vector(symptoms)
+        features.update(predictor.add_enhanced_features(symptoms, None))
+        rows.append([features[name] for name in feature_names])
+    return np.array(rows, dtype=np.float64)
+
+
+def test_encoder_matches_dict_path():
+    cases = dataset_symptom_lists() + random_symptom_lists(5000)
+    for feature_names in (CANONICAL_FEATURE_NAMES, trained_feature_names()):
+        encoder = SymptomFeatureEncoder(feature_names)
+        expected = reference_features(cases, feature_names)
+        assert np.array_equal(encoder.encode_batch(cases), expected)
+        for symptoms, row in zip(cases[:500], expected):
+            assert np.array_equal(encoder.encode(symptoms)[0], row), symptoms
+
+
+def test_encoder_follows_any_feature_order():
+    cases = random_symptom_lists(500, seed=1)
+    shuffled = list(CANONICAL_FEATURE_NAMES)
+    random.Random(2).shuffle(shuffled)
+    assert np.array_equal(SymptomFeatureEncoder(shuffled).encode_batch(cases), reference_features(cases, shuffled))
+
+
+def test_encoder_symptom_ids_match_names():
+    cases = [list(dict.fromkeys(symptoms)) for symptoms in random_symptom_lists(500, seed=3)]
+    cases = [[s for s in symptoms if s in SYMPTOM_VOCABULARY] for symptoms in cases]
+    encoder = SymptomFeatureEncoder()
+    id_lists = [[SYMPTOM_VOCABULARY.index(s) for s in symptoms] for symptoms in cases]
+    assert np.array_equal(encoder.encode_symptom_id_lists(id_lists), encoder.encode_batch(cases))
+
+
+def test_numpy_runtime_matches_sklearn(tmp_path):
+    reference = ImprovedEnhancedMedicalPredictor()
+    reference.load_models(MODEL_PATH)
+    runtime_path = reference.export_numpy_runtime(str(tmp_path / 'runtime'))
+    runtime = ImprovedEnhancedMedicalPredictor()
+    runtime.load_numpy_runtime(runtime_path)
+    assert runtime.feature_names == list(reference.feature_names)
+    assert list(runtime.label_encoder.classes_) == list(reference.label_encoder.classes_)
+
+    # Distinct symptom sets only: the dataset repeats each one many times
+    cases = [list(symptoms) for symptoms in dict.fromkeys(
+        tuple(sorted(set(symptoms))) for symptoms in dataset_symptom_lists() + random_symptom_lists(200, seed=4))]
+    X = reference.encoder.encode_batch(cases)
+    for name, model in reference.models.items():
+        expected = model.predict_proba(X)
+        actual = runtime.models[name].predict_proba(X)
+        assert np.allclose(actual, expected, rtol=0, atol=1e-9), name
+        assert np.array_equal(runtime.models[name].predict(X), model.classes_[expected.argmax(axis=1)]), name
+
+    id_lists = [sorted({SYMPTOM_VOCABULARY.index(s) for s in symptoms if s in SYMPTOM_VOCABULARY})
+                for symptoms in cases[::5]]
+    for cascade_threshold in (None, 0.9):
+        expected = reference.predict_labels(id_lists, cascade_threshold=cascade_threshold)
+        actual = runtime.predict_labels(id_lists, cascade_threshold=cascade_threshold)
+        assert np.array_equal(actual[0], expected[0]), cascade_threshold
+        assert actual[1] == expected[1], cascade_threshold
+        assert list(actual[3]) == list(expected[3]), cascade_threshold
+
+
+def reference_training_matrix(path):
+    """The per-row path build_training_matrix replaced: read_csv, then the dict path row by row"""
+    import pandas as pd
+    predictor = ImprovedEnhancedMedicalPredictor()
+    df = pd.read_csv(path)
+    rows, diseases = [], []
+    for _, row in df.iterrows():
+        symptoms = [s.strip() for s in (row['Symptom_1'], row['Symptom_2'], row['Symptom_3'], row['Symptom_4'])
+                    if pd.notna(s) and s.strip()]
+        features = predictor.create_feature_vector(symptoms)
+        features.update(predictor.add_enhanced_features(symptoms, row['Disease']))
+        rows.append([features[name] for name in CANONICAL_FEATURE_NAMES])
+        diseases.append(row['Disease'])
+    return np.array(rows, dtype=np.uint8), np.array(diseases, dtype=object)
+
+
+def test_training_matrix_matches_per_row_path(tmp_path):
+    predictor = ImprovedEnhancedMedicalPredictor()
+    # Blank and whitespace-only cells, padding, unknown symptoms and a quoted line break
+    edge_cases = tmp_path / 'edge_cases.csv'
+    edge_cases.write_text(
+        'Disease,Symptom_1,Symptom_2,Symptom_3,Symptom_4\n'
+        'Diabetes , weight_loss ,polyuria,,\n'
+        'Malaria,chills,  ,not_a_symptom,high_fever\n'
+        'Hyperthyroidism,weight_loss,sweating,mood_swings,weight_loss\n'
+        '"Fungal\ninfection",itching,,,\n'
+        'Common Cold,,,,\n'
+    )
+    for path, chunksize in ((SYMPTOMS_PATH, 100_000), (SYMPTOMS_PATH, 333), (str(edge_cases), 2)):
+        X, y = predictor.build_training_matrix(path, chunksize=chunksize)
+        expected_X, expected_y = reference_training_matrix(path)
+        assert X.dtype == np.uint8
+        assert np.array_equal(X, expected_X), (path, chunksize)
+        assert list(y) == list(expected_y), (path, chunksize)
+
+
+def test_trained_label_classes_can_be_exported(tmp_path):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder
+
+    from numpy_runtime import export_ensemble, load_ensemble
+
+    X, diseases = ImprovedEnhancedMedicalPredictor().build_training_matrix(SYMPTOMS_PATH)
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(diseases)
+    assert label_encoder.classes_.dtype.kind == 'U'
+    model = RandomForestClassifier(n_estimators=2, max_depth=3, random_state=0).fit(X, y)
+    runtime_path = export_ensemble({'random_forest': model}, label_encoder, CANONICAL_FEATURE_NAMES,
+                                   str(tmp_path / 'runtime'))
+    assert list(load_ensemble(runtime_path)[1].classes_) == list(label_encoder.classes_)
+
+
+def test_softmax_svc_runtime_matches_estimator(tmp_path):
+    from sklearn.preprocessing import LabelEncoder
+    from sklearn.svm import SVC
+
+    from numpy_runtime import export_ensemble, load_ensemble
+    from svm_calibration import SoftmaxSVC
+
+    X, diseases = ImprovedEnhancedMedicalPredictor().build_training_matrix(SYMPTOMS_PATH)
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(diseases)
+    model = SoftmaxSVC(C=1.0, random_state=42).fit(X, y)
+    ovr = SVC(C=1.0, decision_function_shape='ovr', random_state=42).fit(X, y)
+    cases = random_symptom_lists(1000, seed=5)
+    X_test = np.vstack([X, SymptomFeatureEncoder().encode_batch(cases)])
+    assert np.allclose(model.decision_function(X_test), ovr.decision_function(X_test), rtol=0, atol=1e-9)
+
+    runtime_path = export_ensemble({'svm': model}, label_encoder, CANONICAL_FEATURE_NAMES, str(tmp_path / 'runtime'))
+    runtime = load_ensemble(runtime_path)[0]['svm']
+    expected = model.predict_proba(X_test)
+    actual = runtime.predict_proba(X_test)
+    assert np.allclose(actual, expected, rtol=0, atol=1e-9)
+    assert np.allclose(actual.sum(axis=1), 1.0)
+    assert np.array_equal(runtime.predict(X_test), model.predict(X_test))
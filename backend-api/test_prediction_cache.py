@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test the prediction cache
+=========================
+
+LRU eviction, hit/miss statistics and dropping every entry when the model
+or medical rules version changes.
+
+Run from backend-api/ (the last test needs the datasets and a trained model):
+    python -m pytest test_prediction_cache.py
+"""
+import copy
+
+from prediction_cache import PredictionCache
+
+
+def test_get_returns_what_was_put():
+    cache = PredictionCache(4)
+    assert cache.get((1, 2), 'v1') is None
+    cache.put((1, 2), 'flu', 'v1')
+    assert cache.get((1, 2), 'v1') == 'flu'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hit_rate'] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(2)
+    cache.put((1,), 'a', 'v1')
+    cache.put((2,), 'b', 'v1')
+    cache.get((1,), 'v1')
+    cache.put((3,), 'c', 'v1')
+    assert cache.get((2,), 'v1') is None
+    assert cache.get((1,), 'v1') == 'a'
+    assert cache.get((3,), 'v1') == 'c'
+    assert cache.stats()['size'] == 2
+    assert cache.stats()['evictions'] == 1
+
+
+def test_new_version_drops_old_entries():
+    cache = PredictionCache(4)
+    cache.put((1,), 'a', 'v1')
+    assert cache.get((1,), 'v2') is None
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['version'] == 'v2'
+    # Once on v2 a late put for v1 replaces v2's entries, never mixes with them
+    cache.put((2,), 'b', 'v2')
+    cache.put((1,), 'a', 'v1')
+    assert cache.get((2,), 'v2') is None
+
+
+def test_zero_size_disables_the_cache():
+    cache = PredictionCache(0)
+    cache.put((1,), 'a', 'v1')
+    assert cache.get((1,), 'v1') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_clear_keeps_statistics():
+    cache = PredictionCache(4)
+    cache.put((1,), 'a', 'v1')
+    cache.get((1,), 'v1')
+    cache.clear()
+    assert cache.get((1,), 'v1') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_result_cached_under_old_rules_is_not_served(monkeypatch):
+    """A request that finishes after a rules-only reload must not leave its result in the cache"""
+    import main
+
+    old = main.get_predictor()
+    new = copy.copy(old)
+    new.rules = copy.copy(old.rules)
+    new.rules.version = 'edited'
+    state = main.current_state()
+    symptom_ids = (0, 1)
+    key = main.prediction_cache_key(symptom_ids, None, None, None)
+
+    monkeypatch.setattr(main, '_state', main.ServingState(state.datasets, new, None, state.model_fingerprint,
+                                                          state.catalog))
+    main._prediction_cache.clear()
+    # The in-flight request on the old state stores its result after the reload cleared the cache
+    main._prediction_cache.put(key, 'stale', main.cache_version(old))
+    assert main.get_predicted_value(symptom_ids) != 'stale'
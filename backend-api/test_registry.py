@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test the disease and symptom registry
+=====================================
+
+Disease IDs follow the label encoder's classes, names are normalized the same
+way wherever they come from, and dataset-only diseases get the IDs after the
+model's.
+
+Run from backend-api/:
+    python -m pytest test_registry.py
+"""
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from feature_encoder import SYMPTOM_VOCABULARY
+from registry import Registry, normalize_name
+
+CLASSES = ['(vertigo) Paroymsal  Positional Vertigo', 'Diabetes ', 'Malaria']
+
+
+def test_normalize_name():
+    assert normalize_name(' Diabetes ') == 'Diabetes'
+    assert normalize_name('(vertigo) Paroymsal  Positional Vertigo') == '(vertigo) Paroymsal Positional Vertigo'
+    assert normalize_name('Tab\tand\nnewline') == 'Tab and newline'
+
+
+def test_disease_ids_are_encoded_labels():
+    registry = Registry(CLASSES, ['Malaria', 'Diabetes', ' Common  Cold', '', 'Typhoid'])
+    assert registry.n_classes == len(CLASSES)
+    for label, name in enumerate(CLASSES):
+        assert registry.disease_id(name) == label
+        assert registry.disease_name(label) == normalize_name(name)
+    # Dataset-only diseases follow the model's, once each
+    assert registry.diseases[registry.n_classes:] == ['Common Cold', 'Typhoid']
+
+
+def test_disease_lookup_ignores_spacing_and_case():
+    registry = Registry(CLASSES)
+    assert registry.disease_id('diabetes') == 1
+    assert registry.disease_id('  DIABETES  ') == 1
+    assert registry.disease_id('(Vertigo) paroymsal positional   vertigo') == 0
+    assert registry.disease_id('Dengue') is None
+
+
+def test_classes_that_normalize_alike_are_rejected():
+    with pytest.raises(ValueError, match="normalize to the same disease"):
+        Registry(['Diabetes', 'Diabetes '])
+
+
+def test_symptom_ids_are_vocabulary_positions():
+    registry = Registry(CLASSES)
+    assert registry.symptom_id('itching') == SYMPTOM_VOCABULARY.index('itching')
+    assert registry.symptom_id('not_a_symptom') is None
+    assert registry.symptom_names([0, 2]) == [SYMPTOM_VOCABULARY[0], SYMPTOM_VOCABULARY[2]]
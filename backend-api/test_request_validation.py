@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test that malformed request bodies are rejected with 400
+========================================================
+
+Bodies that are not JSON objects, symptoms that are not strings and other
+wrongly typed fields must come back as a 400 with an error message, never as
+a 500 or as symptoms made up from str() of the value.
+
+Run from backend-api/ (needs the datasets):
+    python -m pytest test_request_validation.py
+"""
+from main import app
+
+# (url, JSON body) pairs that must be rejected
+MALFORMED = [
+    ('/predict', {'symptoms': [1, 2]}),
+    ('/predict', {'symptoms': ['itching', None]}),
+    ('/predict', {'symptoms': 5}),
+    ('/predict', {'text': 5}),
+    ('/predict', ['itching']),
+    ('/predict', 'itching'),
+    ('/predict', {'symptoms': ['cough'], 'mode': 'cascade', 'cascade_threshold': 0}),
+    ('/predict', {'symptoms': ['cough'], 'mode': 'cascade', 'cascade_threshold': 'abc'}),
+    ('/predict', {'symptoms': ['cough'], 'mode': 'cascade', 'cascade_threshold': [0.5]}),
+    ('/predict', {'symptoms': ['cough'], 'mode': 'cascade', 'cascade_threshold': 1.5}),
+    ('/predict/batch', {'cases': [None, 5]}),
+    ('/predict/batch', {'cases': [['itching'], [1]]}),
+    ('/predict/batch', [['itching']]),
+    ('/predict/batch', {'cases': [['cough']], 'mode': 'cascade', 'cascade_threshold': 0}),
+    ('/check_disease', {'disease_name': 5}),
+    ('/check_disease', ['Diabetes']),
+    ('/check_disease/batch', {'disease_names': ['Diabetes', None]}),
+    ('/check_disease/batch', ['Diabetes']),
+    ('/diseases_by_symptoms', {'symptoms': {'itching': True}}),
+    ('/diseases_by_symptoms', [1]),
+    ('/diseases/similar', {'disease_name': ['Malaria']}),
+    ('/symptoms/normalize', {'symptoms': [1]}),
+    ('/symptoms/extract', {'text': ['fever']}),
+    ('/symptoms/extract', {'text': None}),
+]
+
+
+def test_malformed_bodies_get_400():
+    client = app.test_client()
+    for url, body in MALFORMED:
+        response = client.post(url, json=body)
+        assert response.status_code == 400, f"{url} {body!r}: {response.status_code} {response.get_data(as_text=True)}"
+        assert 'error' in response.get_json(), f"{url} {body!r}: no error message"
+
+
+def test_invalid_json_gets_400():
+    client = app.test_client()
+    for url in ('/predict', '/predict/batch', '/check_disease', '/diseases_by_symptoms'):
+        response = client.post(url, data='{"symptoms": [', content_type='application/json')
+        assert response.status_code == 400, f"{url}: {response.status_code}"
+        assert response.get_json()['error'] == 'Request body must be a JSON object'
+
+
+def test_cascade_threshold_errors_are_fixed_messages():
+    client = app.test_client()
+    for threshold in (0, 'abc', [0.5], 1.5):
+        response = client.post('/predict', json={'symptoms': ['cough'], 'mode': 'cascade', 'cascade_threshold': threshold})
+        assert response.get_json() == {'error': 'cascade_threshold must be in (0, 1]'}, threshold
+
+
+def test_missing_cascade_threshold_uses_default():
+    client = app.test_client()
+    default = client.post('/predict', json={'symptoms': ['cough', 'high_fever'], 'mode': 'cascade'})
+    assert default.status_code == 200, default.get_data(as_text=True)
+    for threshold in (None, ''):
+        response = client.post('/predict', json={'symptoms': ['cough', 'high_fever'], 'mode': 'cascade',
+                                                 'cascade_threshold': threshold})
+        assert response.get_json() == default.get_json(), threshold
+
+
+def test_form_data_still_accepted():
+    client = app.test_client()
+    response = client.post('/check_disease', data={'disease_name': 'Malaria'})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    response = client.post('/diseases_by_symptoms', data={'symptoms': 'itching,skin_rash'})
+    assert response.status_code == 200, response.get_data(as_text=True)
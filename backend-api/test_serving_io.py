@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test that serving requests opens no files
+=========================================
+
+Imports the app and warms it up the way wsgi.py does at startup, then sends
+requests to every data endpoint while an audit hook (sys.addaudithook)
+records each file the process opens. Modules imported lazily by the first
+request (.py, .pyc and extension files) are ignored; any other open, such as
+a dataset CSV or a model artifact, fails the test.
+
+Run from backend-api/ (needs the datasets and a trained model):
+    python test_serving_io.py
+    python -m pytest test_serving_io.py
+"""
+import os
+import sys
+
+from main import app, warmup
+
+# File opens that only come from importing modules
+IMPORT_SUFFIXES = ('.py', '.pyc', '.so', '.pyd')
+
+REQUESTS = [
+    ('post', '/predict', {'symptoms': ['itching', 'skin_rash', 'nodal_skin_eruptions']}),
+    ('post', '/predict', {'symptoms': ['Chills', 'throwing up', 'hight fevr'], 'top_k': 3}),
+    ('post', '/predict', {'symptoms': ['cough', 'chest_pain'], 'mode': 'cascade', 'cascade_threshold': 0.5}),
+    ('post', '/predict', {'text': "I've had a headache and high fever since Monday"}),
+    ('post', '/predict/batch', {'cases': [['fatigue', 'weight_loss'], ['polyuria', 'irregular_sugar_level']]}),
+    ('post', '/check_disease', {'disease_name': 'Diabetes'}),
+    ('post', '/check_disease', {'disease_name': 'Not a disease'}),
+    ('post', '/check_disease/batch', {'disease_names': ['Diabetes', 'Malaria', 'Not a disease']}),
+    ('post', '/diseases_by_symptoms', {'symptoms': ['itching', 'skin rash', 'high fever'], 'limit': 5}),
+    ('post', '/diseases/similar', {'disease_name': 'Malaria'}),
+    ('get', '/symptoms/suggest?q=skin%20r', None),
+    ('post', '/symptoms/normalize', {'symptoms': ['rash', 'nausia']}),
+    ('post', '/symptoms/extract', {'text': 'Mild fever and a runny nose'}),
+    ('get', '/cache/stats', None),
+]
+
+_recording = []
+
+
+def _audit(event, args):
+    if _recording and event == 'open':
+        path = args[0]
+        if isinstance(path, (str, bytes, os.PathLike)):
+            path = os.fsdecode(path)
+            if not path.endswith(IMPORT_SUFFIXES):
+                _recording[-1].append(path)
+
+
+sys.addaudithook(_audit)
+
+
+def opened_while_serving():
+    """Files opened while the REQUESTS are served, as (method, url, paths) for each request"""
+    warmup(5)
+    client = app.test_client()
+    opened = []
+    for method, url, payload in REQUESTS:
+        _recording.append([])
+        try:
+            response = getattr(client, method)(url, json=payload) if payload is not None else getattr(client, method)(url)
+        finally:
+            paths = _recording.pop()
+        assert response.status_code < 500, f"{url} failed with {response.status_code}: {response.get_data(as_text=True)}"
+        opened.append((method.upper(), url, paths))
+    return opened
+
+
+def test_no_files_opened_while_serving():
+    """No request reads a dataset, model artifact or any other file"""
+    offending = [(method, url, paths) for method, url, paths in opened_while_serving() if paths]
+    assert not offending, f"Files opened while serving: {offending}"
+
+
+if __name__ == "__main__":
+    print("🧪 Checking for file I/O while serving requests...")
+    print("=" * 50)
+    results = opened_while_serving()
+    for method, url, paths in results:
+        print(f"   {'❌' if paths else '✅'} {method} {url}" + (f": {paths}" if paths else ""))
+    print("=" * 50)
+    if any(paths for _, _, paths in results):
+        print("❌ Requests opened files")
+        sys.exit(1)
+    print("🎉 No files opened while serving")
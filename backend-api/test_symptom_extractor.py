@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test free-text symptom extraction
+=================================
+
+The Aho-Corasick automaton (models/symptom_extractor.py) against a brute
+force search for every phrase at every word, on random sentences mixing
+names, synonyms and filler words, plus the whole-word, leftmost-longest and
+character span behaviour.
+
+Run from backend-api/:
+    python -m pytest test_symptom_extractor.py
+"""
+import os
+import random
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from symptom_extractor import SymptomExtractor, phrase_words
+from symptom_index import SymptomIndex
+
+FILLER = ['i', 'have', 'had', 'a', 'and', 'since', 'monday', 'bad', 'no', 'with', 'pain', 'my', 'the', 'brash']
+
+_index = SymptomIndex.load()
+_extractor = SymptomExtractor(_index)
+
+
+def reference_scan(words):
+    """Every (start, end, symptom ID) occurrence, by comparing each phrase at each position"""
+    phrases = {}
+    for key, symptom_id in zip(_index.keys, _index.key_ids):
+        phrases.setdefault(tuple(phrase_words(key)), symptom_id)
+    return [
+        (start, start + len(phrase), symptom_id)
+        for start in range(len(words))
+        for phrase, symptom_id in phrases.items()
+        if phrase and tuple(words[start:start + len(phrase)]) == phrase
+    ]
+
+
+def random_sentences(count, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(count):
+        parts = [rng.choice(_index.keys) if rng.random() < 0.4 else rng.choice(FILLER)
+                 for _ in range(rng.randint(0, 15))]
+        sentences.append(rng.choice([' ', ', ', '. ']).join(parts))
+    return sentences
+
+
+def test_scan_matches_brute_force():
+    for sentence in random_sentences(1000):
+        words = phrase_words(sentence)
+        assert sorted(_extractor.scan(words)) == sorted(reference_scan(words)), sentence
+
+
+def test_find_is_leftmost_longest():
+    for sentence in random_sentences(1000, seed=1):
+        mentions = _extractor.find(sentence)
+        words = phrase_words(sentence)
+        covered = 0
+        expected = []
+        for start, end, symptom_id in sorted(reference_scan(words), key=lambda m: (m[0], m[0] - m[1])):
+            if start >= covered:
+                expected.append(symptom_id)
+                covered = end
+        assert [m['id'] for m in mentions] == expected, sentence
+        for mention in mentions:
+            assert phrase_words(sentence[mention['start']:mention['end']]) == phrase_words(mention['matched'])
+
+
+def test_whole_words_and_spans():
+    text = "Brash skin rash, then a MILD fever and throwing-up."
+    mentions = _extractor.find(text)
+    assert [m['symptom'] for m in mentions] == ['skin_rash', 'mild_fever', 'vomiting']
+    assert [text[m['start']:m['end']] for m in mentions] == ['skin rash', 'MILD fever', 'throwing-up']
+    assert _extractor.extract("fever, fever and more fever") == [_index.exact['fever']]
+    assert _extractor.find("") == []
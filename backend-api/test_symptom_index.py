@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test symptom name resolution
+============================
+
+Exact names and synonyms resolve whatever their case and separators;
+misspellings and other near misses never resolve on their own, in the index
+or through /predict, and come back as suggestions instead.
+
+Run from backend-api/ (the endpoint tests need the datasets and a trained model):
+    python -m pytest test_symptom_index.py
+"""
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, 'models'))
+
+from symptom_index import SymptomIndex
+
+# Near misses a few edits from another symptom: the closest match would be a wrong guess
+NEAR_MISSES = {'heart pain': 'headache', 'ear pain': 'pain_behind_the_eyes', 'no fever': 'mild_fever'}
+
+_index = SymptomIndex.load()
+
+
+def test_names_and_synonyms_resolve():
+    ids, unknown = _index.resolve(['Skin Rash', 'high-fever', 'throwing up', 'skin_rash'])
+    assert [_index.vocabulary[i] for i in ids] == ['skin_rash', 'high_fever', 'vomiting']
+    assert unknown == []
+
+
+def test_near_misses_do_not_resolve():
+    for text, closest in NEAR_MISSES.items():
+        assert _index.resolve([text]) == ([], [text])
+        assert _index.normalize([text]) == ([], [text])
+        # lookup still reports the candidate, marked as fuzzy
+        symptom_id, kind, _ = _index.lookup(text)
+        assert (_index.vocabulary[symptom_id], kind) == (closest, 'fuzzy')
+
+
+def test_misspellings_are_suggested():
+    assert _index.resolve(['hight fevr']) == ([], ['hight fevr'])
+    assert _index.suggest('hight fevr', 5)[0]['symptom'] == 'high_fever'
+
+
+def test_predict_rejects_near_misses():
+    from main import app
+    client = app.test_client()
+    for text in NEAR_MISSES:
+        response = client.post('/predict', json={'symptoms': [text]})
+        assert response.status_code == 400, f"{text}: {response.get_data(as_text=True)}"
+        body = response.get_json()
+        assert body['unrecognized_symptoms'] == [text]
+        assert body['suggestions'][text]
+
+
+def test_predict_reports_near_misses_beside_known_symptoms():
+    from main import app
+    client = app.test_client()
+    response = client.post('/predict', json={'symptoms': ['cough', 'ear pain']})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    body = response.get_json()
+    assert body['normalized_symptoms'] == ['cough']
+    assert body['unrecognized_symptoms'] == ['ear pain']
+    assert 'pain_behind_the_eyes' in body['suggestions']['ear pain']
+
+    batch = client.post('/predict/batch', json={'cases': [['cough', 'no fever'], ['heart pain']]}).get_json()
+    assert batch['results'][0]['normalized_symptoms'] == ['cough']
+    assert batch['results'][0]['unrecognized_symptoms'] == ['no fever']
+    assert batch['results'][1]['unrecognized_symptoms'] == ['heart pain']
+    assert 'error' in batch['results'][1]
+
+
+def test_normalize_leaves_fuzzy_matches_unresolved():
+    from main import app
+    body = app.test_client().post('/symptoms/normalize', json={'symptoms': ['no fever', 'throwing up']}).get_json()
+    assert body['normalized'] == ['vomiting']
+    assert body['unrecognized'] == ['no fever']
+    entry = body['symptoms'][0]
+    assert entry['symptom'] is None
+    assert entry['closest']['symptom'] == 'mild_fever'
+    assert entry['closest']['match'] == 'fuzzy'
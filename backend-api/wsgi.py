@@ -0,0 +1,21 @@
+"""
+Production WSGI entry point
+===========================
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app (see gunicorn.conf.py) this module is imported once in the
+gunicorn master: the datasets and the predictor are loaded and warmed up
+before the workers are forked, so every worker starts with ready models in
+copy-on-write pages and no user request pays the model load.
+"""
+import gc
+import os
+
+from main import app, warmup
+
+warmup(int(os.environ.get('WARMUP_CASES', 50)))
+
+# Move everything loaded so far out of the garbage collector's reach so that
+# collections in the workers don't write to (and un-share) the preloaded pages
+gc.freeze()
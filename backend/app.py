@@ -102,35 +102,147 @@ import numpy as np
 import pandas as pd
 import pickle
 import os
+import sys
+
+# Shared symptom name index (synonyms, spacing and misspellings) from the backend-api models
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend-api", "models"))
+try:
+    from symptom_index import SymptomIndex
+    symptom_index = SymptomIndex.load()
+except ImportError:
+    symptom_index = None
+try:
+    from symptom_sets import SymptomSetIndex
+except ImportError:
+    SymptomSetIndex = None
+try:
+    from dataset_bundle import DEFAULT_BUNDLE_NAME, open_bundle
+except ImportError:
+    open_bundle = None
 
 # Flask app
 app = Flask(__name__, static_folder="../frontend/build", static_url_path="")
 
-# Load datasets
-sym_des = pd.read_csv("datasets/symtoms_df.csv")
-precautions = pd.read_csv("datasets/precautions_df.csv")
-workout = pd.read_csv("datasets/workout_df.csv")
-description = pd.read_csv("datasets/description.csv")
-medications = pd.read_csv("datasets/medications.csv")
-diets = pd.read_csv("datasets/diets.csv")
+# Load datasets, from the binary bundle (backend-api/models/dataset_bundle.py) when it is fresh
+bundle = open_bundle(os.path.join("datasets", DEFAULT_BUNDLE_NAME)) if open_bundle else None
+
+def read_dataset(filename):
+    if bundle is not None and filename in bundle:
+        return bundle.dataframe(filename)
+    return pd.read_csv(os.path.join("datasets", filename))
+
+sym_des = read_dataset("symtoms_df.csv")
+precautions = read_dataset("precautions_df.csv")
+workout = read_dataset("workout_df.csv")
+description = read_dataset("description.csv")
+medications = read_dataset("medications.csv")
+diets = read_dataset("diets.csv")
 
 # Load model
 svc = pickle.load(open("models/svc.pkl", "rb"))
 
+# Disease information, precomputed once per disease so helper is a dict lookup
+MISSING_INFO = (
+    "Description not available",
+    ("Precautions not available",),
+    ("Medications not available",),
+    ("Diet information not available",),
+    ("Workout information not available",),
+)
+
+def normalize_disease(name):
+    """Disease name with surrounding spaces stripped and inner runs of spaces collapsed"""
+    return " ".join(str(name).split())
+
+def values_by_disease(df, disease_col, value_col):
+    """Non-empty values of value_col grouped by normalized disease name, in file order"""
+    found = {}
+    for name, value in zip(df[disease_col], df[value_col]):
+        if pd.notna(value):
+            found.setdefault(normalize_disease(name), []).append(value)
+    return found
+
+def build_disease_info():
+    """Frozen (description, precautions, medications, diet, workout) per disease, fallbacks filled in"""
+    descriptions = values_by_disease(description, "Disease", "Description")
+    meds = values_by_disease(medications, "Disease", "Medication")
+    diet_values = values_by_disease(diets, "Disease", "Diet")
+    workouts = values_by_disease(workout, "disease", "workout")
+    # First precautions row per disease, blank cells skipped
+    prec_cols = [col for col in precautions.columns if col.startswith("Precaution_")]
+    first_precautions = {}
+    for name, row in zip(precautions["Disease"], precautions[prec_cols].values.tolist()):
+        first_precautions.setdefault(
+            normalize_disease(name), tuple(v for v in row if pd.notna(v) and str(v).strip())
+        )
+    names = set(descriptions) | set(first_precautions) | set(meds) | set(diet_values) | set(workouts)
+    return {
+        name: (
+            descriptions[name][0] if name in descriptions else MISSING_INFO[0],
+            first_precautions.get(name) or MISSING_INFO[1],
+            tuple(meds.get(name, ())) or MISSING_INFO[2],
+            tuple(diet_values.get(name, ())) or MISSING_INFO[3],
+            tuple(workouts.get(name, ())) or MISSING_INFO[4],
+        )
+        for name in names
+    }
+
+disease_info = build_disease_info()
+
 # Helper function
 def helper(dis):
-    desc = description[description["Disease"] == dis]["Description"].values[0]
-    pre = precautions[precautions["Disease"] == dis].iloc[:, 1:5].values.tolist()[0]
-    med = medications[medications["Disease"] == dis]["Medication"].tolist()
-    diet = diets[diets["Disease"] == dis]["Diet"].tolist()
-    wrkout = workout[workout["disease"] == dis]["workout"].tolist()
-    return desc, pre, med, diet, wrkout
+    return disease_info.get(normalize_disease(dis), MISSING_INFO)
 
 # Symptom-to-disease mapping
 symptoms_dict = {'itching': 0, 'skin_rash': 1, 'nodal_skin_eruptions': 2, 'continuous_sneezing': 3, 'shivering': 4, 'chills': 5, 'joint_pain': 6, 'stomach_pain': 7, 'acidity': 8, 'ulcers_on_tongue': 9, 'muscle_wasting': 10, 'vomiting': 11, 'burning_micturition': 12, 'spotting_ urination': 13, 'fatigue': 14, 'weight_gain': 15, 'anxiety': 16, 'cold_hands_and_feets': 17, 'mood_swings': 18, 'weight_loss': 19, 'restlessness': 20, 'lethargy': 21, 'patches_in_throat': 22, 'irregular_sugar_level': 23, 'cough': 24, 'high_fever': 25, 'sunken_eyes': 26, 'breathlessness': 27, 'sweating': 28, 'dehydration': 29, 'indigestion': 30, 'headache': 31, 'yellowish_skin': 32, 'dark_urine': 33, 'nausea': 34, 'loss_of_appetite': 35, 'pain_behind_the_eyes': 36, 'back_pain': 37, 'constipation': 38, 'abdominal_pain': 39, 'diarrhoea': 40, 'mild_fever': 41, 'yellow_urine': 42, 'yellowing_of_eyes': 43, 'acute_liver_failure': 44, 'fluid_overload': 45, 'swelling_of_stomach': 46, 'swelled_lymph_nodes': 47, 'malaise': 48, 'blurred_and_distorted_vision': 49, 'phlegm': 50, 'throat_irritation': 51, 'redness_of_eyes': 52, 'sinus_pressure': 53, 'runny_nose': 54, 'congestion': 55, 'chest_pain': 56, 'weakness_in_limbs': 57, 'fast_heart_rate': 58, 'pain_during_bowel_movements': 59, 'pain_in_anal_region': 60, 'bloody_stool': 61, 'irritation_in_anus': 62, 'neck_pain': 63, 'dizziness': 64, 'cramps': 65, 'bruising': 66, 'obesity': 67, 'swollen_legs': 68, 'swollen_blood_vessels': 69, 'puffy_face_and_eyes': 70, 'enlarged_thyroid': 71, 'brittle_nails': 72, 'swollen_extremeties': 73, 'excessive_hunger': 74, 'extra_marital_contacts': 75, 'drying_and_tingling_lips': 76, 'slurred_speech': 77, 'knee_pain': 78, 'hip_joint_pain': 79, 'muscle_weakness': 80, 'stiff_neck': 81, 'swelling_joints': 82, 'movement_stiffness': 83, 'spinning_movements': 84, 'loss_of_balance': 85, 'unsteadiness': 86, 'weakness_of_one_body_side': 87, 'loss_of_smell': 88, 'bladder_discomfort': 89, 'foul_smell_of urine': 90, 'continuous_feel_of_urine': 91, 'passage_of_gases': 92, 'internal_itching': 93, 'toxic_look_(typhos)': 94, 'depression': 95, 'irritability': 96, 'muscle_pain': 97, 'altered_sensorium': 98, 'red_spots_over_body': 99, 'belly_pain': 100, 'abnormal_menstruation': 101, 'dischromic _patches': 102, 'watering_from_eyes': 103, 'increased_appetite': 104, 'polyuria': 105, 'family_history': 106, 'mucoid_sputum': 107, 'rusty_sputum': 108, 'lack_of_concentration': 109, 'visual_disturbances': 110, 'receiving_blood_transfusion': 111, 'receiving_unsterile_injections': 112, 'coma': 113, 'stomach_bleeding': 114, 'distention_of_abdomen': 115, 'history_of_alcohol_consumption': 116, 'fluid_overload.1': 117, 'blood_in_sputum': 118, 'prominent_veins_on_calf': 119, 'palpitations': 120, 'painful_walking': 121, 'pus_filled_pimples': 122, 'blackheads': 123, 'scurring': 124, 'skin_peeling': 125, 'silver_like_dusting': 126, 'small_dents_in_nails': 127, 'inflammatory_nails': 128, 'blister': 129, 'red_sore_around_nose': 130, 'yellow_crust_ooze': 131}
 
 diseases_list = {15: 'Fungal infection', 4: 'Allergy', 16: 'GERD', 9: 'Chronic cholestasis', 14: 'Drug Reaction', 33: 'Peptic ulcer diseae', 1: 'AIDS', 12: 'Diabetes ', 17: 'Gastroenteritis', 6: 'Bronchial Asthma', 23: 'Hypertension ', 30: 'Migraine', 7: 'Cervical spondylosis', 32: 'Paralysis (brain hemorrhage)', 28: 'Jaundice', 29: 'Malaria', 8: 'Chicken pox', 11: 'Dengue', 37: 'Typhoid', 40: 'hepatitis A', 19: 'Hepatitis B', 20: 'Hepatitis C', 21: 'Hepatitis D', 22: 'Hepatitis E', 3: 'Alcoholic hepatitis', 36: 'Tuberculosis', 10: 'Common Cold', 34: 'Pneumonia', 13: 'Dimorphic hemmorhoids(piles)', 18: 'Heart attack', 39: 'Varicose veins', 26: 'Hypothyroidism', 24: 'Hyperthyroidism', 25: 'Hypoglycemia', 31: 'Osteoarthristis', 5: 'Arthritis', 0: '(vertigo) Paroymsal  Positional Vertigo', 2: 'Acne', 38: 'Urinary tract infection', 35: 'Psoriasis', 27: 'Impetigo'}
 
+# Symptoms listed for each disease, grouped once so check_disease never scans sym_des
+def build_disease_symptoms():
+    """Normalized disease name -> its symptoms from sym_des, in first-seen order"""
+    symptom_cols = [col for col in sym_des.columns if col.startswith("Symptom_")]
+    grouped = {}
+    for name, row in zip(sym_des["Disease"], sym_des[symptom_cols].values.tolist()):
+        listed = grouped.setdefault(normalize_disease(name), {})
+        for symptom in row:
+            if pd.notna(symptom) and str(symptom).strip():
+                listed.setdefault(str(symptom).strip())
+    return {name: tuple(listed) for name, listed in grouped.items()}
+
+disease_symptoms = build_disease_symptoms()
+disease_names = list(disease_symptoms)
+# Symptom <-> disease bitsets for the overlap endpoints (shared with backend-api)
+symptom_sets = SymptomSetIndex(list(disease_symptoms.values()), symptoms_dict) if SymptomSetIndex else None
+
+def ranked_diseases(ranking, symptom_ids):
+    """JSON entries for (disease index, matched, jaccard) rankings, with the shared symptom names"""
+    entries = []
+    for index, matched, jaccard in ranking:
+        symptoms = disease_symptoms[disease_names[index]]
+        entries.append({
+            "disease": disease_names[index],
+            "matched_symptoms": [s for s in symptoms if symptom_sets.symptom_ids[s] in symptom_ids],
+            "matched_count": matched,
+            "symptom_count": len(symptoms),
+            "jaccard": round(jaccard, 4),
+        })
+    return entries
+
+def parse_limit(data):
+    return min(max(int(data.get("limit", 10)), 1), 50)
+
+# Symptom normalization
+def normalize_symptoms(patient_symptoms):
+    """Split symptoms into (known symptoms_dict keys, unrecognized inputs)"""
+    if symptom_index is not None:
+        return symptom_index.normalize(patient_symptoms)
+    known, unknown = [], []
+    for symptom in patient_symptoms:
+        key = str(symptom).strip().lower().replace(" ", "_")
+        (known if key in symptoms_dict else unknown).append(key if key in symptoms_dict else symptom)
+    return known, unknown
+
 # Prediction function
 def get_predicted_value(patient_symptoms):
     input_vector = np.zeros(len(symptoms_dict))
@@ -145,6 +257,10 @@ def predict():
     symptoms = data.get("symptoms", [])
     if not symptoms:
         return jsonify({"error": "No symptoms provided"}), 400
+    # Unknown names used to raise a KeyError in get_predicted_value
+    symptoms, unrecognized = normalize_symptoms(symptoms)
+    if unrecognized:
+        return jsonify({"error": "Unrecognized symptoms", "unrecognized_symptoms": unrecognized}), 400
     try:
         predicted_disease = get_predicted_value(symptoms)
         desc, pre, med, diet, workout = helper(predicted_disease)
@@ -166,29 +282,60 @@ def check_disease():
     disease_name = data.get("disease_name", "")
     if not disease_name:
         return jsonify({"error": "No disease name provided"}), 400
+    all_symptoms = disease_symptoms.get(normalize_disease(disease_name))
+    if not all_symptoms:
+        return jsonify({"error": "Disease not found"}), 404
+    return jsonify({
+        "disease_name": disease_name,
+        "all_symptoms": list(all_symptoms),
+        "symptom_count": len(all_symptoms)
+    })
+
+@app.route("/check_disease/batch", methods=["POST"])
+def check_disease_batch():
+    names = (request.json or {}).get("disease_names", [])
+    if not isinstance(names, list) or not names:
+        return jsonify({"error": "Please provide a non-empty list of disease names in \"disease_names\""}), 400
+    results = []
+    for name in names:
+        all_symptoms = disease_symptoms.get(normalize_disease(name))
+        if all_symptoms:
+            results.append({"disease_name": name, "all_symptoms": list(all_symptoms), "symptom_count": len(all_symptoms)})
+        else:
+            results.append({"disease_name": name, "error": "Disease not found"})
+    return jsonify({"results": results, "count": len(results)})
+
+@app.route("/diseases_by_symptoms", methods=["POST"])
+def diseases_by_symptoms():
+    if symptom_sets is None:
+        return jsonify({"error": "Symptom index not available"}), 503
+    data = request.json or {}
+    symptoms, unrecognized = normalize_symptoms(data.get("symptoms", []))
+    if not symptoms:
+        return jsonify({"error": "No recognized symptoms provided", "unrecognized_symptoms": unrecognized}), 400
     try:
-        # Get all symptoms for the given disease
-        disease_symptoms = sym_des[sym_des['Disease'] == disease_name]
-        
-        if disease_symptoms.empty:
-            return jsonify({"error": "Disease not found"}), 404
-            
-        # Extract all unique symptoms for this disease
-        all_symptoms = set()
-        for _, row in disease_symptoms.iterrows():
-            symptoms = [row['Symptom_1'], row['Symptom_2'], row['Symptom_3'], row['Symptom_4']]
-            # Filter out empty/NaN values
-            symptoms = [s for s in symptoms if pd.notna(s) and s.strip()]
-            all_symptoms.update(symptoms)
-        
-        response = {
-            "disease_name": disease_name,
-            "all_symptoms": list(all_symptoms),
-            "symptom_count": len(all_symptoms)
-        }
-        return jsonify(response)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        limit = parse_limit(data)
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit must be an integer"}), 400
+    symptom_ids = {symptom_sets.symptom_ids[s] for s in symptoms}
+    ranking = symptom_sets.rank_by_symptoms(symptom_ids, limit)
+    return jsonify({"diseases": ranked_diseases(ranking, symptom_ids), "unrecognized_symptoms": unrecognized})
+
+@app.route("/diseases/similar", methods=["POST"])
+def similar_diseases():
+    if symptom_sets is None:
+        return jsonify({"error": "Symptom index not available"}), 503
+    data = request.json or {}
+    name = normalize_disease(data.get("disease_name", ""))
+    if name not in disease_symptoms:
+        return jsonify({"error": "Disease not found"}), 404
+    try:
+        limit = parse_limit(data)
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit must be an integer"}), 400
+    symptom_ids = {symptom_sets.symptom_ids[s] for s in disease_symptoms[name]}
+    ranking = symptom_sets.similar_diseases(disease_names.index(name), limit)
+    return jsonify({"disease_name": name, "similar_diseases": ranked_diseases(ranking, symptom_ids)})
 
 # Serve React App
 @app.route("/", defaults={"path": ""})
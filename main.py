@@ -2,6 +2,8 @@ from flask import Flask, request, render_template, jsonify  # Import jsonify
 import numpy as np
 import pandas as pd
 import pickle
+import os
+import sys
 
 
 # flask app
@@ -10,12 +12,25 @@ app = Flask(__name__)
 
 
 # load databasedataset===================================
-sym_des = pd.read_csv("datasets/symtoms_df.csv")
-precautions = pd.read_csv("datasets/precautions_df.csv")
-workout = pd.read_csv("datasets/workout_df.csv")
-description = pd.read_csv("datasets/description.csv")
-medications = pd.read_csv('datasets/medications.csv')
-diets = pd.read_csv("datasets/diets.csv")
+# the binary bundle from backend-api/models/dataset_bundle.py is used when present and up to date
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend-api", "models"))
+try:
+    from dataset_bundle import DEFAULT_BUNDLE_NAME, open_bundle
+    bundle = open_bundle(os.path.join("datasets", DEFAULT_BUNDLE_NAME))
+except ImportError:
+    bundle = None
+
+def read_dataset(filename):
+    if bundle is not None and filename in bundle:
+        return bundle.dataframe(filename)
+    return pd.read_csv(os.path.join("datasets", filename))
+
+sym_des = read_dataset("symtoms_df.csv")
+precautions = read_dataset("precautions_df.csv")
+workout = read_dataset("workout_df.csv")
+description = read_dataset("description.csv")
+medications = read_dataset('medications.csv')
+diets = read_dataset("diets.csv")
 
 
 # load model===========================================
@@ -25,21 +40,29 @@ svc = pickle.load(open('models/svc.pkl','rb'))
 #============================================================
 # custome and helping functions
 #==========================helper funtions================
-def helper(dis):
-    desc = description[description['Disease'] == dis]['Description']
-    desc = " ".join([w for w in desc])
-
-    pre = precautions[precautions['Disease'] == dis][['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']]
-    pre = [col for col in pre.values]
-
-    med = medications[medications['Disease'] == dis]['Medication']
-    med = [med for med in med.values]
-
-    die = diets[diets['Disease'] == dis]['Diet']
-    # die = [die for die in die.values]
-
-    wrkout = workout[workout['disease'] == dis] ['workout']
+# disease info is grouped once at startup, so helper is a dict lookup instead of five DataFrame scans
+def normalize_disease(name):
+    return " ".join(str(name).split())
+
+def group_by_disease(df, disease_col, value_cols):
+    grouped = {}
+    for name, row in zip(df[disease_col], df[value_cols].values.tolist()):
+        grouped.setdefault(normalize_disease(name), []).append(row)
+    return grouped
+
+disease_descriptions = {name: " ".join(rows) for name, rows in group_by_disease(description, 'Disease', 'Description').items()}
+disease_precautions = group_by_disease(precautions, 'Disease', ['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4'])
+disease_medications = group_by_disease(medications, 'Disease', 'Medication')
+disease_diets = group_by_disease(diets, 'Disease', 'Diet')
+disease_workouts = group_by_disease(workout, 'disease', 'workout')
 
+def helper(dis):
+    dis = normalize_disease(dis)
+    desc = disease_descriptions.get(dis, "")
+    pre = disease_precautions.get(dis, [])
+    med = disease_medications.get(dis, [])
+    die = disease_diets.get(dis, [])
+    wrkout = disease_workouts.get(dis, [])
 
     return desc,pre,med,die,wrkout
 